@@ -1,4 +1,8 @@
-﻿import random
+﻿import copy
+import os
+import random
+import threading
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 import sys
 from typing import Dict, Iterable, Set, Tuple
@@ -15,6 +19,13 @@ except ModuleNotFoundError:
         sys.path.insert(0, str(trash_dir))
     from eligibility import AssignmentSettings, PlanningContext, candidate_is_available, parse_constraint_row  # type: ignore  # noqa: F401,E402
 
+from planning_model import WEEKDAY_CODES, PlanningModel, day_type_for, get_name_resolver  # noqa: E402
+
+try:
+    import exact_solver  # noqa: E402
+except Exception:
+    exact_solver = None
+
 del _MODULE_DIR
 
 # Global toggles inherited from previous version
@@ -30,10 +41,30 @@ ENABLE_WEEKDAY_COMPENSATION = False
 WEEKDAY_COMPENSATION_MALUS = 0.8  # penalisation forte mais non bloquante
 OPTIMIZE_BALANCE = False
 OPTIMIZE_BALANCE = False
+# Relances indépendantes de l'assignation (1 = un seul passage) ; la meilleure est appliquée
+ASSIGNMENT_RESTARTS = 1
+ASSIGNMENT_MAX_WORKERS = None  # None = nombre de coeurs
+RESTART_UNFILLED_WEIGHT = 2.0  # une case vide pèse plus qu'un jour d'écart à la cible
+# Graine fixe pour rejouer une assignation à l'identique (None = nouvelle graine à chaque passage)
+ASSIGNMENT_SEED = None
+# Solveur exact (OR-Tools CP-SAT, optionnel) lancé après le glouton, qui sert de point de départ
+USE_EXACT_SOLVER = False
+EXACT_SOLVER_TIME_LIMIT = 10.0  # secondes
+EXACT_SOLVER_POLL_MS = 100  # intervalle de vérification du thread du solveur (boucle Tk)
 
 FORBIDDEN_POST_ASSOCIATIONS: Set[Tuple[str, str]] = set()
 
 
+def new_run_seed():
+    """Graine d'un passage : ASSIGNMENT_SEED si fixée, sinon tirée du système."""
+    if ASSIGNMENT_SEED is not None:
+        try:
+            return int(ASSIGNMENT_SEED)
+        except Exception:
+            pass
+    return random.SystemRandom().randrange(1 << 32)
+
+
 def filter_weekend_block_posts(valid_posts: Iterable[str]) -> None:
     """
     Retire de WEEKEND_BLOCK_POSTS les postes qui n'existent plus
@@ -67,138 +98,67 @@ def build_forbidden_maps(work_posts: Iterable[str]) -> Tuple[Dict[int, frozenset
     return frozen_morning, frozen_afternoon
 
 
-def assigner_initiales(constraints_app, planning_gui):
-    """
-    Assigne automatiquement les cr\u00e9neaux du mois poste par poste selon le workflow demand\u00e9 :
-    - parcours chronologique jour + poste,
-    - priorit\u00e9 aux candidats pr\u00e9f\u00e9rentiels,
-    - v\u00e9rification des contraintes (absences, postes interdits, scope semaine/WE, plafond WE global),
-    - gestion des associations de postes : affectation du m\u00eame m\u00e9decin sur les postes associ\u00e9s du jour.
-    Les cibles sont calcul\u00e9es \u00e0 partir du volume annuel (semaine/week-end) divis\u00e9 par 12 et pond\u00e9r\u00e9es
-    par le pourcentage de participation.
-    """
-    import calendar
-    from datetime import date, timedelta
-    from Full_GUI import days, work_posts, extract_names_from_cell, POST_INFO
-
-    try:
-        from Full_GUI import month_holidays as _month_holidays
-    except Exception:
-        _month_holidays = None
-
-    rows = getattr(constraints_app, "rows", []) if constraints_app is not None else []
-    if not rows:
-        return
-
-    year = getattr(planning_gui, "current_year", date.today().year)
-    month = getattr(planning_gui, "current_month", date.today().month)
-    posts_count = len(work_posts)
-    days_in_month = calendar.monthrange(year, month)[1]
-
-    def _split_csv(text):
-        return [p.strip() for p in str(text or "").replace(";", ",").split(",") if p.strip()]
-
-    WEEKDAY_CODES = ["mon", "tue", "wed", "thu", "fri", "sat", "sun"]
-    WEEKDAY_LABELS = {
-        "lundi": "mon", "lun": "mon",
-        "mardi": "tue", "mar": "tue",
-        "mercredi": "wed", "mer": "wed",
-        "jeudi": "thu", "jeu": "thu",
-        "vendredi": "fri", "ven": "fri",
-        "samedi": "sat", "sam": "sat",
-        "dimanche": "sun", "dim": "sun",
-    }
+WEEKDAY_LABELS = {
+    "lundi": "mon", "lun": "mon",
+    "mardi": "tue", "mar": "tue",
+    "mercredi": "wed", "mer": "wed",
+    "jeudi": "thu", "jeu": "thu",
+    "vendredi": "fri", "ven": "fri",
+    "samedi": "sat", "sam": "sat",
+    "dimanche": "sun", "dim": "sun",
+}
 
-    def _parse_excluded_weekdays(raw):
-        """
-        Convertit une valeur d'exclusion (ancienne portée week/week-end ou CSV de jours)
-        en ensemble de codes jour ('mon'..'sun').
-        """
-        if raw is None:
-            return set()
-        codes = set()
-        if isinstance(raw, (list, tuple, set)):
-            values = [str(x).strip().lower() for x in raw if str(x).strip()]
-        else:
-            txt = str(raw or "").strip().replace(";", ",")
-            values = [p.strip().lower() for p in txt.split(",") if p.strip()]
 
-        for val in values:
-            if not val or val in {"all", "+", "aucune", "aucune exclusion", "none", "0"}:
-                continue
-            if val in {"weekdays_only", "weekday_only", "weekdays"}:
-                codes.update(["fri", "sat", "sun"])
-                continue
-            if val in {"weekends_only", "weekend_only", "weekend"}:
-                codes.update(["mon", "tue", "wed", "thu"])
-                continue
-            if val in WEEKDAY_CODES:
-                codes.add(val)
-                continue
-            mapped = WEEKDAY_LABELS.get(val) or WEEKDAY_LABELS.get(val[:3])
-            if mapped:
-                codes.add(mapped)
-        return set(codes)
+def _split_csv(text):
+    return [p.strip() for p in str(text or "").replace(";", ",").split(",") if p.strip()]
 
-    try:
-        max_we_enabled = bool(ENABLE_MAX_WE_DAYS)
-    except Exception:
-        max_we_enabled = False
-    try:
-        max_we_limit = int(MAX_WE_DAYS_PER_MONTH) if max_we_enabled and MAX_WE_DAYS_PER_MONTH is not None else None
-        if max_we_limit is not None and max_we_limit < 0:
-            max_we_limit = None
-    except Exception:
-        max_we_limit = None
 
-    def _holidays_for(m_year, m_month):
-        if _month_holidays:
-            try:
-                return set(_month_holidays(m_year, m_month))
-            except Exception:
-                return set()
+def _parse_excluded_weekdays(raw):
+    """
+    Convertit une valeur d'exclusion (ancienne portée week/week-end ou CSV de jours)
+    en ensemble de codes jour ('mon'..'sun').
+    """
+    if raw is None:
         return set()
+    codes = set()
+    if isinstance(raw, (list, tuple, set)):
+        values = [str(x).strip().lower() for x in raw if str(x).strip()]
+    else:
+        txt = str(raw or "").strip().replace(";", ",")
+        values = [p.strip().lower() for p in txt.split(",") if p.strip()]
 
-    def _day_type(dt, hol_set):
-        """week = lun-jeu non feri\u00e9, we = ven/sa/di/feri\u00e9/veille feri\u00e9."""
-        is_hol = dt in hol_set
-        next_hol = (dt + timedelta(days=1)) in hol_set
-        wd = dt.weekday()
-        if wd >= 5 or wd == 4 or is_hol or next_hol:
-            return "we"
-        return "week"
-
-    def _weekday_code_for_day(day_num):
-        try:
-            return WEEKDAY_CODES[date(year, month, day_num).weekday()]
-        except Exception:
-            return None
+    for val in values:
+        if not val or val in {"all", "+", "aucune", "aucune exclusion", "none", "0"}:
+            continue
+        if val in {"weekdays_only", "weekday_only", "weekdays"}:
+            codes.update(["fri", "sat", "sun"])
+            continue
+        if val in {"weekends_only", "weekend_only", "weekend"}:
+            codes.update(["mon", "tue", "wed", "thu"])
+            continue
+        if val in WEEKDAY_CODES:
+            codes.add(val)
+            continue
+        mapped = WEEKDAY_LABELS.get(val) or WEEKDAY_LABELS.get(val[:3])
+        if mapped:
+            codes.add(mapped)
+    return set(codes)
 
-    # Totaux annuels (m\u00eame liste de postes toute l'ann\u00e9e)
-    annual_week = annual_we = 0
-    for m_idx in range(1, 13):
-        dim = calendar.monthrange(year, m_idx)[1]
-        hol = _holidays_for(year, m_idx)
-        for d_idx in range(1, dim + 1):
-            dt = date(year, m_idx, d_idx)
-            if _day_type(dt, hol) == "we":
-                annual_we += posts_count
-            else:
-                annual_week += posts_count
-    annual_week = annual_week or 1
-    annual_we = annual_we or 1
 
-    # Profils issus du tableau de contraintes
+def read_profiles(rows):
+    """
+    Extrait les profils (dicts simples, sans widget) depuis les lignes du
+    tableau de contraintes. Le résultat peut être passé tel quel au moteur
+    headless (assign_on_model).
+    """
     profiles = []
-    initials_set = set()
-    for row in rows:
+    for row in rows or []:
         try:
             init = str(row[0].get()).strip()
         except Exception:
             init = ""
         if not init:
             continue
-        initials_set.add(init)
         try:
             part = float(row[1].get())
         except Exception:
@@ -287,42 +247,293 @@ def assigner_initiales(constraints_app, planning_gui):
                 "associations": associations,
             }
         )
+    return profiles
+
+
+class CandidateScorer:
+    """
+    Score des candidats d'une case en une passe, sur des tableaux indexés par
+    profil (même ordre que la liste `profiles` du moteur).
+
+    - week_counts / we_counts : nombre de jours déjà tenus par type de jour
+    - week_targets / we_targets : cibles mensuelles en jours
+    Les candidats, les préférentiels et les pénalités de compensation sont
+    passés en bitsets (bit i = profil i).
+    """
+
+    PREF_BONUS = 0.15  # reduit artificiellement le ratio pour les preferes
+    OVER_PENALTY = 0.35  # augmente le ratio si deja au-dessus de la cible
+
+    def __init__(self, week_targets, we_targets, week_counts=None, we_counts=None, compensation_malus=0.0):
+        size = len(week_targets)
+        self.week_targets = list(week_targets)
+        self.we_targets = list(we_targets)
+        self.week_counts = list(week_counts) if week_counts is not None else [0] * size
+        self.we_counts = list(we_counts) if we_counts is not None else [0] * size
+        self.compensation_malus = compensation_malus
+
+    def set_count(self, bits, dtype, value):
+        """Fixe le compteur (jours distincts) des profils de `bits`."""
+        counts = self.we_counts if dtype == "we" else self.week_counts
+        while bits:
+            low = bits & -bits
+            counts[low.bit_length() - 1] = value
+            bits ^= low
+
+    def pick(self, bits, dtype, preferred_bits=0, penalty_bits=0, rng=random):
+        """
+        Retourne l'index du profil de ratio effectif minimal parmi `bits`
+        (puis deficit le plus eleve), ex aequo departages au hasard ; None si aucun.
+        """
+        counts = self.we_counts if dtype == "we" else self.week_counts
+        targets = self.we_targets if dtype == "we" else self.week_targets
+        pref_bonus = self.PREF_BONUS
+        over_penalty = self.OVER_PENALTY
+        malus = self.compensation_malus
+        best = None
+        best_key = None
+        ties = 0
+        while bits:
+            low = bits & -bits
+            bits ^= low
+            idx = low.bit_length() - 1
+            tgt = targets[idx]
+            if tgt <= 0:
+                continue
+            cur = counts[idx]
+            ratio = cur / tgt
+            effective_ratio = ratio + over_penalty * max(0.0, ratio - 1.0)
+            if preferred_bits & low:
+                effective_ratio = max(0.0, effective_ratio - pref_bonus)
+            if penalty_bits & low:
+                effective_ratio += malus
+            key = (effective_ratio, cur - tgt)
+            if best_key is None or key < best_key:
+                best, best_key, ties = idx, key, 1
+            elif key == best_key:
+                ties += 1
+                if rng.randrange(ties) == 0:
+                    best = idx
+        return best
+
+
+def assigner_initiales(constraints_app, planning_gui, seed=None, on_done=None):
+    """
+    Assigne automatiquement les créneaux du mois poste par poste selon le workflow demandé :
+    - parcours chronologique jour + poste,
+    - priorité aux candidats préférentiels,
+    - vérification des contraintes (absences, postes interdits, scope semaine/WE, plafond WE global),
+    - gestion des associations de postes : affectation du même médecin sur les postes associés du jour.
+    Les cibles mensuelles (en jours, semaine / week-end) sont le nombre de jours du mois ayant
+    au moins une case à remplir, hors jours de semaine exclus du profil, pondéré par le
+    pourcentage de participation (voir assign_on_model).
+
+    Le calcul se fait sur un PlanningModel (lecture unique des Entry), puis les
+    cellules modifiées sont réécrites en une passe dans la GUI.
+    La graine utilisée est mémorisée dans planning_gui.last_assignment_seed :
+    la repasser en `seed` rejoue exactement la même assignation.
+    Avec `on_done`, le solveur exact (s'il est activé) tourne sur un thread de
+    travail : le résultat glouton est écrit tout de suite, celui du solveur est
+    appliqué depuis la boucle Tk, puis `on_done()` est appelé. Sans solveur,
+    `on_done()` est appelé avant le retour.
+    """
+    from datetime import date
+    from Full_GUI import days, work_posts
+
+    try:
+        from Full_GUI import month_holidays as _month_holidays
+    except Exception:
+        _month_holidays = None
 
+    rows = getattr(constraints_app, "rows", []) if constraints_app is not None else []
+    if not rows:
+        _notify_done(on_done)
+        return
+
+    profiles = read_profiles(rows)
     if not profiles:
+        _notify_done(on_done)
         return
-    # Casse l'ordre des lignes du tableau de contraintes pour éviter un biais de sélection
-    random.shuffle(profiles)
 
-    profile_by_initial = {p["initial"]: p for p in profiles}
+    year = getattr(planning_gui, "current_year", date.today().year)
+    month = getattr(planning_gui, "current_month", date.today().month)
+    hol_month = set()
+    if _month_holidays:
+        try:
+            hol_month = set(_month_holidays(year, month))
+        except Exception:
+            hol_month = set()
+
+    if seed is None:
+        seed = new_run_seed()
+    try:
+        planning_gui.last_assignment_seed = seed
+    except Exception:
+        pass
+
+    model = PlanningModel.from_gui(planning_gui, work_posts, days, year, month, hol_month)
+    use_solver = (bool(USE_EXACT_SOLVER) and exact_solver is not None and exact_solver.solver_available()
+                  and exact_solver_skip_reason() is None)
+    base_model = copy.deepcopy(model) if use_solver else None
+    stats = assign_best_of(model, profiles, rng=random.Random(seed))
+
+    # Écriture groupée (une action d'annulation, colonnes et couleurs rafraîchies une fois)
+    model.write_back(planning_gui)
+    if not use_solver:
+        _notify_done(on_done)
+        return
+
+    job = dict(
+        model=base_model,
+        profiles=profiles,
+        warm_start=model,
+        stats=stats,
+        options=_options_snapshot(),
+        time_limit=EXACT_SOLVER_TIME_LIMIT,
+        seed=seed,
+    )
+    if on_done is None or not hasattr(planning_gui, "after"):
+        solved = _run_exact_solver(job)
+        # Le résultat glouton reste en place si le solveur n'a pas fait mieux
+        if solved is not None:
+            _write_solved(planning_gui, model, solved)
+        return
+    _solve_in_background(planning_gui, job, on_done)
+
+
+def exact_solver_skip_reason():
+    """
+    Raison pour laquelle le solveur exact n'est pas lancé malgré USE_EXACT_SOLVER,
+    None s'il peut l'être. La compensation en semaine autour des blocs week-end
+    n'est pas modélisée par le solveur : son plan l'ignorerait.
+    """
+    if ENABLE_WEEKDAY_COMPENSATION:
+        return ("La compensation en semaine autour des blocs week-end n'est pas prise en compte "
+                "par le solveur exact : l'assignation reste sur le moteur glouton.")
+    return None
+
+
+def _notify_done(on_done):
+    if on_done is not None:
+        on_done()
+
+
+def _run_exact_solver(job):
+    """Appel protégé du solveur exact ; None si indisponible, en échec ou pas meilleur."""
+    try:
+        return exact_solver.solve_assignment(**job)
+    except Exception:
+        return None
+
+
+def _write_solved(planning_gui, warm_start, solved):
+    """Réécrit sur la grille, déjà remplie par le glouton, l'écart entre le solveur et le glouton."""
+    for r_idx, row in enumerate(solved.grid):
+        for c_idx, value in enumerate(row):
+            warm_start.set(r_idx, c_idx, value)
+    warm_start.write_back(planning_gui)
+
+
+def _solve_in_background(planning_gui, job, on_done):
+    """
+    Lance le solveur exact sur un thread de travail (aucun accès Tk) ; la boucle
+    Tk vérifie sa fin toutes les EXACT_SOLVER_POLL_MS ms, applique le résultat
+    et appelle `on_done`. Curseur d'attente pendant le calcul. Si la grille a
+    été modifiée entre-temps, le résultat glouton (déjà écrit) est conservé.
+    """
+    result = {}
+    revision = getattr(planning_gui, "_cell_revision", None)
 
-    parser_valids = initials_set
-    exclusion_checker = getattr(planning_gui, "is_cell_excluded_from_count", None)
-    excluded_cells = getattr(planning_gui, "excluded_from_count", set())
-    cell_availability = getattr(planning_gui, "cell_availability", {})
-    hol_month = _holidays_for(year, month)
+    def _worker():
+        result["model"] = _run_exact_solver(job)
 
-    def _in_month(row_idx):
+    try:
+        toplevel = planning_gui.winfo_toplevel()
+        old_cursor = toplevel.cget("cursor")
+        toplevel.config(cursor="watch")
+    except Exception:
+        toplevel = None
+        old_cursor = ""
+
+    thread = threading.Thread(target=_worker, name="exact-solver", daemon=True)
+    thread.start()
+
+    def _poll():
+        if thread.is_alive():
+            planning_gui.after(EXACT_SOLVER_POLL_MS, _poll)
+            return
+        if toplevel is not None:
+            try:
+                toplevel.config(cursor=old_cursor)
+            except Exception:
+                pass
+        solved = result.get("model")
         try:
-            day_num = int(days[row_idx])
-        except Exception:
-            day_num = row_idx + 1
-        return 1 <= day_num <= days_in_month, day_num
+            if solved is not None and getattr(planning_gui, "_cell_revision", None) == revision:
+                _write_solved(planning_gui, job["warm_start"], solved)
+        finally:
+            _notify_done(on_done)
+
+    planning_gui.after(EXACT_SOLVER_POLL_MS, _poll)
+
+
+def assign_on_model(model, profiles, name_resolver=None, rng=None):
+    """
+    Moteur d'assignation headless : remplit les cellules vides de `model`
+    (PlanningModel) à partir des `profiles` (voir read_profiles).
+    N'importe pas Full_GUI et ne touche à aucun widget.
+    Tous les tirages passent par `rng` (random.Random) : même graine, même résultat.
+    Retourne les statistiques du résultat (voir score_assignment).
+    """
+    from datetime import date, timedelta
+
+    if not profiles:
+        return None
+    profiles = list(profiles)
+    if rng is None:
+        rng = random.Random()
+
+    work_posts = model.posts
+    year = model.year
+    month = model.month
+    days_in_month = model.days_in_month
+    grid = model.grid
+
+    try:
+        max_we_enabled = bool(ENABLE_MAX_WE_DAYS)
+    except Exception:
+        max_we_enabled = False
+    try:
+        max_we_limit = int(MAX_WE_DAYS_PER_MONTH) if max_we_enabled and MAX_WE_DAYS_PER_MONTH is not None else None
+        if max_we_limit is not None and max_we_limit < 0:
+            max_we_limit = None
+    except Exception:
+        max_we_limit = None
 
-    # Map jour (num) -> index de ligne dans le tableau
-    day_to_row = {}
-    for idx, val in enumerate(days):
+    def _weekday_code_for_day(day_num):
         try:
-            num = int(val)
+            return WEEKDAY_CODES[date(year, month, day_num).weekday()]
         except Exception:
-            num = idx + 1
-        day_to_row[num] = idx
+            return None
+
+    # Casse l'ordre des lignes du tableau de contraintes pour éviter un biais de sélection
+    rng.shuffle(profiles)
+
+    profile_by_initial = {p["initial"]: p for p in profiles}
+    parser_valids = {p["initial"] for p in profiles}
+    hol_month = model.holidays
+    day_to_row = model.day_to_row
+
+    if name_resolver is None:
+        name_resolver = get_name_resolver(parser_valids)
 
     context = PlanningContext(
-        table_entries=planning_gui.table_entries,
-        name_resolver=lambda raw: extract_names_from_cell(raw, parser_valids),
-        exclusion_checker=exclusion_checker,
-        excluded_cells=excluded_cells,
+        table_entries=grid,
+        name_resolver=name_resolver,
+        exclusion_checker=model.is_excluded,
+        incremental=True,
     )
+    context.rebuild_index()
 
     # Associations par profil et index de poste
     post_index_map = {name: idx for idx, name in enumerate(work_posts)}
@@ -349,44 +560,71 @@ def assigner_initiales(constraints_app, planning_gui):
     counts_we_days = {p["initial"]: set() for p in profiles}
     profile_exclusions = {p["initial"]: set(p.get("excluded_weekdays", set())) for p in profiles}
 
-    def _is_available(profile, day_idx, day_num, post_idx, post_name, day_type, weekday_code):
-        excluded_days = profile.get("excluded_weekdays", set())
-        if weekday_code and weekday_code in excluded_days:
-            return False
-        if day_type == "we" and max_we_enabled and max_we_limit is not None:
-            try:
-                if len(counts_we_days.get(profile["initial"], set())) >= max_we_limit:
-                    return False
-            except Exception:
-                return False
-        if day_num in profile["absences"]:
-            return False
-        if post_name in profile["non_assured"]:
-            return False
-        if context.already_assigned_in_timeslot(profile["initial"], day_idx, True):
-            return False
-        return True
-
-    for r_idx, row in enumerate(planning_gui.table_entries):
-        in_month, day_num = _in_month(r_idx)
-        if not in_month:
-            continue
+    # Disponibilités statiques en bitsets (bit i = profiles[i]) : une lecture par case
+    # remplace les tests absences / jours exclus / postes non assurés profil par profil.
+    profile_count = len(profiles)
+    bit_of = {id(p): 1 << i for i, p in enumerate(profiles)}
+    initial_bits = {}
+    for p in profiles:
+        initial_bits[p["initial"]] = initial_bits.get(p["initial"], 0) | bit_of[id(p)]
+    non_assured_bits = [0] * len(work_posts)
+    preferred_bits = [0] * len(work_posts)
+    for p in profiles:
+        bit = bit_of[id(p)]
+        for c_idx, post_name in enumerate(work_posts):
+            if post_name in p["non_assured"]:
+                non_assured_bits[c_idx] |= bit
+            if post_name in p.get("preferred", []):
+                preferred_bits[c_idx] |= bit
+    static_avail = []
+    for r_idx in range(len(grid)):
+        day_bits = 0
+        if model.in_month(r_idx):
+            day_num = model.day_numbers[r_idx]
+            weekday_code = model.weekday_codes[r_idx]
+            for p in profiles:
+                if weekday_code in p.get("excluded_weekdays", set()):
+                    continue
+                if day_num in p["absences"]:
+                    continue
+                day_bits |= bit_of[id(p)]
+        static_avail.append([day_bits & ~blocked for blocked in non_assured_bits])
+
+    # Parties dynamiques : profils déjà placés sur la ligne, profils au plafond WE
+    row_busy = [0] * len(grid)
+    for initial, bits in initial_bits.items():
+        for r_idx in range(len(grid)):
+            if context.already_assigned_in_timeslot(initial, r_idx, True):
+                row_busy[r_idx] |= bits
+    we_cap_active = max_we_enabled and max_we_limit is not None
+    we_capped = 0
+
+    def _available_bits(r_idx, c_idx, day_type, same_day_ok=False):
         try:
-            dt = date(year, month, day_num)
-        except Exception:
+            bits = static_avail[r_idx][c_idx]
+        except IndexError:
+            return 0
+        if not same_day_ok:
+            bits &= ~row_busy[r_idx]
+        if day_type == "we" and we_cap_active:
+            bits &= ~we_capped
+        return bits
+
+    def _is_available(profile, r_idx, c_idx, day_type, same_day_ok=False):
+        return bool(_available_bits(r_idx, c_idx, day_type, same_day_ok) & bit_of[id(profile)])
+
+    for r_idx, row in enumerate(grid):
+        if not model.in_month(r_idx):
             continue
-        dtype = _day_type(dt, hol_month)
-        weekday_code = WEEKDAY_CODES[dt.weekday()] if dt else None
+        day_num = model.day_numbers[r_idx]
+        dtype = model.day_types[r_idx]
+        weekday_code = model.weekday_codes[r_idx]
         day_names = set()
-        for c_idx, cell in enumerate(row):
-            if not cell or c_idx >= len(work_posts):
-                continue
-            if not cell_availability.get((r_idx, c_idx), True):
-                continue
-            if exclusion_checker and exclusion_checker(r_idx, c_idx):
+        for c_idx, value in enumerate(row):
+            if not model.is_open(r_idx, c_idx):
                 continue
             try:
-                existing_names = context.name_resolver(cell.get())
+                existing_names = context.name_resolver(value)
             except Exception:
                 existing_names = []
             day_names.update(nm for nm in existing_names if nm in counts_week_days)
@@ -398,31 +636,25 @@ def assigner_initiales(constraints_app, planning_gui):
             else:
                 counts_week_days[nm].add(day_num)
 
+    if we_cap_active:
+        for nm, we_days in counts_we_days.items():
+            if len(we_days) >= max_we_limit:
+                we_capped |= initial_bits.get(nm, 0)
+
     # Cases a remplir
     cases = []
     open_week_days = set()
     open_we_days = set()
-    for r_idx, row in enumerate(planning_gui.table_entries):
-        in_month, day_num = _in_month(r_idx)
-        if not in_month:
+    for r_idx, row in enumerate(grid):
+        if not model.in_month(r_idx):
             continue
-        try:
-            dt = date(year, month, day_num)
-        except Exception:
-            continue
-        dtype = _day_type(dt, hol_month)
-        weekday_code = WEEKDAY_CODES[dt.weekday()] if dt else None
-        for c_idx, cell in enumerate(row):
-            if not cell or c_idx >= len(work_posts):
+        day_num = model.day_numbers[r_idx]
+        dtype = model.day_types[r_idx]
+        weekday_code = model.weekday_codes[r_idx]
+        for c_idx, value in enumerate(row):
+            if not model.is_open(r_idx, c_idx):
                 continue
-            if not cell_availability.get((r_idx, c_idx), True):
-                continue
-            if exclusion_checker and exclusion_checker(r_idx, c_idx):
-                continue
-            try:
-                if cell.get().strip():
-                    continue
-            except Exception:
+            if value.strip():
                 continue
             cases.append((r_idx, c_idx, day_num, dtype, weekday_code))
             if dtype == "we":
@@ -450,6 +682,14 @@ def assigner_initiales(constraints_app, planning_gui):
         targets_week[p["initial"]] = p["participation"] * len(effective_week)
         targets_we[p["initial"]] = p["participation"] * len(effective_we)
 
+    scorer = CandidateScorer(
+        week_targets=[targets_week.get(p["initial"], 0.0) for p in profiles],
+        we_targets=[targets_we.get(p["initial"], 0.0) for p in profiles],
+        week_counts=[len(counts_week_days.get(p["initial"], ())) for p in profiles],
+        we_counts=[len(counts_we_days.get(p["initial"], ())) for p in profiles],
+        compensation_malus=WEEKDAY_COMPENSATION_MALUS,
+    )
+
     weekend_block_posts = set()
     try:
         weekend_block_posts = set(WEEKEND_BLOCK_POSTS)
@@ -460,7 +700,8 @@ def assigner_initiales(constraints_app, planning_gui):
         weekend_block_posts = set(work_posts)
 
     # Fenetres de penalisation (compensation semaine autour d'un bloc WE)
-    weekday_compensation_penalties: Dict[Tuple[int, int], Set[str]] = {}
+    # (poste, jour) -> bitset des profils penalises
+    weekday_compensation_penalties: Dict[Tuple[int, int], int] = {}
 
     def _compensation_windows_for_block(friday_dt):
         """Retourne les jours (num) lun-jeu de la semaine precedente et suivante pour un vendredi donne."""
@@ -480,8 +721,9 @@ def assigner_initiales(constraints_app, planning_gui):
         if not (ENABLE_WEEKDAY_COMPENSATION and friday_dt and profile_initial):
             return
         before, after = _compensation_windows_for_block(friday_dt)
+        bits = initial_bits.get(profile_initial, 0)
         for d in before + after:
-            weekday_compensation_penalties.setdefault((post_idx, d), set()).add(profile_initial)
+            weekday_compensation_penalties[(post_idx, d)] = weekday_compensation_penalties.get((post_idx, d), 0) | bits
 
     def _block_assigned_initial(post_idx, block_days):
         """Retourne l'initiale si les 3 jours du bloc sont remplis par le meme profil, sinon None."""
@@ -490,16 +732,10 @@ def assigner_initiales(constraints_app, planning_gui):
         initial = None
         for d in block_days:
             r_idx = day_to_row.get(d)
-            if r_idx is None:
-                return None
-            try:
-                cell = planning_gui.table_entries[r_idx][post_idx]
-            except Exception:
-                return None
-            if not cell:
+            if r_idx is None or not model.has_cell(r_idx, post_idx):
                 return None
             try:
-                names = context.name_resolver(cell.get())
+                names = context.name_resolver(grid[r_idx][post_idx])
             except Exception:
                 names = []
             if len(names) != 1:
@@ -539,7 +775,7 @@ def assigner_initiales(constraints_app, planning_gui):
                     dt = date(year, month, d)
                 except Exception:
                     continue
-                if _day_type(dt, hol_month) != "we":
+                if day_type_for(dt, hol_month) != "we":
                     continue
                 block_days = _weekend_block_days(d)
                 # Exiger un vendredi dans le mois courant pour ancrer la compensation
@@ -553,10 +789,15 @@ def assigner_initiales(constraints_app, planning_gui):
                     _maybe_register_compensation_for_block(post_idx, block_days_in_month)
 
     def _update_counts(profile_initial, dtype, day_num):
+        nonlocal we_capped
         if dtype == "we":
             counts_we_days.setdefault(profile_initial, set()).add(day_num)
+            scorer.set_count(initial_bits.get(profile_initial, 0), dtype, len(counts_we_days[profile_initial]))
+            if we_cap_active and len(counts_we_days[profile_initial]) >= max_we_limit:
+                we_capped |= initial_bits.get(profile_initial, 0)
         else:
             counts_week_days.setdefault(profile_initial, set()).add(day_num)
+            scorer.set_count(initial_bits.get(profile_initial, 0), dtype, len(counts_week_days[profile_initial]))
 
     def _weekend_block_days(day_num):
         """
@@ -577,58 +818,33 @@ def assigner_initiales(constraints_app, planning_gui):
                 result.append(d.day)
         return result
 
-    def _pick_candidate(candidate_entries, dtype, day_num=None, post_idx=None):
+    def _pick_candidate(bits, c_idx, dtype, day_num=None, post_idx=None):
         """
-        Selection equilibree sur ratio count/target pour le type de jour.
-        Tie-break : deficit le plus eleve puis un leger alea pour eviter tout biais d'ordre.
+        Selection equilibree sur ratio count/target pour le type de jour (CandidateScorer).
+        Tie-break : deficit le plus eleve puis tirage au hasard parmi les ex aequo.
         Applique un bonus pour les preferes et un malus pour les ratios deja > 1.
         """
-        if not candidate_entries:
-            return None
-        target_map = targets_we if dtype == "we" else targets_week
-        count_map = counts_we_days if dtype == "we" else counts_week_days
-        PREF_BONUS = 0.15  # reduit artificiellement le ratio pour les preferes
-        OVER_PENALTY = 0.35  # augmente le ratio si deja au-dessus de la cible
-
-        scored = []
-        for p, is_pref in candidate_entries:
-            cur = len(count_map.get(p["initial"], set()))
-            tgt = target_map.get(p["initial"], 0.0)
-            if tgt <= 0:
-                continue
-            ratio = cur / tgt
-            over = max(0.0, ratio - 1.0)
-            effective_ratio = ratio + OVER_PENALTY * over
-            if is_pref:
-                effective_ratio = max(0.0, effective_ratio - PREF_BONUS)
-            if ENABLE_WEEKDAY_COMPENSATION and day_num is not None and post_idx is not None:
-                penalized = weekday_compensation_penalties.get((post_idx, day_num))
-                if penalized and p["initial"] in penalized:
-                    effective_ratio += WEEKDAY_COMPENSATION_MALUS
-            deficit = tgt - cur
-            jitter = random.random()
-            scored.append((effective_ratio, deficit, jitter, p))
-
-        if not scored:
+        if not bits:
             return None
+        penalty_bits = 0
+        if ENABLE_WEEKDAY_COMPENSATION and day_num is not None and post_idx is not None:
+            penalty_bits = weekday_compensation_penalties.get((post_idx, day_num), 0)
+        pref = preferred_bits[c_idx] if c_idx < len(preferred_bits) else 0
+        idx = scorer.pick(bits, dtype, pref, penalty_bits, rng=rng)
+        return profiles[idx] if idx is not None else None
 
-        scored.sort(key=lambda x: (x[0], -x[1], x[2]))
-        return scored[0][3]
+    def _is_empty(r_idx, c_idx):
+        return model.has_cell(r_idx, c_idx) and not grid[r_idx][c_idx].strip()
 
     def _assign_profile_to_cell(profile, r_idx, c_idx, day_num, dtype, weekday_code=None, allow_weekend_block=True):
         """Affecte le profil sur (jour, poste) et sur les postes associes eligibles le meme jour."""
-        try:
-            cell = planning_gui.table_entries[r_idx][c_idx]
-            if not cell:
-                return False
-        except Exception:
+        if not model.has_cell(r_idx, c_idx):
             return False
 
-        try:
-            cell.delete(0, "end")
-            cell.insert(0, profile["initial"])
-        except Exception:
-            return False
+        model.set(r_idx, c_idx, profile["initial"])
+        context.assign(profile["initial"], r_idx, c_idx)
+        if not model.is_excluded(r_idx, c_idx):
+            row_busy[r_idx] |= initial_bits.get(profile["initial"], 0)
 
         _update_counts(profile["initial"], dtype, day_num)
 
@@ -637,36 +853,18 @@ def assigner_initiales(constraints_app, planning_gui):
 
         assoc_indices = profile_assoc_map.get(profile["initial"], {}).get(c_idx, set()) or set()
         for other_idx in assoc_indices:
-            try:
-                other_cell = planning_gui.table_entries[r_idx][other_idx]
-            except Exception:
-                continue
-            if not other_cell or other_idx >= len(work_posts):
+            if not model.is_open(r_idx, other_idx):
                 continue
-            if not cell_availability.get((r_idx, other_idx), True):
+            if grid[r_idx][other_idx].strip():
                 continue
-            if exclusion_checker and exclusion_checker(r_idx, other_idx):
-                continue
-            try:
-                if other_cell.get().strip():
-                    continue
-            except Exception:
-                continue
-            other_name = work_posts[other_idx]
-            if not _is_available(profile, r_idx, day_num, other_idx, other_name, dtype, weekday_code):
-                continue
-            try:
-                other_cell.delete(0, "end")
-                other_cell.insert(0, profile["initial"])
-            except Exception:
+            # Même médecin sur les postes associés du jour : le créneau déjà pris est attendu
+            if not _is_available(profile, r_idx, other_idx, dtype, same_day_ok=True):
                 continue
+            model.set(r_idx, other_idx, profile["initial"])
+            context.assign(profile["initial"], r_idx, other_idx)
             _update_counts(profile["initial"], dtype, day_num)
-            try:
-                planning_gui.auto_resize_column(other_idx)
-            except Exception:
-                pass
 
-        # Bloc week-end : remplir le m\u00eame poste sur ven/sam/dim du bloc si l'option est activ\u00e9e
+        # Bloc week-end : remplir le même poste sur ven/sam/dim du bloc si l'option est activée
         current_post_name = work_posts[c_idx] if c_idx < len(work_posts) else ""
         if allow_weekend_block and dtype == "we" and current_post_name in weekend_block_posts:
             block_days = _weekend_block_days(day_num)
@@ -678,28 +876,18 @@ def assigner_initiales(constraints_app, planning_gui):
                     other_dt = date(year, month, other_day_num)
                 except Exception:
                     continue
-                other_dtype = _day_type(other_dt, hol_month)
+                other_dtype = day_type_for(other_dt, hol_month)
                 if other_dtype != "we":
                     continue
                 other_weekday_code = WEEKDAY_CODES[other_dt.weekday()]
-                try:
-                    other_cell = planning_gui.table_entries[other_r_idx][c_idx]
-                    if not other_cell or other_cell.get().strip():
-                        continue
-                except Exception:
+                if not _is_empty(other_r_idx, c_idx):
                     continue
-                other_post_name = work_posts[c_idx] if c_idx < len(work_posts) else ""
-                if not _is_available(profile, other_r_idx, other_day_num, c_idx, other_post_name, other_dtype, other_weekday_code):
+                if not _is_available(profile, other_r_idx, c_idx, other_dtype):
                     continue
                 _assign_profile_to_cell(profile, other_r_idx, c_idx, other_day_num, other_dtype, other_weekday_code, allow_weekend_block=False)
             if len(block_days) >= 3:
                 _maybe_register_compensation_for_block(c_idx, block_days)
 
-        context.clear_caches()
-        try:
-            planning_gui.auto_resize_column(c_idx)
-        except Exception:
-            pass
         return True
 
     def _assign_weekend_block(r_idx, c_idx, day_num, dtype, weekday_code):
@@ -724,7 +912,7 @@ def assigner_initiales(constraints_app, planning_gui):
                 other_dt = date(year, month, other_day_num)
             except Exception:
                 continue
-            other_dtype = _day_type(other_dt, hol_month)
+            other_dtype = day_type_for(other_dt, hol_month)
             if other_dtype != "we":
                 continue
             other_weekday_code = WEEKDAY_CODES[other_dt.weekday()]
@@ -734,10 +922,7 @@ def assigner_initiales(constraints_app, planning_gui):
         # 1) Cas où un profil est déjà posé sur au moins un jour du bloc
         existing_profile = None
         for br_idx, b_day, b_dtype, b_code in block_cells:
-            try:
-                val = planning_gui.table_entries[br_idx][c_idx].get().strip()
-            except Exception:
-                val = ""
+            val = model.get(br_idx, c_idx).strip()
             if not val:
                 continue
             existing_profile = profile_by_initial.get(val)
@@ -747,13 +932,9 @@ def assigner_initiales(constraints_app, planning_gui):
         if existing_profile:
             filled = False
             for br_idx, b_day, b_dtype, b_code in block_cells:
-                try:
-                    cell = planning_gui.table_entries[br_idx][c_idx]
-                    if not cell or cell.get().strip():
-                        continue
-                except Exception:
+                if not _is_empty(br_idx, c_idx):
                     continue
-                if not _is_available(existing_profile, br_idx, b_day, c_idx, post_name, b_dtype, b_code):
+                if not _is_available(existing_profile, br_idx, c_idx, b_dtype):
                     continue
                 _assign_profile_to_cell(existing_profile, br_idx, c_idx, b_day, b_dtype, b_code, allow_weekend_block=False)
                 filled = True
@@ -762,28 +943,16 @@ def assigner_initiales(constraints_app, planning_gui):
             return filled
 
         # 2) Bloc vide : on cherche un profil disponible sur les 3 jours
-        candidates = []
-        for p in profiles:
-            ok = True
-            for br_idx, b_day, b_dtype, b_code in block_cells:
-                if not _is_available(p, br_idx, b_day, c_idx, post_name, b_dtype, b_code):
-                    ok = False
-                    break
-            if ok:
-                candidates.append((p, post_name in p.get("preferred", [])))
-
-        random.shuffle(candidates)
-        chosen = _pick_candidate(candidates, dtype) if candidates else None
+        block_bits = (1 << profile_count) - 1
+        for br_idx, b_day, b_dtype, b_code in block_cells:
+            block_bits &= _available_bits(br_idx, c_idx, b_dtype)
+        chosen = _pick_candidate(block_bits, c_idx, dtype)
         if chosen is None:
             return False
         for br_idx, b_day, b_dtype, b_code in block_cells:
-            try:
-                cell = planning_gui.table_entries[br_idx][c_idx]
-                if not cell or cell.get().strip():
-                    continue
-            except Exception:
+            if not _is_empty(br_idx, c_idx):
                 continue
-            if not _is_available(chosen, br_idx, b_day, c_idx, post_name, b_dtype, b_code):
+            if not _is_available(chosen, br_idx, c_idx, b_dtype):
                 continue
             _assign_profile_to_cell(chosen, br_idx, c_idx, b_day, b_dtype, b_code, allow_weekend_block=False)
         if len(block_cells) >= 3:
@@ -798,67 +967,165 @@ def assigner_initiales(constraints_app, planning_gui):
         for (r_idx, c_idx, day_num, dtype, weekday_code) in cases
         if dtype == "we" and (work_posts[c_idx] if c_idx < len(work_posts) else "") in weekend_block_posts
     ]
-    random.shuffle(block_cases)
+    rng.shuffle(block_cases)
     for (r_idx, c_idx, day_num, dtype, weekday_code) in block_cases:
-        try:
-            current_cell = planning_gui.table_entries[r_idx][c_idx]
-            if not current_cell or current_cell.get().strip():
-                continue
-        except Exception:
+        if not _is_empty(r_idx, c_idx):
             continue
-        post_name = work_posts[c_idx] if c_idx < len(work_posts) else ""
         if _assign_weekend_block(r_idx, c_idx, day_num, dtype, weekday_code):
             continue
-        candidate_entries = []
-        for p in profiles:
-            if not _is_available(p, r_idx, day_num, c_idx, post_name, dtype, weekday_code):
-                continue
-            candidate_entries.append((p, post_name in p.get("preferred", [])))
-        random.shuffle(candidate_entries)
-        chosen = _pick_candidate(candidate_entries, dtype, day_num=day_num, post_idx=c_idx)
+        chosen = _pick_candidate(_available_bits(r_idx, c_idx, dtype), c_idx, dtype, day_num=day_num, post_idx=c_idx)
         if chosen:
             _assign_profile_to_cell(chosen, r_idx, c_idx, day_num, dtype, weekday_code)
 
     _recompute_compensation_from_table()
 
-    random.shuffle(cases)
+    rng.shuffle(cases)
 
     for (r_idx, c_idx, day_num, dtype, weekday_code) in cases:
-        try:
-            current_cell = planning_gui.table_entries[r_idx][c_idx]
-            if not current_cell or current_cell.get().strip():
-                continue
-        except Exception:
+        if not _is_empty(r_idx, c_idx):
             continue
 
-        post_name = work_posts[c_idx] if c_idx < len(work_posts) else ""
-
         # Si un autre jour du bloc a déjà été affecté, on force l'homogénéité du bloc
         if _assign_weekend_block(r_idx, c_idx, day_num, dtype, weekday_code):
             continue
 
-        candidate_entries = []
-        for p in profiles:
-            if not _is_available(p, r_idx, day_num, c_idx, post_name, dtype, weekday_code):
-                continue
-            candidate_entries.append((p, post_name in p.get("preferred", [])))
-
-        random.shuffle(candidate_entries)  # melange a chaque case pour casser les biais d'ordre
-
-        chosen = _pick_candidate(candidate_entries, dtype, day_num=day_num, post_idx=c_idx)
+        chosen = _pick_candidate(_available_bits(r_idx, c_idx, dtype), c_idx, dtype, day_num=day_num, post_idx=c_idx)
 
         if chosen is None:
             continue
 
         _assign_profile_to_cell(chosen, r_idx, c_idx, day_num, dtype, weekday_code)
 
+    unfilled = sum(1 for (r_idx, c_idx, _d, _t, _w) in cases if _is_empty(r_idx, c_idx))
+    compensation_hits = 0
+    if ENABLE_WEEKDAY_COMPENSATION:
+        for (post_idx, d), bits in weekday_compensation_penalties.items():
+            r_idx = day_to_row.get(d)
+            if r_idx is None or not model.has_cell(r_idx, post_idx):
+                continue
+            try:
+                names = context.name_resolver(grid[r_idx][post_idx])
+            except Exception:
+                names = []
+            if any(initial_bits.get(nm, 0) & bits for nm in names):
+                compensation_hits += 1
+
+    return {
+        "targets_week": dict(targets_week),
+        "targets_we": dict(targets_we),
+        "counts_week": {nm: len(d) for nm, d in counts_week_days.items()},
+        "counts_we": {nm: len(d) for nm, d in counts_we_days.items()},
+        "unfilled": unfilled,
+        "compensation_hits": compensation_hits,
+    }
+
+
+def score_assignment(stats):
+    """
+    Objectif d'équilibre d'un résultat d'assign_on_model (plus bas = meilleur) :
+    écart absolu aux cibles semaine / week-end (en jours), cases restées vides
+    et affectations tombées dans une fenêtre de compensation.
+    """
+    if not stats:
+        return 0.0
+    deviation = 0.0
+    for counts_key, targets_key in (("counts_week", "targets_week"), ("counts_we", "targets_we")):
+        counts = stats.get(counts_key, {})
+        for nm, tgt in stats.get(targets_key, {}).items():
+            deviation += abs(counts.get(nm, 0) - tgt)
+    return (
+        deviation
+        + RESTART_UNFILLED_WEIGHT * stats.get("unfilled", 0)
+        + WEEKDAY_COMPENSATION_MALUS * stats.get("compensation_hits", 0)
+    )
+
+
+_ENGINE_OPTION_NAMES = (
+    "ENABLE_MAX_WE_DAYS",
+    "MAX_WE_DAYS_PER_MONTH",
+    "ENABLE_WEEKEND_BLOCKS",
+    "WEEKEND_BLOCK_POSTS",
+    "ENABLE_WEEKDAY_COMPENSATION",
+    "WEEKDAY_COMPENSATION_MALUS",
+    "RESTART_UNFILLED_WEIGHT",
+)
+
 
-def optimize_month_balance(constraints_app, planning_gui, tabs_data, current_index=None):
+def _options_snapshot():
+    """Options du moteur à recopier dans les processus de relance (et pour le solveur exact)."""
+    return {name: copy.copy(globals()[name]) for name in _ENGINE_OPTION_NAMES}
+
+
+def _init_restart_worker(options):
+    """Initialiseur des processus de relance : reprend les options du moteur du processus parent."""
+    globals().update(options)
+
+
+def _restart_job(job):
+    """
+    Une relance de l'assignation (fonction de module : picklable pour le pool).
+    job = (model, profiles, seed) ; retourne (score, changes, stats).
+    Les options du moteur sont celles du module (voir _init_restart_worker).
+    """
+    model, profiles, seed = job
+    work = copy.deepcopy(model)
+    stats = assign_on_model(work, copy.deepcopy(profiles), rng=random.Random(seed))
+    return score_assignment(stats), work.changes(), stats
+
+
+def assign_best_of(model, profiles, restarts=None, max_workers=None, rng=None):
+    """
+    Lance `restarts` assignations indépendantes (ASSIGNMENT_RESTARTS par défaut)
+    sur des copies de `model`, en parallèle si possible, et applique au modèle
+    la meilleure selon score_assignment. Retourne ses statistiques.
+    Les graines des relances sont tirées de `rng` : chaque relance a son propre
+    flux, et le même `rng` de départ redonne le même résultat.
+    """
+    try:
+        restarts = max(1, int(ASSIGNMENT_RESTARTS if restarts is None else restarts))
+    except Exception:
+        restarts = 1
+    if rng is None:
+        rng = random.Random()
+    if restarts == 1:
+        return assign_on_model(model, profiles, rng=rng)
+
+    seeds = [rng.randrange(1 << 32) for _ in range(restarts)]
+    jobs = [(model, profiles, seed) for seed in seeds]
+
+    if max_workers is None:
+        max_workers = ASSIGNMENT_MAX_WORKERS
+    try:
+        workers = min(restarts, int(max_workers or os.cpu_count() or 1))
+    except Exception:
+        workers = 1
+
+    results = None
+    if workers > 1:
+        try:
+            with ProcessPoolExecutor(max_workers=workers, initializer=_init_restart_worker,
+                                     initargs=(_options_snapshot(),)) as pool:
+                results = list(pool.map(_restart_job, jobs))
+        except Exception:
+            # Pool indisponible (environnement restreint, exe sans freeze_support...) : repli séquentiel
+            results = None
+    if results is None:
+        results = [_restart_job(job) for job in jobs]
+
+    best_score, best_changes, best_stats = min(results, key=lambda res: res[0])
+    for r_idx, c_idx, value in best_changes:
+        model.set(r_idx, c_idx, value)
+    return best_stats
+
+
+def optimize_month_balance(constraints_app, planning_gui, tabs_data, current_index=None, seed=None):
     """
     Passe d'optimisation locale sur le mois courant uniquement :
-    cherche des swaps entre profils pour réduire l'écart cumulatif (week / we)
-    sans violer les contraintes de base. Ne modifie rien si l'option n'est pas activée.
-    Retourne la liste des changements effectués.
+    cherche des remplacements et des échanges entre profils pour réduire l'écart
+    cumulatif (week / we) sans violer les contraintes de base. Ne modifie rien si
+    l'option n'est pas activée.
+    Retourne la liste des changements effectués. La graine du passage est mémorisée
+    dans planning_gui.last_optimize_seed.
     """
     if not OPTIMIZE_BALANCE:
         return []
@@ -868,9 +1135,16 @@ def optimize_month_balance(constraints_app, planning_gui, tabs_data, current_ind
     except Exception:
         return []
 
-    import random
     from datetime import date, timedelta
-    from Full_GUI import days, work_posts, extract_names_from_cell
+    from Full_GUI import days, work_posts
+
+    if seed is None:
+        seed = new_run_seed()
+    try:
+        planning_gui.last_optimize_seed = seed
+    except Exception:
+        pass
+    rng = random.Random(seed)
 
     # Trouver l'index du mois courant si non fourni
     if current_index is None:
@@ -889,121 +1163,13 @@ def optimize_month_balance(constraints_app, planning_gui, tabs_data, current_ind
     if not rows:
         return
 
-    # --- Extraction des profils depuis le tableau de contraintes (copie légère) ---
-    def _split_csv(text):
-        return [p.strip() for p in str(text or "").replace(";", ",").split(",") if p.strip()]
-
-    def _parse_excluded_weekdays_val(txt):
-        txt_lower = str(txt or "").strip().lower()
-        if txt_lower in {"weekdays_only", "weekday_only", "weekdays"}:
-            return {"fri", "sat", "sun"}
-        if txt_lower in {"weekends_only", "weekend_only", "weekend"}:
-            return {"mon", "tue", "wed", "thu"}
-        parts = [p.strip() for p in txt_lower.replace(";", ",").split(",") if p.strip()]
-        return set(parts)
-
-    profiles = []
-    initials_set = set()
-    for row in rows:
-        try:
-            init = str(row[0].get()).strip()
-        except Exception:
-            init = ""
-        if not init:
-            continue
-        initials_set.add(init)
-        try:
-            part = float(row[1].get())
-        except Exception:
-            part = 100.0
-        part = max(0.0, min(100.0, part)) / 100.0
-        try:
-            pref_txt = row[2]._var.get() if hasattr(row[2], "_var") else row[2].cget("text")
-        except Exception:
-            pref_txt = ""
-        preferred = _split_csv(pref_txt)
-        try:
-            non_txt = row[3]._var.get()
-        except Exception:
-            try:
-                non_txt = row[3].cget("text")
-            except Exception:
-                non_txt = ""
-        non_assured = set(_split_csv(non_txt))
-
-        try:
-            abs_txt = row[5].var.get()
-        except Exception:
-            try:
-                abs_txt = row[5].cget("text")
-            except Exception:
-                abs_txt = ""
-        absences = set()
-        for part_item in _split_csv(abs_txt):
-            try:
-                if "-" in part_item:
-                    start, end = part_item.split("-", 1)
-                    start_i, end_i = int(start), int(end)
-                    if start_i <= end_i:
-                        absences.update(range(start_i, end_i + 1))
-                        continue
-                num = int(part_item)
-                absences.add(num)
-            except Exception:
-                continue
-
-        scope_raw = None
-        try:
-            exclusion_btn = next((w for w in row if getattr(w, "_is_exclusion_button", False)), None)
-        except Exception:
-            exclusion_btn = None
-        if exclusion_btn is not None:
-            try:
-                scope_raw = exclusion_btn._var.get()
-            except Exception:
-                try:
-                    scope_raw = exclusion_btn.cget("text")
-                except Exception:
-                    scope_raw = None
-        excluded_weekdays = set(_parse_excluded_weekdays_val(scope_raw)) if scope_raw else set()
-
-        assoc_txt = ""
-        try:
-            assoc_widget = row[4]
-            if hasattr(assoc_widget, "_var"):
-                assoc_txt = assoc_widget._var.get()
-            else:
-                assoc_txt = assoc_widget.cget("text")
-        except Exception:
-            assoc_txt = ""
-        associations = [p for p in _split_csv(assoc_txt)]
-
-        profiles.append(
-            {
-                "initial": init,
-                "participation": part,
-                "preferred": preferred,
-                "non_assured": non_assured,
-                "absences": absences,
-                "excluded_weekdays": excluded_weekdays,
-                "associations": associations,
-            }
-        )
-
+    profiles = read_profiles(rows)
     if not profiles:
         return []
+    initials_set = {p["initial"] for p in profiles}
 
-    profile_by_initial = {p["initial"]: p for p in profiles}
-
-    WEEKDAY_CODES = ["mon", "tue", "wed", "thu", "fri", "sat", "sun"]
-
-    def _weekday_code(dt_obj: date | None):
-        try:
-            return WEEKDAY_CODES[dt_obj.weekday()]
-        except Exception:
-            return None
-
-    def _day_type_for_gui(gui_obj, row_idx):
+    def _row_info_for_gui(gui_obj, row_idx):
+        """(type de jour, numéro du jour, code jour) d'une ligne, d'après les libellés de l'onglet."""
         try:
             label_text = gui_obj.day_labels[row_idx].cget("text").strip()
             day_num = int(label_text)
@@ -1020,245 +1186,307 @@ def optimize_month_balance(constraints_app, planning_gui, tabs_data, current_ind
         holiday_dates = getattr(gui_obj, "holiday_dates", set())
         is_weekend = row_idx in weekend_rows
         is_holiday = row_idx in holiday_rows
+        code = None
         if dt:
             try:
                 wd = dt.weekday()
+                code = WEEKDAY_CODES[wd]
                 is_weekend = is_weekend or wd >= 5 or wd == 4
                 is_holiday = is_holiday or dt in holiday_dates or (dt + timedelta(days=1) in holiday_dates)
             except Exception:
                 pass
         dtype = "we" if (is_weekend or is_holiday) else "week"
-        return dtype, day_num, dt
+        return dtype, day_num, code
+
+    _resolve = get_name_resolver(initials_set)
 
-    # Comptage cumulatif sur tous les mois jusqu'au courant
-    counts_week = {p["initial"]: 0 for p in profiles}
-    counts_we = {p["initial"]: 0 for p in profiles}
-    assigned_week_total = 0
-    assigned_we_total = 0
+    # Comptage cumulatif (par case) sur les mois précédents ; le mois courant est compté sur le modèle
+    counts = {"week": {p["initial"]: 0 for p in profiles}, "we": {p["initial"]: 0 for p in profiles}}
 
-    def _accumulate_tab(gui_obj, upto_only=False):
-        nonlocal assigned_week_total, assigned_we_total
+    def _count_tab(gui_obj):
+        """Décompte par case {"week": {initiale: n}, "we": {...}} d'un onglet."""
+        tab_counts = {"week": {}, "we": {}}
         entries = getattr(gui_obj, "table_entries", [])
         cell_availability = getattr(gui_obj, "cell_availability", {})
         for r_idx, row in enumerate(entries):
-            dtype, day_num, dt = _day_type_for_gui(gui_obj, r_idx)
+            dtype = _row_info_for_gui(gui_obj, r_idx)[0]
+            bucket = tab_counts[dtype]
             for c_idx, cell in enumerate(row):
                 try:
                     if not cell or not cell_availability.get((r_idx, c_idx), True):
                         continue
-                except Exception:
-                    continue
-                try:
                     val = cell.get().strip()
                 except Exception:
-                    val = ""
+                    continue
                 if not val:
                     continue
-                names = extract_names_from_cell(val, initials_set)
-                for nm in names:
-                    if nm not in counts_week:
-                        continue
-                    if dtype == "we":
-                        counts_we[nm] += 1
-                        assigned_we_total += 1
-                    else:
-                        counts_week[nm] += 1
-                        assigned_week_total += 1
+                for nm in _resolve(val):
+                    if nm in initials_set:
+                        bucket[nm] = bucket.get(nm, 0) + 1
+        return tab_counts
+
+    counts_key = ("cells", frozenset(initials_set))
+
+    def _accumulate_tab(gui_obj):
+        # Les onglets déjà saisis ne sont pas relus tant qu'aucune de leurs cellules n'a changé
+        cached = getattr(gui_obj, "cached_counts", None)
+        tab_counts = cached(counts_key, _count_tab) if cached is not None else _count_tab(gui_obj)
+        for dtype, per_person in tab_counts.items():
+            bucket = counts[dtype]
+            for nm, n in per_person.items():
+                bucket[nm] += n
 
     try:
         for idx, (g_obj, _c, _s) in enumerate(tabs_data):
-            if g_obj is None:
-                continue
-            _accumulate_tab(g_obj)
             if idx >= current_index:
                 break
+            if g_obj is None or g_obj is planning_gui:
+                continue
+            _accumulate_tab(g_obj)
     except Exception:
         return
 
-    # Cibles : moyenne des 100% comme référence (sinon fallback proportionnel au total assigné)
-    full_time_inits = [p["initial"] for p in profiles if p.get("participation", 1.0) >= 0.99]
-    if full_time_inits:
-        avg_week_full = sum(counts_week.get(init, 0) for init in full_time_inits) / max(1, len(full_time_inits))
-        avg_we_full = sum(counts_we.get(init, 0) for init in full_time_inits) / max(1, len(full_time_inits))
-        targets_week = {p["initial"]: p["participation"] * avg_week_full for p in profiles}
-        targets_we = {p["initial"]: p["participation"] * avg_we_full for p in profiles}
-    else:
-        total_part = sum(p.get("participation", 1.0) for p in profiles) or 1.0
-        targets_week = {p["initial"]: (p.get("participation", 1.0) / total_part) * assigned_week_total for p in profiles}
-        targets_we = {p["initial"]: (p.get("participation", 1.0) / total_part) * assigned_we_total for p in profiles}
-
-    # Préparer les cellules du mois courant
-    current_gui = planning_gui
-    entries = getattr(current_gui, "table_entries", [])
-    cell_availability = getattr(current_gui, "cell_availability", {})
-    weekend_block_posts = set()
+    year = getattr(planning_gui, "current_year", date.today().year)
+    month = getattr(planning_gui, "current_month", date.today().month)
+    model = PlanningModel.from_gui(planning_gui, work_posts, days, year, month)
+    row_info = [_row_info_for_gui(planning_gui, r_idx) for r_idx in range(len(model.grid))]
+
     try:
-        weekend_block_posts = set(WEEKEND_BLOCK_POSTS)
+        block_posts = set(WEEKEND_BLOCK_POSTS)
     except Exception:
-        weekend_block_posts = set()
+        block_posts = set()
 
-    def _is_eligible(profile, r_idx, c_idx, dtype, day_num, dt_obj):
-        post_name = work_posts[c_idx] if c_idx < len(work_posts) else ""
-        # Cellule active
+    moves = balance_on_model(model, profiles, row_info, counts, block_posts, rng=rng, name_resolver=_resolve)
+    model.write_back(planning_gui)
+
+    changes_log = []
+    for r_idx, c_idx, old_initial, new_initial, dtype in moves:
         try:
-            if not cell_availability.get((r_idx, c_idx), True):
-                return False
+            day_label = str(days[r_idx]) if r_idx < len(days) else str(r_idx + 1)
         except Exception:
+            day_label = str(r_idx + 1)
+        post_name = work_posts[c_idx] if c_idx < len(work_posts) else ""
+        changes_log.append({
+            "day": day_label,
+            "post": post_name or f"Poste {c_idx+1}",
+            "from": old_initial,
+            "to": new_initial,
+            "dtype": dtype,
+        })
+    return changes_log
+
+
+def balance_on_model(model, profiles, row_info, counts, block_posts=(), rng=None, name_resolver=None, max_moves=None):
+    """
+    Recherche locale headless pour optimize_month_balance.
+
+    - row_info[r] = (type de jour, numéro du jour, code jour) de chaque ligne du modèle
+    - counts = {"week": {initiale: n}, "we": {...}} : cumul des mois précédents (par case) ;
+      le mois courant (model) y est ajouté.
+    Cibles : moyenne des profils à 100 % pondérée par la participation.
+    Les personnes les plus au-dessus / en dessous de leur cible sont tenues dans des
+    files de priorité ; un mouvement (remplacement d'une case, ou échange de deux cases
+    semaine / WE entre deux personnes) n'est appliqué que s'il réduit l'écart total.
+    Modifie `model` et retourne la liste des mouvements (row, col, ancien, nouveau, type).
+    """
+    import heapq
+    from collections import Counter
+
+    if rng is None:
+        rng = random.Random()
+    profile_by_initial = {}
+    for p in profiles:
+        profile_by_initial.setdefault(p["initial"], p)
+    initials_set = set(profile_by_initial)
+    if name_resolver is None:
+        name_resolver = get_name_resolver(initials_set)
+
+    counts = {dtype: dict(counts.get(dtype, {})) for dtype in ("week", "we")}
+    for dtype in counts:
+        for nm in initials_set:
+            counts[dtype].setdefault(nm, 0)
+
+    # Index du mois courant : occupation par ligne, cases déplaçables par personne et type de jour
+    row_names = [Counter() for _ in model.grid]
+    cells_of = {"week": {nm: set() for nm in initials_set}, "we": {nm: set() for nm in initials_set}}
+    for r_idx, row in enumerate(model.grid):
+        dtype = row_info[r_idx][0]
+        for c_idx, value in enumerate(row):
+            if not model.has_cell(r_idx, c_idx) or not value.strip():
+                continue
+            names = name_resolver(value)
+            row_names[r_idx].update(names)
+            open_cell = model.availability[r_idx][c_idx]
+            if open_cell:
+                for nm in names:
+                    counts[dtype][nm] += 1
+            # Seules les cases ouvertes à un seul nom sont déplacées (hors blocs week-end)
+            if len(names) != 1 or not open_cell or c_idx >= len(model.posts):
+                continue
+            if dtype == "we" and model.posts[c_idx] in block_posts:
+                continue
+            cells_of[dtype][names[0]].add((r_idx, c_idx))
+
+    # Cibles : moyenne des 100% comme référence (sinon proportionnel au total assigné)
+    targets = {}
+    full_time = [p["initial"] for p in profile_by_initial.values() if p.get("participation", 1.0) >= 0.99]
+    total_part = sum(p.get("participation", 1.0) for p in profile_by_initial.values()) or 1.0
+    for dtype in ("week", "we"):
+        if full_time:
+            avg_full = sum(counts[dtype].get(nm, 0) for nm in full_time) / len(full_time)
+            targets[dtype] = {nm: p["participation"] * avg_full for nm, p in profile_by_initial.items()}
+        else:
+            assigned = sum(counts[dtype].values())
+            targets[dtype] = {
+                nm: (p.get("participation", 1.0) / total_part) * assigned
+                for nm, p in profile_by_initial.items()
+            }
+
+    def _dev(nm, dtype):
+        return counts[dtype][nm] - targets[dtype][nm]
+
+    def _delta(nm, dtype, step):
+        d = _dev(nm, dtype)
+        return abs(d + step) - abs(d)
+
+    def _is_eligible(profile, r_idx, c_idx, leaving=None):
+        """Règles de base ; `leaving` = initiale qui libère une case de la même ligne."""
+        if not model.availability[r_idx][c_idx]:
             return False
-        # Absence
+        _dtype, day_num, code = row_info[r_idx]
         if day_num in profile.get("absences", set()):
             return False
-        # Exclusion jour
-        code = _weekday_code(dt_obj)
         if code and code in profile.get("excluded_weekdays", set()):
             return False
-        # Poste non assuré
+        post_name = model.posts[c_idx] if c_idx < len(model.posts) else ""
         if post_name and post_name in profile.get("non_assured", set()):
             return False
-        # Pas de doublon non autorisé : on autorise si le profil est déjà présent ET que le poste est dans ses associations
-        row_cells = entries[r_idx] if r_idx < len(entries) else []
+        # Pas de doublon sur la journée, sauf pour un profil ayant des postes associés
+        present = row_names[r_idx][profile["initial"]]
+        if leaving == profile["initial"]:
+            present -= 1
+        if present > 0 and not profile.get("associations"):
+            return False
+        return True
+
+    EPS = 1e-9
+    heaps = {"over": {"week": [], "we": []}, "under": {"week": [], "we": []}}
+    version = Counter()
+
+    def _push(nm, dtype):
+        version[(nm, dtype)] += 1
+        stamp = version[(nm, dtype)]
+        d = _dev(nm, dtype)
+        if d > 0.01:
+            heapq.heappush(heaps["over"][dtype], (-d, stamp, nm))
+        elif d < -0.01:
+            heapq.heappush(heaps["under"][dtype], (d, stamp, nm))
+
+    for dtype in ("week", "we"):
+        for nm in sorted(initials_set):
+            _push(nm, dtype)
+
+    def _pop_valid(heap, dtype):
+        while heap:
+            key, stamp, nm = heapq.heappop(heap)
+            if version[(nm, dtype)] == stamp:
+                return key, stamp, nm
+        return None
+
+    def _unders(dtype):
+        """Personnes en dessous de leur cible, de la plus en retard à la moins en retard."""
+        heap = heaps["under"][dtype]
+        taken = []
         try:
-            existing_names = set()
-            for cell in row_cells:
-                if not cell:
+            while True:
+                item = _pop_valid(heap, dtype)
+                if item is None:
+                    return
+                taken.append(item)
+                yield item[2]
+        finally:
+            for item in taken:
+                heapq.heappush(heap, item)
+
+    moves = []
+
+    def _set_cell(r_idx, c_idx, old_nm, new_nm, dtype):
+        model.set(r_idx, c_idx, new_nm)
+        row_names[r_idx][old_nm] -= 1
+        row_names[r_idx][new_nm] += 1
+        cells_of[dtype][old_nm].discard((r_idx, c_idx))
+        cells_of[dtype][new_nm].add((r_idx, c_idx))
+        counts[dtype][old_nm] -= 1
+        counts[dtype][new_nm] += 1
+        moves.append((r_idx, c_idx, old_nm, new_nm, dtype))
+
+    def _try_replace(over_nm, dtype, cells):
+        for r_idx, c_idx in cells:
+            for under_nm in _unders(dtype):
+                if under_nm == over_nm:
                     continue
-                val = cell.get().strip()
-                if not val:
+                # Les suivants sont moins en retard : aucun gain possible au-delà
+                if _delta(over_nm, dtype, -1) + _delta(under_nm, dtype, 1) >= -EPS:
+                    break
+                if not _is_eligible(profile_by_initial[under_nm], r_idx, c_idx):
                     continue
-                existing_names.update(extract_names_from_cell(val, initials_set))
-            if profile["initial"] in existing_names:
-                if profile.get("associations"):
-                    return True
-                else:
-                    return False
-        except Exception:
-            pass
-        return True
-
-    # Liste des cellules remplies (mois courant) par type/poste
-    filled_cells = []
-    for r_idx, row in enumerate(entries):
-        dtype, day_num, dt_obj = _day_type_for_gui(current_gui, r_idx)
-        for c_idx, cell in enumerate(row):
-            try:
-                if not cell:
+                _set_cell(r_idx, c_idx, over_nm, under_nm, dtype)
+                for nm in (over_nm, under_nm):
+                    _push(nm, dtype)
+                return True
+        return False
+
+    def _try_swap(over_nm, dtype, cells):
+        """Échange une case `dtype` de over_nm contre une case de l'autre type tenue par under_nm."""
+        other = "we" if dtype == "week" else "week"
+        for r_idx, c_idx in cells:
+            for under_nm in _unders(dtype):
+                if under_nm == over_nm:
                     continue
-                val = cell.get().strip()
-            except Exception:
-                continue
-            if not val:
-                continue
-            names = extract_names_from_cell(val, initials_set)
-            for nm in names:
-                filled_cells.append({
-                    "r": r_idx,
-                    "c": c_idx,
-                    "dtype": dtype,
-                    "day_num": day_num,
-                    "dt": dt_obj,
-                    "initial": nm,
-                })
-
-    def _diff(initial, dtype):
-        if dtype == "we":
-            return counts_we.get(initial, 0) - targets_we.get(initial, 0.0)
-        return counts_week.get(initial, 0) - targets_week.get(initial, 0.0)
-
-    # Optimisation : remplacements pour réduire l'écart aux cibles (pas de swap)
-    changes_log = []
-
-    def _apply_replacement(cell_entry, new_initial):
-        """Remplace l'initiale sur la cellule, met à jour les comptes et l'entrée."""
-        r, c, old_initial = cell_entry["r"], cell_entry["c"], cell_entry["initial"]
-        try:
-            cell = entries[r][c]
-            if cell is None:
-                return False
-            cell.delete(0, "end")
-            cell.insert(0, new_initial)
-        except Exception:
-            return False
-        if cell_entry["dtype"] == "we":
-            counts_we[old_initial] = counts_we.get(old_initial, 0) - 1
-            counts_we[new_initial] = counts_we.get(new_initial, 0) + 1
-        else:
-            counts_week[old_initial] = counts_week.get(old_initial, 0) - 1
-            counts_week[new_initial] = counts_week.get(new_initial, 0) + 1
-        cell_entry["initial"] = new_initial
-        return True
-
-    MAX_ITERS = 200
-    iter_count = 0
-    while iter_count < MAX_ITERS:
-        iter_count += 1
-        improved = False
-        for dtype in ("week", "we"):
-            target_map = targets_week if dtype == "week" else targets_we
-            count_map = counts_week if dtype == "week" else counts_we
-            over_inits = sorted(
-                [init for init in initials_set if _diff(init, dtype) > 0.01],
-                key=lambda x: _diff(x, dtype),
-                reverse=True,
-            )
-            under_inits = sorted(
-                [init for init in initials_set if _diff(init, dtype) < -0.01],
-                key=lambda x: _diff(x, dtype),
-            )
-            if not over_inits or not under_inits:
-                continue
-
-            # Indexer les cellules par initiale pour ce dtype
-            cells_by_initial = {}
-            for idx, cell in enumerate(filled_cells):
-                if cell["dtype"] != dtype:
+                gain_here = _delta(over_nm, dtype, -1) + _delta(under_nm, dtype, 1)
+                if not _is_eligible(profile_by_initial[under_nm], r_idx, c_idx):
+                    continue
+                # Le gain ne dépend pas de la case échangée, seulement des deux personnes
+                if gain_here + _delta(under_nm, other, -1) + _delta(over_nm, other, 1) >= -EPS:
                     continue
-                cells_by_initial.setdefault(cell["initial"], []).append(idx)
-
-            for over_init in over_inits:
-                cell_indices = cells_by_initial.get(over_init, [])
-                random.shuffle(cell_indices)
-                for cell_idx in cell_indices:
-                    cell_entry = filled_cells[cell_idx]
-                    post_name = work_posts[cell_entry["c"]] if cell_entry["c"] < len(work_posts) else ""
-                    if dtype == "we" and post_name in weekend_block_posts:
+                other_cells = sorted(cells_of[other][under_nm])
+                rng.shuffle(other_cells)
+                for r_other, c_other in other_cells:
+                    if not _is_eligible(profile_by_initial[over_nm], r_other, c_other, leaving=under_nm):
                         continue
-                    for under_init in under_inits:
-                        if under_init == over_init:
-                            continue
-                        prof_under = profile_by_initial.get(under_init)
-                        if not prof_under:
-                            continue
-                        if not _is_eligible(
-                            prof_under,
-                            cell_entry["r"],
-                            cell_entry["c"],
-                            dtype,
-                            cell_entry["day_num"],
-                            cell_entry["dt"],
-                        ):
-                            continue
-                        before_over = count_map.get(over_init, 0)
-                        before_under = count_map.get(under_init, 0)
-                        if _apply_replacement(cell_entry, under_init):
-                            # Log changement
-                            try:
-                                day_label = str(days[cell_entry["r"]]) if cell_entry["r"] < len(days) else str(cell_entry["r"] + 1)
-                            except Exception:
-                                day_label = str(cell_entry["r"] + 1)
-                            changes_log.append({
-                                "day": day_label,
-                                "post": post_name or f"Poste {cell_entry['c']+1}",
-                                "from": over_init,
-                                "to": under_init,
-                                "dtype": dtype,
-                            })
-                            improved = True
-                            break
-                    if improved:
-                        break
-                if improved:
+                    _set_cell(r_idx, c_idx, over_nm, under_nm, dtype)
+                    _set_cell(r_other, c_other, under_nm, over_nm, other)
+                    for nm in (over_nm, under_nm):
+                        _push(nm, dtype)
+                        _push(nm, other)
+                    return True
+        return False
+
+    if max_moves is None:
+        max_moves = 4 * sum(len(cells) for per_type in cells_of.values() for cells in per_type.values()) + 10
+    parked = {"week": [], "we": []}
+    while len(moves) < max_moves:
+        progress = False
+        for dtype in ("week", "we"):
+            while True:
+                item = _pop_valid(heaps["over"][dtype], dtype)
+                if item is None:
+                    break
+                over_nm = item[2]
+                cells = sorted(cells_of[dtype][over_nm])
+                rng.shuffle(cells)
+                if _try_replace(over_nm, dtype, cells) or _try_swap(over_nm, dtype, cells):
+                    progress = True
                     break
-        if not improved:
+                # Aucun mouvement utile pour l'instant : remis en file après le prochain changement
+                parked[dtype].append(item)
+            if progress:
+                break
+        if not progress:
             break
+        for dtype in ("week", "we"):
+            for item in parked[dtype]:
+                heapq.heappush(heaps["over"][dtype], item)
+            parked[dtype].clear()
 
-    return changes_log
+    return moves
@@ -346,6 +346,10 @@ class ConstraintsTable(tk.Frame):
     def __init__(self, master=None, work_posts=None, planning_gui=None):
         super().__init__(master)
         self.rows = []
+        # Incrémenté à chaque modification des lignes (ajout/suppression/saisie) :
+        # permet aux caches (éligibilité) de savoir s'ils sont périmés.
+        self.version = 0
+        self.on_change = None   # rappel optionnel à chaque modification (révision du modèle)
         self.work_posts = list(work_posts or [])
         self.minimized = False
         self.selected_row_index = None
@@ -417,17 +421,27 @@ class ConstraintsTable(tk.Frame):
         self._setup_mousewheel()
 
     # Row management ------------------------------------------------------
+    def bump_version(self, *_args):
+        """Signale une modification du tableau (appelé aussi par les traces des variables)."""
+        self.version += 1
+        if self.on_change is not None:
+            self.on_change()
+
     def add_row(self):
         idx = len(self.rows)
         entries = []
 
         # Initiales
-        init_entry = tk.Entry(self.table, width=14)
+        init_var = tk.StringVar(master=self, value="")
+        init_var.trace_add("write", self.bump_version)
+        init_entry = tk.Entry(self.table, width=14, textvariable=init_var)
+        init_entry._text_var = init_var
         init_entry.grid(row=idx, column=0, padx=4, pady=2, sticky="ew")
         entries.append(init_entry)
 
         # Participation (%)
         part_var = tk.StringVar(value="100")
+        part_var.trace_add("write", self.bump_version)
         part_spin = tk.Spinbox(
             self.table,
             from_=0,
@@ -487,7 +501,10 @@ class ConstraintsTable(tk.Frame):
         entries.append(exclusion_btn)
 
         # Commentaire (dernière colonne visible)
-        comment = tk.Entry(self.table, width=20)
+        comment_var = tk.StringVar(master=self, value="")
+        comment_var.trace_add("write", self.bump_version)
+        comment = tk.Entry(self.table, width=20, textvariable=comment_var)
+        comment._text_var = comment_var
         comment.grid(row=idx, column=7, padx=4, pady=2, sticky="ew")
         entries.append(comment)
 
@@ -499,7 +516,11 @@ class ConstraintsTable(tk.Frame):
         action_btn.grid(row=idx, column=8, padx=4, pady=2, sticky="e")
         entries.append(action_btn)
 
+        for var in (pref_btn._var, non_btn._var, assoc_btn._var, abs_var, exclusion_btn._var):
+            var.trace_add("write", self.bump_version)
+
         self.rows.append(entries)
+        self.bump_version()
         self._bind_row_highlight(entries)
         self._remember_default_row_colors(entries)
         self._apply_column_layout()
@@ -508,6 +529,7 @@ class ConstraintsTable(tk.Frame):
         if not self.rows:
             return
         widgets = self.rows.pop()
+        self.bump_version()
         # reset sélection si on supprime la ligne active
         self.selected_row_index = None
         for w in widgets:
@@ -641,6 +663,7 @@ class ConstraintsTable(tk.Frame):
         if new_idx < 0 or new_idx >= len(self.rows):
             return idx
         self.rows[idx], self.rows[new_idx] = self.rows[new_idx], self.rows[idx]
+        self.bump_version()
         self._regrid_row(self.rows[idx], idx)
         self._regrid_row(self.rows[new_idx], new_idx)
         return new_idx
@@ -964,6 +987,7 @@ class ConstraintsTable(tk.Frame):
     def refresh_work_posts(self, new_posts):
         """Met à jour la liste des postes utilisable pour préf/non assurées/associations."""
         self.work_posts = list(new_posts or [])
+        self.bump_version()
         for row in self.rows:
             # row[3] et row[4] sont des CheckListButton
             try:
@@ -501,7 +501,8 @@ def export_combined_to_excel(root, tabs_data, days, work_posts, POST_INFO):
     import openpyxl
     from openpyxl.styles import PatternFill, Font, Alignment, Border, Side
     from tkinter import messagebox, filedialog
-    import pickle, os
+    import os
+    from status_io import read_status_file
 
     # --- Choisir le .pkl Ã  combiner ---
     pkl_path = filedialog.askopenfilename(
@@ -524,10 +525,9 @@ def export_combined_to_excel(root, tabs_data, days, work_posts, POST_INFO):
 
     # --- Charger le planning importÃ© ---
     try:
-        with open(pkl_path, "rb") as f:
-            # format : (all_week_status, work_posts, POST_INFO, options)
-            # all_week_status[i] : (table_data, cell_av, constraints_data, schedule_data, week_label, excluded)
-            other_all_week_status, other_posts, _other_post_info, _other_opts = pickle.load(f)
+        # format : (all_week_status, work_posts, POST_INFO, options)
+        # all_week_status[i] : (table_data, cell_av, constraints_data, schedule_data, week_label, excluded)
+        other_all_week_status, other_posts, _other_post_info, _other_opts = read_status_file(pkl_path)
     except Exception as e:
         messagebox.showerror("Export combiné", f"Impossible de lire le .pkl sélectionnée :\n{e}")
         return None
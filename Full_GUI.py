@@ -3,6 +3,8 @@ from tkinter import ttk, messagebox, filedialog
 from tkinter import font as tkfont
 import os
 import re
+import time
+import threading
 import pickle
 import unicodedata
 import calendar
@@ -11,14 +13,17 @@ from datetime import date, timedelta
 import Assignation
 from Assignation import assigner_initiales
 from ConstraintsV2 import ConstraintsTable, MultiSelectPopup
+from cell_store import CellStore
+from status_io import copy_file_atomic, find_latest_valid, generation_paths, read_status, write_status_file
+from status_schema import AssignmentOptions, MonthStatus, PlanningStatus
 from Export import (
     export_to_excel as export_to_excel_external,
     export_combined_to_excel as export_combined_to_excel_external
 )
 from eligibility import (
     AssignmentSettings,
+    EligibilityService,
     PlanningContext,
-    candidate_is_available,
     parse_constraint_row,
 )
 
@@ -27,6 +32,14 @@ from eligibility import (
 
 APP_TITLE = "ScanTime PDS"
 current_status_path = None
+_AUTOSAVE_THREAD = None   # thread d'écriture de la sauvegarde automatique en cours
+_MODEL_REVISION = 0       # révision du modèle (cellules, contraintes, postes, options), croissante
+_AUTOSAVED_REVISION = None  # révision écrite par la dernière sauvegarde auto réussie
+_MODEL_STATE_KEY = None   # signature options / métadonnées vue au dernier contrôle
+_LAST_EDIT_TIME = 0.0
+_IDLE_AUTOSAVE_JOB = None
+AUTOSAVE_IDLE_DELAY_MS = 5000   # sauvegarde auto après ce délai sans modification
+AUTOSAVE_GENERATIONS = 5       # sauvegarde_auto.pkl + 4 versions précédentes (.1 … .4)
 root = None  # Main Tk window, set in __main__
 title_label = None  # Banner label shown at the top of the UI
 UNDO_CONSTRAINT_TAG = "__constraint_widget__"
@@ -114,6 +127,14 @@ MONTH_NAMES_FR = [
 HOLIDAY_DAY_BG = "#FFD65C"
 HOLIDAY_CELL_BG = "#FFF3D6"
 
+# Onglets paresseux : au chargement d'un statut, seuls les widgets de la grille de
+# l'onglet affiché sont construits ; les autres mois gardent leur contenu dans un
+# CellStore jusqu'à leur première sélection.
+LAZY_TAB_WIDGETS = True
+# Secondes sans visite après lesquelles la grille d'un onglet inactif est relâchée
+# (None = jamais).
+UNLOAD_IDLE_TABS_AFTER_S = None
+
 try:
     import holidays as _holidays_lib
 except Exception:
@@ -271,43 +292,16 @@ def setup_modern_styles(root: tk.Tk) -> ttk.Style:
 
 
 
-_MULTI_NAME_SPLIT_RE = re.compile(r"[\n,;/&+]+")
-
-def _normalize_initial_label(value: str) -> str:
-    return " ".join(str(value or "").strip().split()).upper()
+from planning_model import (
+    MULTI_NAME_SPLIT_RE as _MULTI_NAME_SPLIT_RE,
+    normalize_initial_label as _normalize_initial_label,
+    extract_names_from_text as _extract_names_from_cell_impl,
+    get_name_resolver,
+)
 
 def extract_names_from_cell(raw_text: str, valid_names=None):
     return _extract_names_from_cell_impl(raw_text, valid_names)
 
-def _extract_names_from_cell_impl(raw_text, valid_names=None):
-    "Return the list of initials detected in a planning cell."
-    text = str(raw_text or "").strip()
-    if not text or text.lower() == "x":
-        return []
-    normalized = re.sub(r"\s{2,}", "\n", text)
-    parts = [p.strip() for p in _MULTI_NAME_SPLIT_RE.split(normalized) if p.strip()]
-    if not parts:
-        parts = [text]
-    if not valid_names:
-        return list(dict.fromkeys(parts))
-    norm_map = {_normalize_initial_label(name): name for name in valid_names}
-    seen = set()
-    result = []
-    for part in parts:
-        key = _normalize_initial_label(part)
-        if key in norm_map and key not in seen:
-            result.append(norm_map[key])
-            seen.add(key)
-    if result:
-        return result
-    upper_text = " ".join(text.upper().split())
-    for key, original in norm_map.items():
-        pattern = r"(?<!\S)" + re.escape(key) + r"(?!\S)"
-        if re.search(pattern, upper_text) and key not in seen:
-            result.append(original)
-            seen.add(key)
-    return result
-
 
 # ---------- Routeur global pour la molette (singleton) ----------
 class _MouseWheelManager:
@@ -422,6 +416,7 @@ def update_work_posts(new_posts):
     """
     global work_posts
     work_posts = new_posts
+    bump_model_revision()
 
     try:
         if Assignation.FORBIDDEN_POST_ASSOCIATIONS:
@@ -552,6 +547,32 @@ def _build_index_for_gui(g_obj):
                 index.setdefault(norm, []).append((r, c, "ASTREINTE", c, post_name))
     return index
 
+def _live_keys_for_gui(g_obj):
+    """Ensemble {(nom normalisé, row, col)} d'un planning (index persistant si disponible)."""
+    getter = getattr(g_obj, "live_conflict_keys", None)
+    if getter is not None:
+        return getter()
+    return {(norm, r, c) for norm, occs in _build_index_for_gui(g_obj).items() for r, c, _h, _p, _n in occs}
+
+
+def _sync_conflict_badges(g_obj, cells):
+    """Pose / retire uniquement les badges dont l'état change pour ce planning."""
+    try:
+        shown = set(getattr(g_obj, "_cross_conflict_badges", {}).keys())
+    except Exception:
+        shown = set()
+    for row_idx, col_idx in shown - cells:
+        try:
+            g_obj.clear_cross_conflict_mark(row_idx, col_idx)
+        except Exception:
+            pass
+    for row_idx, col_idx in cells - shown:
+        try:
+            g_obj.mark_cross_conflict(row_idx, col_idx)
+        except Exception:
+            pass
+
+
 def _run_live_conflict_check():
     """Compare le planning principal avec le premier secondaire et marque les conflits en badges."""
     if _LIVE_CONFLICT_PAUSED:
@@ -592,17 +613,25 @@ def _run_live_conflict_check():
             unregister_window_context(ctx)
             return
 
-    # Nettoyage des badges existants avant recalcul
-    _clear_conflict_marks_for_context(primary_ctx)
-    _clear_conflict_marks_for_context(secondary_ctx)
-
     primary_tabs = primary_ctx.get("tabs_data", [])
     secondary_tabs = secondary_ctx.get("tabs_data", [])
     if not primary_tabs or not secondary_tabs:
+        _clear_conflict_marks_for_context(primary_ctx)
+        _clear_conflict_marks_for_context(secondary_ctx)
         return
 
-    tab_pairs = zip(primary_tabs, secondary_tabs)
-    for pair in tab_pairs:
+    # Badges attendus par planning : les index (nom, jour, poste) de chaque onglet sont
+    # tenus à jour à l'écriture des cellules ; les conflits sont leur intersection.
+    expected = {}
+    for ctx in (primary_ctx, secondary_ctx):
+        for item in ctx.get("tabs_data", []):
+            try:
+                if item[0] is not None:
+                    expected[item[0]] = set()
+            except Exception:
+                continue
+
+    for pair in zip(primary_tabs, secondary_tabs):
         try:
             g1, _c1, _s1 = pair[0]
             g2, _c2, _s2 = pair[1]
@@ -610,25 +639,13 @@ def _run_live_conflict_check():
             continue
         if g1 is None or g2 is None:
             continue
-        idx1 = _build_index_for_gui(g1)
-        idx2 = _build_index_for_gui(g2)
-        common = set(idx1.keys()) & set(idx2.keys())
-        for norm in common:
-            occ1 = idx1.get(norm, [])
-            occ2 = idx2.get(norm, [])
-            for r1, c1, half1, post_idx1, post_name1 in occ1:
-                for r2, c2, half2, post_idx2, post_name2 in occ2:
-                    if half1 != half2 or c1 != c2:
-                        continue
-                    # Conflit (poste ignor? car structures diff?rentes) : même personne, même jour/half, même poste
-                    try:
-                        g1.mark_cross_conflict(r1, c1)
-                    except Exception:
-                        pass
-                    try:
-                        g2.mark_cross_conflict(r2, c2)
-                    except Exception:
-                        pass
+        # Conflit : même personne, même jour, même poste dans les deux fenêtres
+        conflict_cells = {(r, c) for (_norm, r, c) in _live_keys_for_gui(g1) & _live_keys_for_gui(g2)}
+        expected.setdefault(g1, set()).update(conflict_cells)
+        expected.setdefault(g2, set()).update(conflict_cells)
+
+    for g_obj, cells in expected.items():
+        _sync_conflict_badges(g_obj, cells)
 
 
 def trigger_live_conflict_check():
@@ -1023,19 +1040,27 @@ class ShiftCountTable(tk.Frame):
         self.active_day_index = None
 
 
-    def update_counts(self):
-        """Rebuild the shift-count table using the current planning entries."""
+    def update_counts(self, changed_rows=None):
+        """
+        Refresh the shift-count table from the current planning entries.
+
+        changed_rows : lignes du planning modifiées depuis le dernier appel. Si fourni
+        (et que l'effectif n'a pas changé), seuls ces jours sont recomptés et les
+        écarts par personne sont appliqués aux totaux ; sinon recalcul complet.
+        Dans les deux cas, seules les lignes du Treeview dont les valeurs changent
+        sont mises à jour (iid stable par initiale).
+        """
         if not hasattr(self.planning_gui, 'constraints_app'):
             return
 
-        excluded = getattr(self.planning_gui, 'excluded_from_count', set())
-
         valid_initials = set()
+        ordered_initials = []
         for row in self.planning_gui.constraints_app.rows:
             try:
                 init = row[0].get().strip()
                 if init:
                     valid_initials.add(init)
+                    ordered_initials.append(init)
             except Exception:
                 continue
 
@@ -1069,79 +1094,118 @@ class ShiftCountTable(tk.Frame):
                 return "we"
             return "week"
 
+        resolve_names = get_name_resolver(valid_initials)
+
+        def row_people(gui_obj, r):
+            """(type de jour, personnes présentes ce jour-là) pour la ligne r ; type None hors mois."""
+            day_type = _day_type(gui_obj, r)
+            if day_type is None:
+                return None, frozenset()
+            excl = getattr(gui_obj, 'excluded_from_count', set())
+            names_in_day = set()
+            for c, cell in enumerate(gui_obj.table_entries[r]):
+                if not cell or (r, c) in excl:
+                    continue
+                try:
+                    raw_value = cell.get()
+                except Exception:
+                    raw_value = ""
+                for person in resolve_names(raw_value):
+                    if person in valid_initials:
+                        names_in_day.add(person)
+            return day_type, frozenset(names_in_day)
+
         def collect_counts(gui_obj):
             """
             Retourne un d�compte par personne, en comptant 1 fois par jour (et non par ligne)
             pour �viter de sur-compter les jours multi-lignes. Les cellules exclues sont ignor�es.
+            Renvoie aussi le détail par ligne (type de jour, personnes) pour les mises à jour partielles.
             """
-            excl = getattr(gui_obj, 'excluded_from_count', set())
             counts = {}
-            for r, row in enumerate(gui_obj.table_entries):
-                day_type = _day_type(gui_obj, r)
+            per_row = []
+            for r in range(len(gui_obj.table_entries)):
+                day_type, names_in_day = row_people(gui_obj, r)
+                per_row.append((day_type, names_in_day))
                 if day_type is None:
                     continue
-                names_in_day = set()
-                for c, cell in enumerate(row):
-                    if not cell or (r, c) in excl:
-                        continue
-                    try:
-                        raw_value = cell.get()
-                    except Exception:
-                        raw_value = ""
-                    names = extract_names_from_cell(raw_value, valid_initials)
-                    if not names:
-                        continue
-                    for person in names:
-                        if person in valid_initials:
-                            names_in_day.add(person)
-                if not names_in_day:
-                    continue
                 for person in names_in_day:
                     bucket = counts.setdefault(person, {"week": 0, "we": 0})
                     bucket[day_type] = bucket.get(day_type, 0) + 1
-            return counts
-
-        current_counts = collect_counts(self.planning_gui)
-
-        # Cumul sur tous les onglets/mois (si disponibles)
-        cumulative_counts = {}
-        try:
-            for (g, _c, _s) in globals().get("tabs_data", []):
-                c_counts = collect_counts(g)
-                for person, cnts in c_counts.items():
-                    base = cumulative_counts.setdefault(person, {"week": 0, "we": 0})
-                    base["week"] = base.get("week", 0) + cnts.get("week", 0)
-                    base["we"] = base.get("we", 0) + cnts.get("we", 0)
-        except Exception:
-            pass
+            return counts, per_row
+
+        counts_key = ("days", frozenset(valid_initials))
+
+        def counts_for(gui_obj):
+            """Décompte d'un onglet, servi par son cache tant qu'aucune cellule n'a changé."""
+            cached = getattr(gui_obj, "cached_counts", None)
+            if cached is None:
+                return collect_counts(gui_obj)
+            return cached(counts_key, collect_counts)
+
+        tabs = globals().get("tabs_data", [])
+        others = [g for (g, _c, _s) in tabs if g is not self.planning_gui]
+        others_revision = tuple((id(g), getattr(g, "_cell_revision", None)) for g in others)
+        state_key = (id(self.planning_gui), counts_key)
+
+        if (changed_rows is not None
+                and getattr(self, "_count_state_key", None) == state_key
+                and getattr(self, "_others_revision", None) == others_revision):
+            # Mise à jour par écarts : seuls les jours modifiés sont recomptés
+            current_counts = self._current_counts
+            for r in changed_rows:
+                try:
+                    new_type, new_people = row_people(self.planning_gui, r)
+                except Exception:
+                    continue
+                old_type, old_people = self._row_people.get(r, (None, frozenset()))
+                if (new_type, new_people) == (old_type, old_people):
+                    continue
+                if old_type is not None:
+                    for person in old_people:
+                        current_counts[person][old_type] -= 1
+                if new_type is not None:
+                    for person in new_people:
+                        bucket = current_counts.setdefault(person, {"week": 0, "we": 0})
+                        bucket[new_type] += 1
+                self._row_people[r] = (new_type, new_people)
+        else:
+            counts, per_row = counts_for(self.planning_gui)
+            # copie modifiable : les écarts ultérieurs ne doivent pas toucher le cache de l'onglet
+            current_counts = {person: dict(bucket) for person, bucket in counts.items()}
+            self._current_counts = current_counts
+            self._row_people = dict(enumerate(per_row))
+
+            # Cumul des autres onglets/mois (si disponibles)
+            other_counts = {}
+            try:
+                for g in others:
+                    for person, cnts in counts_for(g)[0].items():
+                        base = other_counts.setdefault(person, {"week": 0, "we": 0})
+                        base["week"] = base.get("week", 0) + cnts.get("week", 0)
+                        base["we"] = base.get("we", 0) + cnts.get("we", 0)
+            except Exception:
+                other_counts = {}
+            self._other_counts = other_counts
+            self._count_state_key = state_key
+            self._others_revision = others_revision
 
-        for item in self.tree.get_children():
-            self.tree.delete(item)
         self.tree.tag_configure("evenrow", background=SHIFT_EVEN_ROW_BG)
         self.tree.tag_configure("oddrow",  background=SHIFT_ODD_ROW_BG)
 
-        row_index = 0
-        ordered_initials = []
-        for c_row in self.planning_gui.constraints_app.rows:
-            try:
-                init = c_row[0].get().strip()
-                if init and init in valid_initials:
-                    ordered_initials.append(init)
-            except Exception:
-                continue
-
+        rows = []
+        seen = {}
         for person in ordered_initials:
             month_counts = current_counts.get(person, {"week": 0, "we": 0})
             month_week = month_counts.get("week", 0)
             month_we = month_counts.get("we", 0)
             month_total = month_week + month_we
 
-            cumul_counts = cumulative_counts.get(person, {"week": month_week, "we": month_we})
-            cumul_week = cumul_counts.get("week", 0)
-            cumul_we = cumul_counts.get("we", 0)
+            other = self._other_counts.get(person, {"week": 0, "we": 0})
+            cumul_week = other.get("week", 0) + month_week
+            cumul_we = other.get("we", 0) + month_we
             cumul_total = cumul_week + cumul_we
 
-            row_values = [
+            row_values = (
                 person,
                 month_week,
                 month_we,
@@ -1149,11 +1213,44 @@ class ShiftCountTable(tk.Frame):
                 cumul_total,
                 cumul_week,
                 cumul_we,
-            ]
-
-            tag = "evenrow" if row_index % 2 == 0 else "oddrow"
-            self.tree.insert("", "end", values=tuple(row_values), tags=(tag,))
-            row_index += 1
+            )
+            # iid stable par initiale (suffixe si l'initiale est saisie deux fois)
+            seen[person] = seen.get(person, 0) + 1
+            iid = person if seen[person] == 1 else f"{person}#{seen[person]}"
+            rows.append((iid, row_values))
+
+        self._render_rows(rows)
+
+    def _render_rows(self, rows):
+        """Applique [(iid, valeurs)] au Treeview en ne touchant que les lignes qui changent."""
+        shown = getattr(self, "_shown_values", None)
+        if shown is None:
+            shown = self._shown_values = {}
+        wanted = [iid for iid, _values in rows]
+        existing = list(self.tree.get_children())
+        same_layout = existing == wanted
+
+        if not same_layout:
+            keep = set(wanted)
+            stale = [iid for iid in existing if iid not in keep]
+            if stale:
+                self.tree.delete(*stale)
+                for iid in stale:
+                    shown.pop(iid, None)
+
+        for index, (iid, values) in enumerate(rows):
+            tag = "evenrow" if index % 2 == 0 else "oddrow"
+            if same_layout:
+                if shown.get(iid) != values:
+                    self.tree.item(iid, values=values, tags=(tag,))
+                    shown[iid] = values
+            elif self.tree.exists(iid):
+                self.tree.move(iid, "", index)
+                self.tree.item(iid, values=values, tags=(tag,))
+                shown[iid] = values
+            else:
+                self.tree.insert("", index, iid=iid, values=values, tags=(tag,))
+                shown[iid] = values
 
     def highlight_initial(self, initial):
         """
@@ -1213,7 +1310,7 @@ class ShiftCountTable(tk.Frame):
 
 # Classe principale du planning consolidÃ©
 class GUI(tk.Frame):
-    def __init__(self, master=None):
+    def __init__(self, master=None, lazy_grid=False):
         super().__init__(master)
         # Vous pouvez ajuster le zoom_factor selon vos prÃ©fÃ©rences
         self.zoom_factor = 1.5  
@@ -1241,6 +1338,9 @@ class GUI(tk.Frame):
 
         self._measure_fonts = None          # cache (f_cell, f_sched, f_head)
         self._measure_fonts_zoom = None     # zoom auquel le cache correspond
+        self._text_width_cache = {}         # (police, texte, zoom) -> largeur en pixels
+        self._resize_dirty_cols = set()     # colonnes à remesurer au prochain passage
+        self._resize_job = None             # after_idle en attente (auto_resize_column)
 
         
         # Pile dâannulation Â« planning Â» (assignations)
@@ -1253,6 +1353,30 @@ class GUI(tk.Frame):
         self.copy_selection = None       # sÃ©lection pour copie (Ctrl-clic)   # <<< AJOUT
         # --- Cellules exclues du tableau de dÃ©compte ---
         self.excluded_from_count = set()   # {(row, col)} Ã  ignorer dans ShiftCountTable
+        # --- Cache des décomptes par personne (invalidé à chaque écriture de cellule) ---
+        self._counts_cache = {}
+        self._counts_dirty = True
+        self._cell_revision = 0            # nombre d'écritures de cellules (comparé par les autres onglets)
+        # --- Rafraîchissement incrémental des couleurs (update_colors) ---
+        self._dirty_cells = set()          # cellules écrites / repeintes depuis le dernier passage
+        self._highlighted_cells = set()    # surbrillances temporaires (focus, sélection) à effacer
+        self._color_texts = {}             # (row, col) -> texte vu au dernier passage
+        self._cells_by_name = {}           # nom -> {(row, col)} (recoloration par personne, surbrillance au focus)
+        self._cells_by_name_valids = None  # initiales valides avec lesquelles l'index ci-dessus est construit
+        self._cell_positions = {}          # widget Entry -> (row, col)
+        self._live_cells = None            # (row, col) -> {(nom normalisé, row, col)} (conflits inter-fenêtres)
+        self._live_keys = set()
+        self._live_dirty_cells = set()
+        self._incompat_cells = None        # (row, col) -> noms comptés (index d'incompatibilités)
+        self._incompat_totals = {}
+        self._incompat_row_names = []
+        self._incompat_signature = None
+        self._incompat_dirty_cells = set()
+        self._colors_full_refresh = True   # prochain passage complet (grille reconstruite, 1er affichage)
+        self._update_full = False          # le passage différé en attente doit être complet
+        self._bulk_depth = 0               # > 0 pendant apply_assignments (sauvegarde auto différée)
+        self._lazy_grid = bool(lazy_grid)  # grille sans widgets (CellStore) jusqu'à materialize_grid
+        self._last_visit = time.monotonic()
 
         # --- Checkbox VÃ©rification (existant) ---
         self.verification_enabled = tk.BooleanVar(value=False)
@@ -1351,6 +1475,13 @@ class GUI(tk.Frame):
             btn.grid(row=1, column=col_idx + 1, padx=pad, pady=pad, sticky="nsew")
 
         # Lignes de jours (1..30) et cellules d'affectation
+        self._cell_positions = {}
+        cell_store = None
+        if self._lazy_grid:
+            cell_store = CellStore(self, len(days), len(posts_source),
+                                   on_write=self._on_cell_written,
+                                   materialize=self.materialize_grid)
+        self.cell_store = cell_store
         for day_idx, day_name in enumerate(days):
             grid_row = day_idx + 2
             day_lbl = tk.Label(
@@ -1368,6 +1499,18 @@ class GUI(tk.Frame):
             self.day_labels.append(day_lbl)
 
             for col_idx, post in enumerate(posts_source):
+                if cell_store is not None:
+                    # Cellule en mémoire : sert d'Entry et de Frame pour le reste du code
+                    cell = cell_store.cells[day_idx][col_idx]
+                    self._bind_cell_events(cell, day_idx, col_idx)
+                    self.cell_availability[(day_idx, col_idx)] = True
+                    self.table_entries[day_idx][col_idx] = cell
+                    self._cell_positions[cell] = (day_idx, col_idx)
+                    self.table_frames[day_idx][col_idx] = cell
+                    self.table_labels[day_idx][col_idx] = None
+                    self.update_cell(day_idx, col_idx)
+                    continue
+
                 frame = tk.Frame(
                     self,
                     borderwidth=0,
@@ -1389,23 +1532,38 @@ class GUI(tk.Frame):
                     disabledbackground=CELL_DISABLED_BG,
                     disabledforeground=CELL_DISABLED_TEXT,
                 )
+                # Variable liée : toute écriture (clavier, insert/delete programmatique)
+                # marque le cache des décomptes comme périmé.
+                cell_var = tk.StringVar(self)
+                cell_var.trace_add("write", lambda *_a, r=day_idx, c=col_idx: self._on_cell_written(r, c))
+                entry.configure(textvariable=cell_var)
+                entry._cell_var = cell_var  # garder une référence (sinon la variable Tk est détruite)
 
                 entry.pack(side="top", fill="both", expand=True, padx=4, pady=4)
-                entry.bind('<KeyRelease>', self.on_cell_key)
-                entry.bind("<FocusIn>", self.on_cell_focus_in)
-                entry.bind("<FocusOut>", self.on_cell_focus_out)
-                entry.bind("<Control-Button-1>", lambda e, r=day_idx, c=col_idx: self.on_ctrl_click(e, r, c))
-                entry.bind("<Shift-Button-1>",   lambda e, r=day_idx, c=col_idx: self.on_shift_click(e, r, c))
-                self._bind_double_click(entry, day_idx, col_idx)
+                self._bind_cell_events(entry, day_idx, col_idx)
 
                 self.cell_availability[(day_idx, col_idx)] = True
                 self.table_entries[day_idx][col_idx] = entry
+                self._cell_positions[entry] = (day_idx, col_idx)
                 self.table_frames[day_idx][col_idx] = frame
                 self.table_labels[day_idx][col_idx] = None
                 self.update_cell(day_idx, col_idx)
 
+        self._colors_full_refresh = True
+        self._live_cells = None
+        self._incompat_cells = None
+        self._cross_conflict_badges = {}   # anciens badges détruits avec la grille
         self.auto_resize_all_columns()
 
+    def _bind_cell_events(self, cell, day_idx, col_idx):
+        """Gestionnaires communs d'une cellule (Entry classique ou cellule en mémoire d'un CellStore)."""
+        cell.bind('<KeyRelease>', self.on_cell_key)
+        cell.bind("<FocusIn>", self.on_cell_focus_in)
+        cell.bind("<FocusOut>", self.on_cell_focus_out)
+        cell.bind("<Control-Button-1>", lambda e, r=day_idx, c=col_idx: self.on_ctrl_click(e, r, c))
+        cell.bind("<Shift-Button-1>",   lambda e, r=day_idx, c=col_idx: self.on_shift_click(e, r, c))
+        self._bind_double_click(cell, day_idx, col_idx)
+
     def _open_post_action_for_column(self, col_idx: int) -> None:
         posts_source = getattr(self, "local_work_posts", work_posts)
         if 0 <= col_idx < len(posts_source):
@@ -1413,6 +1571,66 @@ class GUI(tk.Frame):
         else:
             return
 
+    def mark_counts_dirty(self, *_args) -> None:
+        """Marque le cache des décomptes comme périmé (appelé à chaque écriture de cellule)."""
+        self._counts_dirty = True
+
+    def _on_cell_written(self, row: int, col: int) -> None:
+        """Trace d'écriture d'une cellule : décomptes périmés, cellule à recolorer."""
+        self.mark_counts_dirty()
+        self._cell_revision += 1
+        bump_model_revision()
+        self._eligibility_grid_dirty = True
+        self._live_dirty_cells.add((row, col))
+        self._incompat_dirty_cells.add((row, col))
+        self._dirty_cells.add((row, col))
+
+    def mark_cells_dirty(self, cells) -> None:
+        """Signale des cellules repeintes à la main (sélection, surbrillance) à recolorer."""
+        self._dirty_cells.update(cells)
+
+    def _counts_signature(self):
+        """Métadonnées du mois dont dépendent les décomptes (types de jour, exclusions, indispos)."""
+        try:
+            labels = tuple(lbl.cget("text") for lbl in self.day_labels)
+        except Exception:
+            labels = ()
+        try:
+            unavailable = frozenset(k for k, v in self.cell_availability.items() if not v)
+        except Exception:
+            unavailable = frozenset()
+        return (
+            self.current_year,
+            self.current_month,
+            labels,
+            frozenset(getattr(self, "weekend_rows", ())),
+            frozenset(getattr(self, "holiday_rows", ())),
+            frozenset(getattr(self, "holiday_dates", ())),
+            frozenset(getattr(self, "excluded_from_count", ())),
+            unavailable,
+        )
+
+    def cached_counts(self, key, compute):
+        """
+        Retourne compute(self) en le gardant en cache pour cet onglet.
+        Le calcul n'est refait que si une cellule a été écrite depuis (drapeau
+        _counts_dirty), ou si `key` / les métadonnées du mois ont changé.
+        Le résultat est partagé entre appelants : ne pas le modifier.
+        """
+        if self._counts_dirty:
+            self._counts_cache.clear()
+            self._counts_dirty = False
+        full_key = (key, self._counts_signature())
+        try:
+            return self._counts_cache[full_key]
+        except KeyError:
+            pass
+        if len(self._counts_cache) >= 8:
+            self._counts_cache.clear()
+        value = compute(self)
+        self._counts_cache[full_key] = value
+        return value
+
     def is_cell_excluded_from_count(self, row_idx: int, col_idx: int) -> bool:
         """
         Indique si la cellule (row_idx, col_idx) est exclue des calculs/décomptes.
@@ -1486,7 +1704,53 @@ class GUI(tk.Frame):
                     cell.insert(0, old_val)
             except Exception:
                 continue
-        self.schedule_update_colors()
+        self.schedule_update_colors(full=False)
+
+    def apply_assignments(self, changes, push_undo=True):
+        """
+        Écrit en bloc des résultats du moteur [(row, col, valeur), ...].
+        Pendant l'écriture, la détection live des conflits et la sauvegarde
+        automatique sont suspendues ; ensuite une seule action d'annulation est
+        empilée (si push_undo) et l'affichage est rafraîchi une fois.
+        Retourne les cellules réellement modifiées [(row, col, valeur)].
+        """
+        applied = []
+        undo_action = []
+        was_paused = _LIVE_CONFLICT_PAUSED
+        self._bulk_depth += 1
+        pause_live_conflict_check()
+        try:
+            for row_idx, col_idx, value in changes:
+                try:
+                    cell = self.table_entries[row_idx][col_idx]
+                except Exception:
+                    continue
+                if not cell:
+                    continue
+                value = "" if value is None else str(value)
+                try:
+                    old_val = cell.get()
+                    if old_val == value:
+                        continue
+                    cell.delete(0, "end")
+                    if value:
+                        cell.insert(0, value)
+                except Exception:
+                    continue
+                undo_action.append((row_idx, col_idx, old_val))
+                applied.append((row_idx, col_idx, value))
+        finally:
+            self._bulk_depth -= 1
+            if not was_paused:
+                resume_live_conflict_check()
+
+        if applied:
+            if push_undo:
+                self.cell_edit_undo_stack.append(undo_action)
+            for col_idx in sorted({c for _r, c, _v in applied}):
+                self.auto_resize_column(col_idx)
+            self.schedule_update_colors(full=False)
+        return applied
 
     def edit_week_date(self, event):
         """Modifie le libellé du mois affiché en en-tête."""
@@ -1508,21 +1772,14 @@ class GUI(tk.Frame):
     def on_cell_focus_in(self, event):
         widget = event.widget
         # 1) RÃ©initialiser les couleurs du planning
-        self.update_colors(None)
+        self.update_colors(None, full=False)
         try:
             trigger_live_conflict_check()
         except Exception:
             pass
 
         # 2) RepÃ©rer le crÃ©neau cliquÃ© (row_idx, col_idx)
-        row_idx = col_idx = None
-        for i, row in enumerate(self.table_entries):
-            for j, cell in enumerate(row):
-                if cell is widget:
-                    row_idx, col_idx = i, j
-                    break
-            if row_idx is not None:
-                break
+        row_idx, col_idx = self._cell_positions.get(widget, (None, None))
         if row_idx is None:
             return  # widget non trouvÃ© dans la grille
 
@@ -1557,10 +1814,13 @@ class GUI(tk.Frame):
             return names
 
         # 4) Surligner en vert clair toutes les cellules des Ã©ligibles
-        for row in self.table_entries:
-            for cell in row:
-                if any(name in eligibles_set for name in _names_from_widget(cell)):
-                    cell.config(bg="light green")
+        # (index personne -> cellules : seules les cellules concernées sont touchées)
+        green_cells = set()
+        for name in eligibles_set:
+            green_cells.update(self.cells_of_person(name, parser_valids))
+        for r, c in green_cells:
+            self.table_entries[r][c].config(bg="light green")
+        self._highlighted_cells.update(green_cells)
 
         # 5) Surligner en jaune la personne courante si la case n'est pas vide
         current_raw = widget.get().strip()
@@ -1568,12 +1828,12 @@ class GUI(tk.Frame):
         primary_current = current_names[0] if current_names else (current_raw or None)
 
         if current_names:
-            current_set = set(current_names)
-            for row in self.table_entries:
-                for cell in row:
-                    cell_names = _names_from_widget(cell)
-                    if current_set.intersection(cell_names):
-                        cell.config(bg="yellow")
+            yellow_cells = set()
+            for name in set(current_names):
+                yellow_cells.update(self.cells_of_person(name, parser_valids))
+            for r, c in yellow_cells:
+                self.table_entries[r][c].config(bg="yellow")
+            self._highlighted_cells.update(yellow_cells)
 
         # 6) Mettre Ã  jour le ShiftCountTable (jaune et vert)
         if hasattr(self, 'shift_count_table'):
@@ -1605,7 +1865,7 @@ class GUI(tk.Frame):
         4) Si la valeur a changÃ©, empiler lâancienne valeur pour Ctrl-Z (format Â« liste de changements Â»).
         """
         # 1) RÃ©tablit les couleurs du planning
-        self.update_colors(None)
+        self.update_colors(None, full=False)
 
         # 2) EnlÃ¨ve la surbrillance du ShiftCountTable
         if hasattr(self, 'shift_count_table'):
@@ -1619,30 +1879,31 @@ class GUI(tk.Frame):
 
         # 3-4) Localiser la cellule qui perd le focus, vÃ©rifier contraintes
         widget = event.widget
-        for row_idx, row in enumerate(self.table_entries):
-            for col_idx, cell in enumerate(row):
-                if cell is widget:
-                    # 3) ContrÃ´le des contraintes
-                    self.check_incompatibility(row_idx, col_idx)
-
-                    # 4) Gestion de lâundo Â« cellule Â»
-                    if self.current_edit and (row_idx, col_idx) == (
-                        self.current_edit['row'], self.current_edit['col']):
-                        old_val = self.current_edit['old']
-                        new_val = widget.get()
-                        if new_val != old_val:  # seulement si lâutilisateur a modifiÃ©
-                            # On empile dÃ©sormais sous forme d'Â« action Â» (liste de changements)
-                            # pour partager le mÃªme format que les swaps/copier.
-                            self.cell_edit_undo_stack.append(
-                                [(row_idx, col_idx, old_val)]
-                            )
-                        self.current_edit = None
-                        self.auto_resize_column(col_idx)
-                    return
+        row_idx, col_idx = self._cell_positions.get(widget, (None, None))
+        if row_idx is None:
+            return
+        # 3) ContrÃ´le des contraintes
+        self.check_incompatibility(row_idx, col_idx)
+
+        # 4) Gestion de lâundo Â« cellule Â»
+        if self.current_edit and (row_idx, col_idx) == (
+            self.current_edit['row'], self.current_edit['col']):
+            old_val = self.current_edit['old']
+            new_val = widget.get()
+            if new_val != old_val:  # seulement si lâutilisateur a modifiÃ©
+                # On empile dÃ©sormais sous forme d'Â« action Â» (liste de changements)
+                # pour partager le mÃªme format que les swaps/copier.
+                self.cell_edit_undo_stack.append(
+                    [(row_idx, col_idx, old_val)]
+                )
+            self.current_edit = None
+            self.auto_resize_column(col_idx)
 
 
-    def schedule_update_colors(self, delay_ms: int = 120):
+    def schedule_update_colors(self, delay_ms: int = 120, full: bool = True):
         """Programme un recalcul global des couleurs avec dÃ©bounce."""
+        # full=False : seules les cellules modifiées (et celles qu'elles impactent) sont recalculées
+        self._update_full = self._update_full or full
         try:
             if self._update_job is not None:
                 self.after_cancel(self._update_job)
@@ -1651,9 +1912,11 @@ class GUI(tk.Frame):
         self._update_job = self.after(delay_ms, self._do_update_colors)
 
     def _do_update_colors(self):
-        """TÃ¢che diffÃ©rÃ©e : recalcul complet."""
+        """TÃ¢che diffÃ©rÃ©e : recalcul des couleurs (complet ou incrémental)."""
         self._update_job = None
-        self.update_colors(None)
+        full = self._update_full
+        self._update_full = False
+        self.update_colors(None, full=full)
 
     def on_cell_key(self, event):
         """
@@ -1667,35 +1930,71 @@ class GUI(tk.Frame):
         except Exception:
             pass
         # Pas de push_undo_state ici : lâUNDO cellule est gÃ©rÃ© Ã  FocusOut.
-        self.schedule_update_colors()
+        self.schedule_update_colors(full=False)
 
     def auto_resize_column(self, col_idx: int):
         """
         Ajuste la largeur minimale de la colonne (astreinte) en fonction :
         - des contenus des Entry (noms saisis),
-        - de l'ent?te de colonne (astreinte).
+        - de l'entête de colonne (astreinte).
+        La mesure est différée : les colonnes demandées sont regroupées et
+        traitées en un seul passage au prochain moment d'inactivité de Tk.
         """
-        try:
+        self._resize_dirty_cols.add(col_idx)
+        if self._resize_job is None:
+            try:
+                self._resize_job = self.after_idle(self.flush_column_resizes)
+            except Exception:
+                self._resize_job = None
+                self.flush_column_resizes()
+
+    def flush_column_resizes(self):
+        """Mesure les colonnes en attente et applique toutes les largeurs d'un coup."""
+        job, self._resize_job = self._resize_job, None
+        if job is not None:
+            try:
+                self.after_cancel(job)
+            except Exception:
+                pass
+        cols, self._resize_dirty_cols = self._resize_dirty_cols, set()
+        for col_idx in sorted(cols):
+            try:
+                self._apply_column_width(col_idx, len(self.table_entries))
+            except Exception:
+                pass
+
+    def _text_width(self, text, kind="cell"):
+        """Largeur en pixels de `text`, mémorisée par (police, texte, zoom)."""
+        key = (kind, text, self.zoom_factor)
+        width = self._text_width_cache.get(key)
+        if width is None:
             f_cell, _, f_head = self._get_measure_fonts()
-            posts_source = getattr(self, "local_work_posts", work_posts)
-            header_text = posts_source[col_idx] if col_idx < len(posts_source) else ""
-            max_px = f_head.measure(header_text)
-
-            for i in range(len(self.table_entries)):
-                ent = self.table_entries[i][col_idx]
-                if ent is not None:
-                    max_px = max(max_px, f_cell.measure(ent.get() or ""))
-
-            pad = int(12 * self.zoom_factor)
-            min_w = int(60 * self.zoom_factor)
-            max_w = int(260 * self.zoom_factor)
-            target = max(min_w, min(max_w, max_px + pad))
-
-            # Colonne 0 = libell? des jours, on d?cale de +1 pour les astreintes
-            self.grid_columnconfigure(col_idx + 1, minsize=target)
-            self.update_idletasks()
-        except Exception:
-            pass
+            width = (f_head if kind == "head" else f_cell).measure(text)
+            if len(self._text_width_cache) >= 4096:
+                self._text_width_cache.clear()
+            self._text_width_cache[key] = width
+        return width
+
+    def _apply_column_width(self, col_idx: int, row_limit: int):
+        posts_source = getattr(self, "local_work_posts", work_posts)
+        header_text = posts_source[col_idx] if col_idx < len(posts_source) else ""
+        max_px = self._text_width(header_text, "head")
+
+        texts = set()
+        for i in range(min(row_limit, len(self.table_entries))):
+            ent = self.table_entries[i][col_idx]
+            if ent is not None:
+                texts.add(ent.get() or "")
+        for text in texts:
+            max_px = max(max_px, self._text_width(text))
+
+        pad = int(12 * self.zoom_factor)
+        min_w = int(60 * self.zoom_factor)
+        max_w = int(260 * self.zoom_factor)
+        target = max(min_w, min(max_w, max_px + pad))
+
+        # Colonne 0 = libellé des jours, on décale de +1 pour les astreintes
+        self.grid_columnconfigure(col_idx + 1, minsize=target)
 
 
     def _get_measure_fonts(self):
@@ -1729,23 +2028,7 @@ class GUI(tk.Frame):
                 pass
 
     def _auto_resize_column_sampled(self, col_idx: int, sample_rows: int):
-        f_cell, _, f_head = self._get_measure_fonts()
-        posts_source = getattr(self, "local_work_posts", work_posts)
-        header_text = posts_source[col_idx] if col_idx < len(posts_source) else ""
-        max_px = f_head.measure(header_text)
-
-        total_rows = len(self.table_entries)
-        limit = min(total_rows, max(1, int(sample_rows)))
-        for i in range(limit):
-            ent = self.table_entries[i][col_idx]
-            if ent is not None:
-                max_px = max(max_px, f_cell.measure(ent.get() or ""))
-
-        pad = int(12 * self.zoom_factor)
-        min_w = int(60 * self.zoom_factor)
-        max_w = int(260 * self.zoom_factor)
-        target = max(min_w, min(max_w, max_px + pad))
-        self.grid_columnconfigure(col_idx + 1, minsize=target)
+        self._apply_column_width(col_idx, max(1, int(sample_rows)))
 
     def _bind_double_click(self, widget, row, col):
         """
@@ -1770,6 +2053,7 @@ class GUI(tk.Frame):
             self.swap_selection = None
             self.copy_selection = (row, col, cur_val)
             entry.config(bg="pale green")
+            self._highlighted_cells.add((row, col))
             return
 
         # 2) Application (cible)
@@ -1781,7 +2065,8 @@ class GUI(tk.Frame):
         if src_row == row and src_col == col:
             src_entry.config(bg="white")
             self.copy_selection = None
-            self.schedule_update_colors()
+            self.mark_cells_dirty([(src_row, src_col)])
+            self.schedule_update_colors(full=False)
             return
 
         old_tgt = tgt_entry.get()
@@ -1797,8 +2082,9 @@ class GUI(tk.Frame):
         self.copy_selection = None
         src_entry.config(bg="white")
         tgt_entry.config(bg="white")
+        self.mark_cells_dirty([(src_row, src_col), (row, col)])
         self.auto_resize_column(col)
-        self.schedule_update_colors()
+        self.schedule_update_colors(full=False)
 
 
 
@@ -1818,6 +2104,7 @@ class GUI(tk.Frame):
             self.copy_selection = None
             self.swap_selection = (row, col, cur_val)
             entry.config(bg="pale green")
+            self._highlighted_cells.add((row, col))
             return
 
         # 2) Application
@@ -1830,7 +2117,8 @@ class GUI(tk.Frame):
         if src_row == row and src_col == col:
             src_entry.config(bg="white")
             self.swap_selection = None
-            self.schedule_update_colors()
+            self.mark_cells_dirty([(src_row, src_col)])
+            self.schedule_update_colors(full=False)
             return
 
         # --- Empile l'undo (liste de deux tuples) ---
@@ -1845,10 +2133,11 @@ class GUI(tk.Frame):
         src_entry.config(bg="white")
         tgt_entry.config(bg="white")
         self.swap_selection = None
+        self.mark_cells_dirty([(src_row, src_col), (row, col)])
         self.auto_resize_column(src_col)
         if col != src_col:
             self.auto_resize_column(col)
-        self.schedule_update_colors()
+        self.schedule_update_colors(full=False)
 
 
 
@@ -1866,67 +2155,79 @@ class GUI(tk.Frame):
         if not rows:
             return []
 
-        valid_initials = set()
-        for cand_row in rows:
-            try:
-                init = cand_row[0].get().strip()
-            except Exception:
-                continue
-            if init:
-                valid_initials.add(init)
-        parser_valids = valid_initials or None
-
-        def _names_from_cell(value):
-            return extract_names_from_cell(value, parser_valids)
-
-        context = PlanningContext(
-            table_entries=self.table_entries,
-            name_resolver=_names_from_cell,
-            exclusion_checker=getattr(self, "is_cell_excluded_from_count", None),
-            excluded_cells=getattr(self, "excluded_from_count", set()),
-        )
-
         from Full_GUI import work_posts
         if not work_posts:
             return []
         post_idx = col_idx
         if post_idx < 0 or post_idx >= len(work_posts):
             return []
-        post_name = work_posts[post_idx]
-        is_morning = True  # unique cr?neau par jour/astreinte
-
-        forbidden_morning, forbidden_afternoon = Assignation.build_forbidden_maps(work_posts)
-        settings = AssignmentSettings(
-            enable_max_assignments=Assignation.ENABLE_MAX_ASSIGNMENTS,
-            max_assignments_per_post=Assignation.MAX_ASSIGNMENTS_PER_POST,
-            enable_different_post_per_day=Assignation.ENABLE_DIFFERENT_POST_PER_DAY,
-            enable_repos_securite=Assignation.ENABLE_REPOS_SECURITE,
-            forbidden_morning_to_afternoon=forbidden_morning,
-            forbidden_afternoon_to_morning=forbidden_afternoon,
+
+        # Service d'éligibilité de l'onglet : profils, réglages et matrice (jour, poste)
+        # ne sont recalculés que si le tableau de contraintes, les postes ou les options changent.
+        version = getattr(constraints_app, "version", None)
+        if version is None:
+            version = object()  # tableau sans compteur de version : toujours recalculer
+        key = (
+            id(constraints_app),
+            version,
+            tuple(work_posts),
+            tuple(sorted(getattr(Assignation, "FORBIDDEN_POST_ASSOCIATIONS", ()) or ())),
+            Assignation.ENABLE_MAX_ASSIGNMENTS,
+            Assignation.MAX_ASSIGNMENTS_PER_POST,
+            Assignation.ENABLE_DIFFERENT_POST_PER_DAY,
+            Assignation.ENABLE_REPOS_SECURITE,
         )
+        service = getattr(self, "_eligibility_service", None)
+        if service is None:
+            service = self._eligibility_service = EligibilityService()
+
+        def _settings():
+            forbidden_morning, forbidden_afternoon = Assignation.build_forbidden_maps(work_posts)
+            return AssignmentSettings(
+                enable_max_assignments=Assignation.ENABLE_MAX_ASSIGNMENTS,
+                max_assignments_per_post=Assignation.MAX_ASSIGNMENTS_PER_POST,
+                enable_different_post_per_day=Assignation.ENABLE_DIFFERENT_POST_PER_DAY,
+                enable_repos_securite=Assignation.ENABLE_REPOS_SECURITE,
+                forbidden_morning_to_afternoon=forbidden_morning,
+                forbidden_afternoon_to_morning=forbidden_afternoon,
+            )
 
-        eligibles = []
-        for row in rows:
-            profile = parse_constraint_row(row)
-            if not profile:
-                continue
-            if candidate_is_available(
-                profile,
-                context,
-                day_index=row_idx,
-                post_index=post_idx,
-                is_morning=is_morning,
-                post_name=post_name,
-                settings=settings,
-            ):
-                eligibles.append(profile.initial)
-        return eligibles
+        service.update(key, rows, work_posts, _settings)
+
+        # Contexte de grille gardé entre deux focus ; ses compteurs sont vidés à chaque écriture
+        excluded_cells = getattr(self, "excluded_from_count", set())
+        context_key = (key, id(self.table_entries), id(excluded_cells))
+        context = getattr(self, "_eligibility_context", None)
+        if context is None or getattr(self, "_eligibility_context_key", None) != context_key:
+            valid_initials = set()
+            for cand_row in rows:
+                try:
+                    init = cand_row[0].get().strip()
+                except Exception:
+                    continue
+                if init:
+                    valid_initials.add(init)
+            context = PlanningContext(
+                table_entries=self.table_entries,
+                name_resolver=get_name_resolver(valid_initials or None),
+                exclusion_checker=getattr(self, "is_cell_excluded_from_count", None),
+                excluded_cells=excluded_cells,
+            )
+            self._eligibility_context = context
+            self._eligibility_context_key = context_key
+            self._eligibility_grid_dirty = False
+        elif getattr(self, "_eligibility_grid_dirty", True):
+            context.clear_caches()
+            self._eligibility_grid_dirty = False
+
+        return service.eligible_initials(context, row_idx, post_idx)
 
     def toggle_availability(self, row, col):
         current_state = self.cell_availability.get((row, col), True)
         new_state = not current_state
         self.cell_availability[(row, col)] = new_state
         self.update_cell(row, col)
+        self.mark_cells_dirty([(row, col)])
 
     def _collect_valid_initials(self):
         """
@@ -2279,35 +2580,102 @@ class GUI(tk.Frame):
         else:
             header_lbl.config(bg=post_color, fg="black")
 
-    def update_colors(self, event):
+    def update_colors(self, event, full=True):
         """
-        Refresh table colors, rebuild assignments for ShiftCountTable,
-        and recompute incompatibilities.
+        Refresh table colors, the ShiftCountTable and incompatibilities.
+
+        full=False : only the cells written or repainted since the last pass are
+        refreshed, together with the cells they can affect (same day, same person).
+        Falls back to a full pass when the grid was rebuilt or verification is on.
         """
-        assignments = {}
-        self.incompatible_cells.clear()
-        weekend_rows = getattr(self, "weekend_rows", set())
-        holiday_rows = getattr(self, "holiday_rows", set())
+        verification = getattr(self, 'verification_enabled', None) and self.verification_enabled.get()
+        if full or self._colors_full_refresh or verification:
+            self._refresh_all_colors()
+        else:
+            self._refresh_dirty_colors()
+
+        if verification:
+            self.highlight_conflicts()
+
+        self.update_idletasks()
+
+    def _paint_cell(self, row_idx, col_idx, txt, index=None):
+        """Couleur de fond d'une cellule puis contrôle d'incompatibilité si elle est remplie."""
+        cell = self.table_entries[row_idx][col_idx]
+        if not cell:
+            return
+        if not self.cell_availability.get((row_idx, col_idx), True):
+            self.incompatible_cells.discard((row_idx, col_idx))
+            self.update_cell(row_idx, col_idx)
+            return
+        if txt:
+            cell.config(state="normal", bg=CELL_FILLED_BG, fg="black")
+            self.check_incompatibility(row_idx, col_idx, index)
+        else:
+            weekend_rows = getattr(self, "weekend_rows", set())
+            holiday_rows = getattr(self, "holiday_rows", set())
+            empty_bg = HOLIDAY_CELL_BG if row_idx in holiday_rows else (WEEKEND_CELL_BG if row_idx in weekend_rows else CELL_EMPTY_BG)
+            cell.config(state="normal", bg=empty_bg, fg="black")
+            self.incompatible_cells.discard((row_idx, col_idx))
 
+    def _remember_cell_text(self, row_idx, col_idx, txt):
+        """Met à jour l'instantané texte / nom -> cellules utilisé par le passage incrémental."""
+        key = (row_idx, col_idx)
+        old = self._color_texts.get(key, "")
+        if old:
+            self._index_name_cell(old, key, add=False)
+        if txt:
+            self._color_texts[key] = txt
+            self._index_name_cell(txt, key, add=True)
+        else:
+            self._color_texts.pop(key, None)
+
+    def _index_name_cell(self, txt, key, add=True):
+        """Ajoute / retire la cellule `key` de l'index nom -> cellules (cellules multi-noms comprises)."""
+        for name in (extract_names_from_cell(txt, self._cells_by_name_valids) or [txt]):
+            if add:
+                self._cells_by_name.setdefault(name, set()).add(key)
+            else:
+                cells = self._cells_by_name.get(name)
+                if cells is not None:
+                    cells.discard(key)
+                    if not cells:
+                        del self._cells_by_name[name]
+
+    def _sync_name_index(self, parser_valids):
+        """Reconstruit l'index nom -> cellules si la liste des initiales valides a changé."""
+        parser_valids = frozenset(parser_valids) if parser_valids else None
+        if parser_valids == self._cells_by_name_valids:
+            return
+        self._cells_by_name_valids = parser_valids
+        self._cells_by_name = {}
+        for key, txt in self._color_texts.items():
+            self._index_name_cell(txt, key, add=True)
+
+    def cells_of_person(self, name, valid_names=None):
+        """
+        Cellules (row, col) contenant `name` d'après le dernier passage de update_colors.
+        L'index est reconstruit si la liste des initiales valides a changé.
+        """
+        self._sync_name_index(valid_names)
+        return self._cells_by_name.get(name, ())
+
+    def _refresh_all_colors(self):
+        """Passage complet : recolore toute la grille et reconstruit l'instantané."""
+        self.incompatible_cells.clear()
+        self._dirty_cells.clear()
+        self._highlighted_cells.clear()
+        self._color_texts = {}
+        self._cells_by_name = {}
+        self._cells_by_name_valids = frozenset(self._collect_valid_initials()) or None
+        texts = []
         for row_idx, row in enumerate(self.table_entries):
             for col_idx, cell in enumerate(row):
                 if not cell:
                     continue
-                if not self.cell_availability.get((row_idx, col_idx), True):
-                    self.update_cell(row_idx, col_idx)
-                    continue
-
                 txt = cell.get().strip()
-                empty_bg = HOLIDAY_CELL_BG if row_idx in holiday_rows else (WEEKEND_CELL_BG if row_idx in weekend_rows else CELL_EMPTY_BG)
-                if txt:
-                    cell.config(state="normal", bg=CELL_FILLED_BG, fg="black")
-                    day_name = days[row_idx] if row_idx < len(days) else str(row_idx + 1)
-                    local_posts = getattr(self, "local_work_posts", work_posts)
-                    if col_idx < len(local_posts):
-                        post_name = local_posts[col_idx]
-                        assignments.setdefault(txt, {}).setdefault(day_name, []).append(post_name)
-                else:
-                    cell.config(state="normal", bg=empty_bg, fg="black")
+                texts.append((row_idx, col_idx, txt))
+                self._remember_cell_text(row_idx, col_idx, txt)
 
         if hasattr(self, 'shift_count_table'):
             try:
@@ -2315,17 +2683,64 @@ class GUI(tk.Frame):
             except Exception:
                 pass
 
-        for i, row in enumerate(self.table_entries):
-            for j, cell in enumerate(row):
-                if not self.cell_availability.get((i, j), True):
-                    continue
-                if cell.get().strip():
-                    self.check_incompatibility(i, j)
+        index = self.build_incompatibility_index()
+        for row_idx, col_idx, txt in texts:
+            self._paint_cell(row_idx, col_idx, txt, index)
+        self._colors_full_refresh = False
 
-        if getattr(self, 'verification_enabled', None) and self.verification_enabled.get():
-            self.highlight_conflicts()
+    def _refresh_dirty_colors(self):
+        """
+        Passage incrémental. Une cellule modifiée peut changer :
+        - sa propre couleur ;
+        - les cellules du même jour (double affectation) ;
+        - les cellules de la même personne (quota), avant comme après modification.
+        """
+        dirty = self._dirty_cells | self._highlighted_cells
+        self._dirty_cells = set()
+        self._highlighted_cells = set()
+        if not dirty:
+            return
 
-        self.update_idletasks()
+        parser_valids = self._collect_valid_initials() or None
+        self._sync_name_index(parser_valids)
+        rows = set()
+        persons = set()
+        for row_idx, col_idx in dirty:
+            try:
+                cell = self.table_entries[row_idx][col_idx]
+                txt = cell.get().strip() if cell else ""
+            except Exception:
+                continue
+            old = self._color_texts.get((row_idx, col_idx), "")
+            if txt == old:
+                continue
+            rows.add(row_idx)
+            for value in (old, txt):
+                if value:
+                    persons.update(extract_names_from_cell(value, parser_valids) or [value])
+            self._remember_cell_text(row_idx, col_idx, txt)
+
+        targets = set(dirty)
+        for row_idx in rows:
+            try:
+                targets.update((row_idx, c) for c in range(len(self.table_entries[row_idx])))
+            except Exception:
+                continue
+        for person in persons:
+            targets.update(self._cells_by_name.get(person, ()))
+
+        if rows and hasattr(self, 'shift_count_table'):
+            try:
+                self.shift_count_table.update_counts(changed_rows=rows)
+            except Exception:
+                pass
+
+        index = self.build_incompatibility_index()
+        for row_idx, col_idx in sorted(targets):
+            try:
+                self._paint_cell(row_idx, col_idx, self._color_texts.get((row_idx, col_idx), ""), index)
+            except Exception:
+                continue
 
 
     # === Marquage visuel des conflits inter-plannings (badge â rouge) ===
@@ -2375,6 +2790,11 @@ class GUI(tk.Frame):
         if target is None:
             return
 
+        # Onglet paresseux : badge porté par la cellule en mémoire
+        if hasattr(target, "add_badge"):
+            self._cross_conflict_badges[key] = target.add_badge(badge, badge_bg, badge_fg)
+            return
+
         # Petit label carrÃ© rouge, texte blanc, discret
         b = tk.Label(target, text=badge, font=(APP_FONT_FAMILY, 8, "bold"),
                      bg=badge_bg, fg=badge_fg, bd=0, padx=3, pady=0)
@@ -2387,6 +2807,46 @@ class GUI(tk.Frame):
 
         self._cross_conflict_badges[key] = b
 
+    def live_conflict_keys(self):
+        """
+        Index {(nom normalisé, row, col)} des personnes placées, pour la détection
+        des conflits inter-fenêtres. Construit une fois, puis mis à jour uniquement
+        pour les cellules écrites depuis le dernier appel.
+        """
+        if self._live_cells is None:
+            self._live_cells = {}
+            self._live_keys = set()
+            cells = [(r, c) for r, row in enumerate(self.table_entries) for c in range(len(row))]
+        else:
+            cells = self._live_dirty_cells
+        self._live_dirty_cells = set()
+        for r, c in cells:
+            try:
+                raw = self.table_entries[r][c].get().strip()
+            except Exception:
+                raw = ""
+            keys = set()
+            for person in (_split_people_live(raw) if raw else ()):
+                norm = _norm_name_live(person)
+                if norm:
+                    keys.add((norm, r, c))
+            old = self._live_cells.pop((r, c), None)
+            if old:
+                self._live_keys.difference_update(old)
+            if keys:
+                self._live_cells[(r, c)] = keys
+                self._live_keys.update(keys)
+        return self._live_keys
+
+    def clear_cross_conflict_mark(self, row_idx: int, col_idx: int):
+        """Supprime le badge de conflit inter-plannings d'une seule cellule."""
+        widget = getattr(self, "_cross_conflict_badges", {}).pop((row_idx, col_idx), None)
+        try:
+            if widget and widget.winfo_exists():
+                widget.destroy()
+        except Exception:
+            pass
+
     def clear_cross_conflict_marks(self):
         """Supprime tous les badges de conflits inter-plannings (â)."""
         if hasattr(self, "_cross_conflict_badges"):
@@ -2953,16 +3413,50 @@ class GUI(tk.Frame):
         for gui_instance in gui_instances:
             gui_instance.schedule_update_colors()
 
-    def refresh_delete_post_combo(self):
-        """Met Ã  jour la liste de postes dans la Combobox de suppression."""
-        if hasattr(self, "del_post_combo") and self.del_post_combo is not None:
-            self.del_post_combo["values"] = work_posts
+    def materialize_grid(self):
+        """Construit les widgets de la grille d'un onglet chargé sans (première sélection)."""
+        if not self._lazy_grid:
+            return False
+        self._lazy_grid = False
+        self._rebuild_grid_keep_state()
+        try:
+            trigger_live_conflict_check()
+        except Exception:
+            pass
+        return True
 
-    
-    def redraw_widgets(self, preserve_content=False):
-        saved_data = None
-        saved_availability = None
-        saved_excluded = set(getattr(self, "excluded_from_count", set())) if preserve_content else set()
+    def unload_grid(self):
+        """Relâche les widgets de cellules d'un onglet inactif ; le contenu reste en mémoire."""
+        if self._lazy_grid:
+            return False
+        self._lazy_grid = True
+        self.current_edit = None
+        self._rebuild_grid_keep_state()
+        return True
+
+    def _rebuild_grid_keep_state(self):
+        week_text = None
+        try:
+            week_text = self.week_label.cget("text")
+        except Exception:
+            pass
+        self.redraw_widgets(preserve_content=True)
+        if week_text:
+            try:
+                self.week_label.config(text=week_text)
+            except Exception:
+                pass
+
+    def refresh_delete_post_combo(self):
+        """Met Ã  jour la liste de postes dans la Combobox de suppression."""
+        if hasattr(self, "del_post_combo") and self.del_post_combo is not None:
+            self.del_post_combo["values"] = work_posts
+
+    
+    def redraw_widgets(self, preserve_content=False):
+        saved_data = None
+        saved_availability = None
+        saved_excluded = set(getattr(self, "excluded_from_count", set())) if preserve_content else set()
         saved_weekend_rows = set(getattr(self, "weekend_rows", set()))
         saved_holiday_rows = set(getattr(self, "holiday_rows", set()))
         saved_holiday_dates = set(getattr(self, "holiday_dates", set()))
@@ -3060,133 +3554,184 @@ class GUI(tk.Frame):
         self.auto_resize_all_columns()
 
 
-    def check_incompatibility(self, row_idx, col_idx):
+    def build_incompatibility_index(self):
         """
-        Colore en rouge la cellule (row_idx, col_idx) lorsqu?elle viole une
-        contrainte : absence, poste non-assur?, double affectation le m?me jour,
-        quota d?pass?.
+        Index partagé par les contrôles d'incompatibilité :
+        - cand_rows : initiale -> ligne de contraintes (première occurrence) ;
+        - totals    : nombre d'affectations par nom (cellules exclues ignorées) ;
+        - row_names : par jour, nom -> colonnes où il apparaît.
+        Construit une fois par lecture complète de la grille, puis mis à jour
+        uniquement pour les cellules écrites depuis le dernier appel. Reconstruit
+        si les initiales valides ou les exclusions ont changé.
         """
-        if getattr(self, "constraints_app", None) is None:
-            return False
-        cell = self.table_entries[row_idx][col_idx]
-        initial = cell.get().strip()
         parser_valids = self._collect_valid_initials() or None
+        cand_rows = {}
+        constraints_app = getattr(self, "constraints_app", None)
+        for cand_row in getattr(constraints_app, "rows", []) or []:
+            try:
+                ini = cand_row[0].get().strip()
+            except Exception:
+                continue
+            cand_rows.setdefault(ini, cand_row)
+
+        signature = (parser_valids, frozenset(getattr(self, "excluded_from_count", ()) or ()))
+        if self._incompat_cells is None or signature != self._incompat_signature:
+            self._incompat_cells = {}
+            self._incompat_totals = {}
+            self._incompat_row_names = [{} for _ in self.table_entries]
+            self._incompat_signature = signature
+            cells = [(r, c) for r, row in enumerate(self.table_entries) for c in range(len(row))]
+        else:
+            cells = self._incompat_dirty_cells
+        self._incompat_dirty_cells = set()
+
+        totals = self._incompat_totals
+        row_names = self._incompat_row_names
+        for r_idx, c_idx in cells:
+            for name in self._incompat_cells.pop((r_idx, c_idx), ()):
+                count = totals.get(name, 0) - 1
+                if count > 0:
+                    totals[name] = count
+                else:
+                    totals.pop(name, None)
+                cols = row_names[r_idx].get(name)
+                if cols is not None:
+                    cols.discard(c_idx)
+                    if not cols:
+                        del row_names[r_idx][name]
+            if r_idx >= len(row_names) or self.is_cell_excluded_from_count(r_idx, c_idx):
+                continue
+            try:
+                raw_value = self.table_entries[r_idx][c_idx].get()
+            except Exception:
+                raw_value = ""
+            raw_value = (raw_value or "").strip()
+            if not raw_value:
+                continue
+            names = extract_names_from_cell(raw_value, parser_valids) or [raw_value]
+            self._incompat_cells[(r_idx, c_idx)] = names
+            for name in names:
+                totals[name] = totals.get(name, 0) + 1
+                row_names[r_idx].setdefault(name, set()).add(c_idx)
+        return {
+            "parser_valids": parser_valids,
+            "cand_rows": cand_rows,
+            "totals": totals,
+            "row_names": row_names,
+        }
 
-        if not initial:
-            self.incompatible_cells.discard((row_idx, col_idx))
-            cell.config(bg="white")
-            return
-
-        if self.is_cell_excluded_from_count(row_idx, col_idx):
-            cell.config(bg=CELL_FILLED_BG, fg="black")
-            self.incompatible_cells.discard((row_idx, col_idx))
-            return
-
-        current_names = extract_names_from_cell(initial, parser_valids) or [initial]
-        current_name_set = set(current_names)
-
-        day_idx = row_idx
-        post_idx = col_idx
-        from Full_GUI import work_posts
-        post_name = work_posts[post_idx] if post_idx < len(work_posts) else None
-
-        cand_row = next((r for r in self.constraints_app.rows if r[0].get().strip() == initial), None)
+    def _cell_incompatibility(self, row_idx, col_idx, index):
+        """
+        Verdict pour une cellule remplie et comptée : True si une contrainte est violée,
+        False sinon, None si l'initiale n'a pas de ligne de contraintes.
+        """
+        initial = self.table_entries[row_idx][col_idx].get().strip()
+        cand_row = index["cand_rows"].get(initial)
         if cand_row is None:
-            cell.config(bg="white")
-            self.incompatible_cells.discard((row_idx, col_idx))
-            return
+            return None
 
         try:
             quota_total = int(cand_row[1].get().strip())
         except Exception:
             quota_total = None
-
-        if quota_total is not None:
-            total_assignments = 0
-            for r_idx, row_entries in enumerate(self.table_entries):
-                for c_idx, other_cell in enumerate(row_entries):
-                    if not other_cell or self.is_cell_excluded_from_count(r_idx, c_idx):
-                        continue
-                    try:
-                        raw_value = other_cell.get()
-                    except Exception:
-                        raw_value = ""
-                    raw_value = (raw_value or "").strip()
-                    if not raw_value:
-                        continue
-                    names = extract_names_from_cell(raw_value, parser_valids)
-                    if names:
-                        total_assignments += names.count(initial)
-                    elif raw_value == initial:
-                        total_assignments += 1
-            if total_assignments > quota_total:
-                cell.config(bg="red")
-                self.incompatible_cells.add((row_idx, col_idx))
-                return
+        if quota_total is not None and index["totals"].get(initial, 0) > quota_total:
+            return True
 
         try:
-            tpl = cand_row[4 + day_idx]
+            tpl = cand_row[4 + row_idx]
             state_raw = tpl[0]._var.get() if isinstance(tpl, tuple) else ""
         except Exception:
             state_raw = ""
         state = (state_raw or "").strip().upper()
         state_ascii = unicodedata.normalize("NFKD", state).encode("ASCII", "ignore").decode() if state else state
         if state_ascii in {"MATIN", "AP MIDI", "APMIDI", "JOURNEE"}:
-            cell.config(bg="red")
-            self.incompatible_cells.add((row_idx, col_idx))
-            return
+            return True
 
+        from Full_GUI import work_posts
+        post_name = work_posts[col_idx] if col_idx < len(work_posts) else None
         try:
             nas = cand_row[3]._var.get() or cand_row[3].cget("text")
         except Exception:
             nas = ""
         if post_name in [p.strip() for p in str(nas).split(",") if p.strip()]:
+            return True
+
+        if Assignation.ENABLE_DIFFERENT_POST_PER_DAY and row_idx < len(index["row_names"]):
+            occupancy = index["row_names"][row_idx]
+            current_names = extract_names_from_cell(initial, index["parser_valids"]) or [initial]
+            for name in set(current_names):
+                cols = occupancy.get(name, ())
+                if len(cols) > 1 or (cols and col_idx not in cols):
+                    return True
+        return False
+
+    def check_incompatibility(self, row_idx, col_idx, index=None):
+        """
+        Colore en rouge la cellule (row_idx, col_idx) lorsqu'elle viole une
+        contrainte : absence, poste non-assuré, double affectation le même jour,
+        quota dépassé.
+        `index` (build_incompatibility_index) peut être partagé entre plusieurs appels
+        d'un même passage ; sinon l'index maintenu par la grille est mis à jour.
+        """
+        if getattr(self, "constraints_app", None) is None:
+            return False
+        cell = self.table_entries[row_idx][col_idx]
+        initial = cell.get().strip()
+
+        if not initial:
+            self.incompatible_cells.discard((row_idx, col_idx))
+            cell.config(bg="white")
+            return
+
+        if self.is_cell_excluded_from_count(row_idx, col_idx):
+            cell.config(bg=CELL_FILLED_BG, fg="black")
+            self.incompatible_cells.discard((row_idx, col_idx))
+            return
+
+        if index is None:
+            index = self.build_incompatibility_index()
+        verdict = self._cell_incompatibility(row_idx, col_idx, index)
+        if verdict is None:
+            cell.config(bg="white")
+            self.incompatible_cells.discard((row_idx, col_idx))
+        elif verdict:
             cell.config(bg="red")
             self.incompatible_cells.add((row_idx, col_idx))
-            return
+        else:
+            cell.config(bg=CELL_FILLED_BG, fg="black")
+            self.incompatible_cells.discard((row_idx, col_idx))
 
-        if Assignation.ENABLE_DIFFERENT_POST_PER_DAY:
-            for other_col in range(len(self.table_entries[0])):
-                if other_col == col_idx:
-                    continue
-                other_cell = self.table_entries[row_idx][other_col]
-                if not other_cell or self.is_cell_excluded_from_count(row_idx, other_col):
-                    continue
-                other_raw = (other_cell.get() or "").strip()
-                if not other_raw:
-                    continue
-                other_names = extract_names_from_cell(other_raw, parser_valids) or [other_raw]
-                if any(name in current_name_set for name in other_names):
-                    cell.config(bg="red")
-                    self.incompatible_cells.add((row_idx, col_idx))
-                    return
 
-        cell.config(bg=CELL_FILLED_BG, fg="black")
-        self.incompatible_cells.discard((row_idx, col_idx))
 
+def _assignment_options_snapshot():
+    """Tuple des options d'assignation tel qu'enregistré dans le statut (14 éléments)."""
+    valid_posts = set(work_posts)
+    stored_pairs = sorted((m, a) for (m, a) in Assignation.FORBIDDEN_POST_ASSOCIATIONS if m in valid_posts and a in valid_posts)
+
+    return (
+        Assignation.ENABLE_DIFFERENT_POST_PER_DAY,
+        Assignation.ENABLE_MAX_ASSIGNMENTS,
+        Assignation.MAX_ASSIGNMENTS_PER_POST,
+        Assignation.ENABLE_REPOS_SECURITE,
+        stored_pairs,
+        getattr(Assignation, "ENABLE_MAX_WE_DAYS", False),
+        getattr(Assignation, "MAX_WE_DAYS_PER_MONTH", None),
+        getattr(Assignation, "ENABLE_WEEKEND_BLOCKS", False),
+        sorted(getattr(Assignation, "WEEKEND_BLOCK_POSTS", set()) or []),
+        getattr(Assignation, "ENABLE_WEEKDAY_COMPENSATION", False),
+        getattr(Assignation, "OPTIMIZE_BALANCE", False),
+        getattr(Assignation, "ASSIGNMENT_RESTARTS", 1),
+        getattr(Assignation, "ASSIGNMENT_SEED", None),
+        getattr(Assignation, "USE_EXACT_SOLVER", False),
+    )
 
 
-def save_status(file_path=None, *, update_caption=True):
+def collect_status_snapshot():
     """
-    Sauvegarde le statut complet de l'interface.
-    - Si file_path est None â ouvre une boÃ®te 'Enregistrer sousâ¦'
-    - Sinon               â enregistre silencieusement dans file_path.
-    Le chemin utilisÃ© est mÃ©morisÃ© dans la variable globale
-    'current_status_path' pour de futurs Â« Enregistrer Â».
+    Photographie du statut en données simples (PlanningStatus : listes, dicts,
+    chaînes), sans aucune référence aux widgets. Seule étape de la sauvegarde qui lit l'interface, elle
+    doit tourner sur le thread Tk ; la sérialisation peut ensuite se faire ailleurs.
     """
-    import pickle
-    global current_status_path
-
-    # Choix du fichier uniquement en mode 'Save As'
-    if file_path is None:
-        file_path = filedialog.asksaveasfilename(
-            title="Sauvegarder le statut",
-            defaultextension=".pkl",
-            filetypes=[("Pickle Files", "*.pkl"), ("All Files", "*.*")]
-        )
-        if not file_path:
-            return  # annulation utilisateur
-
     # ---------- Sauvegarde de toutes les semaines --------------------------
     all_week_status = []
     for (g, c, s) in tabs_data:
@@ -3256,43 +3801,55 @@ def save_status(file_path=None, *, update_caption=True):
             "weekend_rows": sorted(list(getattr(g, "weekend_rows", set()))),
             "holiday_rows": sorted(list(getattr(g, "holiday_rows", set()))),
             "holiday_dates": sorted(list(getattr(g, "holiday_dates", set()))),
+            # Graines des derniers passages (rejouer une assignation / optimisation)
+            "assignment_seed": getattr(g, "last_assignment_seed", None),
+            "optimize_seed": getattr(g, "last_optimize_seed", None),
         }
 
-        # On sauvegarde dÃ©sormais 10 Ã©lÃ©ments (compat old: le load gÃ¨re 5/6/7/8/9/10)
-        all_week_status.append((
-            table_data,
-            cell_availability_data,
-            constraints_data,
-            schedule_data,
-            week_label_text,
-            excluded_cells,
-            meta,
+        all_week_status.append(MonthStatus(
+            table_data=table_data,
+            cell_availability=cell_availability_data,
+            constraints=constraints_data,
+            schedule=schedule_data,
+            week_label=week_label_text,
+            excluded_cells=excluded_cells,
+            meta=meta,
         ))
 
-    # Options dâassignation
-    valid_posts = set(work_posts)
-    stored_pairs = sorted((m, a) for (m, a) in Assignation.FORBIDDEN_POST_ASSOCIATIONS if m in valid_posts and a in valid_posts)
+    post_info_copy = {post: dict(info) if isinstance(info, dict) else info
+                      for post, info in POST_INFO.items()}
+    return PlanningStatus(
+        months=all_week_status,
+        work_posts=list(work_posts),
+        post_info=post_info_copy,
+        options=AssignmentOptions.from_legacy(_assignment_options_snapshot(), work_posts),
+    )
 
-    assignment_options = (
-        Assignation.ENABLE_DIFFERENT_POST_PER_DAY,
-        Assignation.ENABLE_MAX_ASSIGNMENTS,
-        Assignation.MAX_ASSIGNMENTS_PER_POST,
-        Assignation.ENABLE_REPOS_SECURITE,
-        stored_pairs,
-        getattr(Assignation, "ENABLE_MAX_WE_DAYS", False),
-        getattr(Assignation, "MAX_WE_DAYS_PER_MONTH", None),
-        getattr(Assignation, "ENABLE_WEEKEND_BLOCKS", False),
-        sorted(getattr(Assignation, "WEEKEND_BLOCK_POSTS", set()) or []),
-        getattr(Assignation, "ENABLE_WEEKDAY_COMPENSATION", False),
-        getattr(Assignation, "OPTIMIZE_BALANCE", False),
-    )
+
+def save_status(file_path=None, *, update_caption=True):
+    """
+    Sauvegarde le statut complet de l'interface.
+    - Si file_path est None â ouvre une boÃ®te 'Enregistrer sousâ¦'
+    - Sinon               â enregistre silencieusement dans file_path.
+    Le chemin utilisÃ© est mÃ©morisÃ© dans la variable globale
+    'current_status_path' pour de futurs Â« Enregistrer Â».
+    """
+    global current_status_path
+
+    # Choix du fichier uniquement en mode 'Save As'
+    if file_path is None:
+        file_path = filedialog.asksaveasfilename(
+            title="Sauvegarder le statut",
+            defaultextension=".pkl",
+            filetypes=[("Pickle Files", "*.pkl"), ("All Files", "*.*")]
+        )
+        if not file_path:
+            return  # annulation utilisateur
+
+    payload = collect_status_snapshot()
 
     try:
-        with open(file_path, "wb") as f:
-            pickle.dump(
-                (all_week_status, work_posts, POST_INFO, assignment_options),
-                f
-            )
+        write_status_file(file_path, payload)
         current_status_path = file_path  # mÃ©morisation
         if update_caption:
             update_window_caption()
@@ -3317,7 +3874,7 @@ def quick_save_status():
     # Fichier dÃ©jÃ  dÃ©fini, existe, et nâest PAS la sauvegarde auto â save silencieux
     if (current_status_path
         and os.path.exists(current_status_path)
-        and os.path.basename(current_status_path) != "sauvegarde_auto.pkl"):
+        and os.path.basename(current_status_path) not in _autosave_file_names()):
         save_status(current_status_path)
     else:
         # Aucun fichier ou bien câest 'sauvegarde_auto.pkl' â forcer Save As
@@ -3367,38 +3924,168 @@ def auto_save_status():
     â¢ Ne remplace plus current_status_path si l'utilisateur
       a dÃ©jÃ  choisi un fichier.
     """
-    import tkinter.messagebox as _mb
-    import datetime, traceback
-    from pathlib import Path
+    global current_status_path, _AUTOSAVE_THREAD
 
-    global current_status_path
+    # Écriture groupée en cours (apply_assignments) ou sauvegarde précédente
+    # encore en cours d'écriture : on réessaie après le délai d'inactivité
+    if (any(getattr(g_obj, "_bulk_depth", 0) for g_obj in get_all_gui_instances())
+            or (_AUTOSAVE_THREAD is not None and _AUTOSAVE_THREAD.is_alive())):
+        _schedule_idle_autosave()
+        return
+    # Rien n'a changé depuis la dernière sauvegarde auto réussie : pas d'écriture
+    _sync_model_revision()
+    revision = _MODEL_REVISION
+    if revision == _AUTOSAVED_REVISION:
+        return
 
     save_dir   = get_user_data_dir()
     pickle_path = save_dir / "sauvegarde_auto.pkl"
     log_path    = save_dir / "autosave_error.log"
 
-    # Temporarily silence message-boxes
-    orig_info, orig_err = _mb.showinfo, _mb.showerror
-    _mb.showinfo = lambda *a, **k: None
-    _mb.showerror = lambda *a, **k: None
+    # Thread Tk : uniquement la photographie des données (rapide, sans pop-up)
+    try:
+        payload = collect_status_snapshot()
+    except Exception:
+        _log_autosave_error(log_path)
+        return
+
+    # Comme avant : sans fichier utilisateur, la cible devient la sauvegarde auto
+    if current_status_path is None:
+        current_status_path = pickle_path
+
+    # Sérialisation + remplacement du fichier sur un thread de travail
+    def _worker():
+        global _AUTOSAVED_REVISION
+        try:
+            write_status_file(pickle_path, payload, generations=AUTOSAVE_GENERATIONS)
+            _AUTOSAVED_REVISION = revision
+        except Exception:
+            _log_autosave_error(log_path)
 
-    # --- Retient la cible actuelle de l'utilisateur ----------------------
-    previous_path = current_status_path
+    _AUTOSAVE_THREAD = threading.Thread(target=_worker, name="autosave", daemon=True)
+    _AUTOSAVE_THREAD.start()
 
+
+def bump_model_revision(*_args):
+    """Signale une modification du modèle : révision +1 et sauvegarde auto à l'inactivité."""
+    global _MODEL_REVISION, _LAST_EDIT_TIME
+    _MODEL_REVISION += 1
+    _LAST_EDIT_TIME = time.monotonic()
+    _schedule_idle_autosave()
+
+
+def _schedule_idle_autosave():
+    global _IDLE_AUTOSAVE_JOB
+    if _IDLE_AUTOSAVE_JOB is not None or root is None:
+        return
     try:
-        # save_status modifie current_status_path â on la restaure aprÃ¨s
-        save_status(pickle_path, update_caption=False)
+        _IDLE_AUTOSAVE_JOB = root.after(AUTOSAVE_IDLE_DELAY_MS, _idle_autosave)
     except Exception:
-        # DerniÃ¨re chance : journaliser lâexception
+        _IDLE_AUTOSAVE_JOB = None
+
+
+def _idle_autosave():
+    """Sauvegarde auto une fois la rafale de modifications terminée."""
+    global _IDLE_AUTOSAVE_JOB
+    _IDLE_AUTOSAVE_JOB = None
+    quiet_ms = (time.monotonic() - _LAST_EDIT_TIME) * 1000
+    if quiet_ms < AUTOSAVE_IDLE_DELAY_MS:
+        # Modifié entre-temps : on attend la fin du délai depuis la dernière modification
+        try:
+            _IDLE_AUTOSAVE_JOB = root.after(int(AUTOSAVE_IDLE_DELAY_MS - quiet_ms) + 1, _idle_autosave)
+        except Exception:
+            pass
+        return
+    auto_save_status()
+
+
+def _model_state_key():
+    """
+    Signature de ce qui change sans passer par bump_model_revision :
+    options d'assignation, couleurs des postes, mois / jours / exclusions /
+    disponibilités et libellés de chaque onglet.
+    """
+    tabs_key = []
+    for g_obj, _c, _s in tabs_data:
+        try:
+            label = g_obj.week_label.cget("text")
+        except Exception:
+            label = None
+        try:
+            meta = g_obj._counts_signature()
+        except Exception:
+            meta = None
+        tabs_key.append((
+            id(g_obj), label, meta,
+            frozenset(getattr(g_obj, "hidden_rows", ())),
+            getattr(g_obj, "last_assignment_seed", None),
+            getattr(g_obj, "last_optimize_seed", None),
+        ))
+    return (
+        tuple(work_posts),
+        repr(sorted(POST_INFO.items())),
+        repr(_assignment_options_snapshot()),
+        tuple(tabs_key),
+    )
+
+
+def _sync_model_revision():
+    """Avance la révision si options ou métadonnées ont changé depuis le dernier contrôle."""
+    global _MODEL_REVISION, _MODEL_STATE_KEY
+    try:
+        key = _model_state_key()
+    except Exception:
+        _MODEL_REVISION += 1
+        return
+    if key != _MODEL_STATE_KEY:
+        _MODEL_STATE_KEY = key
+        _MODEL_REVISION += 1
+
+
+def _log_autosave_error(log_path):
+    """Journalise l'exception courante dans autosave_error.log (jamais de pop-up)."""
+    import datetime, traceback
+    try:
         with open(log_path, "a", encoding="utf-8") as f:
             f.write(f"\n[{datetime.datetime.now():%Y-%m-%d %H:%M:%S}]\n")
             traceback.print_exc(file=f)
-    finally:
-        # Si l'utilisateur avait dÃ©jÃ  un fichier ouvert, on le remet
-        if previous_path is not None:
-            current_status_path = previous_path
-            update_window_caption()
-        _mb.showinfo, _mb.showerror = orig_info, orig_err
+    except Exception:
+        pass
+
+def _autosave_file_names():
+    """Noms de fichier de toutes les générations de sauvegarde automatique."""
+    return {p.name for p in generation_paths("sauvegarde_auto.pkl", AUTOSAVE_GENERATIONS)}
+
+
+def recover_latest_autosave():
+    """
+    Contrôle de démarrage (en-têtes et sommes de contrôle seulement, sans désérialiser).
+    Si sauvegarde_auto.pkl manque ou est corrompu (coupure pendant l'écriture),
+    la génération valide la plus récente reprend sa place.
+    Renvoie le chemin de la sauvegarde exploitable, ou None.
+    """
+    save_dir = get_user_data_dir()
+    pickle_path = save_dir / "sauvegarde_auto.pkl"
+    try:
+        latest = find_latest_valid(pickle_path, AUTOSAVE_GENERATIONS)
+        if latest is not None and latest != pickle_path:
+            copy_file_atomic(latest, pickle_path)
+            return pickle_path
+        return latest
+    except Exception:
+        _log_autosave_error(save_dir / "autosave_error.log")
+        return None
+
+
+def restore_latest_autosave():
+    """Menu : recharge la dernière sauvegarde automatique valide."""
+    latest = recover_latest_autosave()
+    if latest is None:
+        messagebox.showinfo("Sauvegarde automatique",
+                            "Aucune sauvegarde automatique valide n'a été trouvée.")
+        return
+    load_status(str(latest))
+
 
 def open_autosave_folder():
     """
@@ -3642,6 +4329,45 @@ def reset_layout_from_menu():
 
 
 
+def activate_month_tab(index):
+    """
+    Onglet `index` sélectionné : construit sa grille si elle est encore paresseuse
+    et, si UNLOAD_IDLE_TABS_AFTER_S est défini, relâche celle des onglets non visités
+    depuis ce délai.
+    """
+    try:
+        g_obj = tabs_data[index][0]
+    except Exception:
+        return
+    now = time.monotonic()
+    try:
+        g_obj.materialize_grid()
+    except Exception:
+        pass
+    g_obj._last_visit = now
+    if UNLOAD_IDLE_TABS_AFTER_S is None:
+        return
+    for other, _c, _s in tabs_data:
+        if other is g_obj:
+            continue
+        if now - getattr(other, "_last_visit", now) >= UNLOAD_IDLE_TABS_AFTER_S:
+            try:
+                other.unload_grid()
+            except Exception:
+                pass
+
+
+def _on_month_tab_changed(_event=None):
+    """Suit l'onglet actif : références globales gui / constraints_app + onglets paresseux."""
+    global gui, constraints_app
+    try:
+        current_index = notebook.index(notebook.select())
+        gui, constraints_app, _ = tabs_data[current_index]
+    except Exception:
+        return
+    activate_month_tab(current_index)
+
+
 def load_status(file_path: str | None = None):
     """
     Charge le statut complet depuis un fichier.
@@ -3669,90 +4395,31 @@ def load_status(file_path: str | None = None):
     for g_obj, _, _ in tabs_data:
         prev_sashes.append(getattr(g_obj, 'paned', None).sashpos(0) if hasattr(g_obj, 'paned') else None)
 
-    import pickle
     try:
-        with open(file_path, "rb") as f:
-            all_week_status, saved_posts, saved_post_info, assignment_options = pickle.load(f)
+        status = read_status(file_path)
+        all_week_status = status.months
 
         # Maj options globales
-        update_work_posts(saved_posts)
+        update_work_posts(status.work_posts)
         POST_INFO.clear()
-        POST_INFO.update(saved_post_info)
+        POST_INFO.update(status.post_info)
         import Assignation
-        assignment_len = len(assignment_options) if isinstance(assignment_options, (list, tuple)) else 0
-        Assignation.ENABLE_MAX_WE_DAYS = False
-        Assignation.MAX_WE_DAYS_PER_MONTH = None
-        weekend_block_posts_loaded = []
-        weekday_comp_loaded = False
-        optimize_balance_loaded = False
-        if assignment_len >= 11:
-            (Assignation.ENABLE_DIFFERENT_POST_PER_DAY,
-             Assignation.ENABLE_MAX_ASSIGNMENTS,
-             Assignation.MAX_ASSIGNMENTS_PER_POST,
-             Assignation.ENABLE_REPOS_SECURITE,
-             loaded_pairs,
-             Assignation.ENABLE_MAX_WE_DAYS,
-             Assignation.MAX_WE_DAYS_PER_MONTH,
-             Assignation.ENABLE_WEEKEND_BLOCKS,
-             weekend_block_posts_loaded,
-             weekday_comp_loaded,
-             optimize_balance_loaded) = assignment_options[:11]
-        elif assignment_len >= 10:
-            (Assignation.ENABLE_DIFFERENT_POST_PER_DAY,
-             Assignation.ENABLE_MAX_ASSIGNMENTS,
-             Assignation.MAX_ASSIGNMENTS_PER_POST,
-             Assignation.ENABLE_REPOS_SECURITE,
-             loaded_pairs,
-             Assignation.ENABLE_MAX_WE_DAYS,
-             Assignation.MAX_WE_DAYS_PER_MONTH,
-             Assignation.ENABLE_WEEKEND_BLOCKS,
-             weekend_block_posts_loaded,
-             optimize_balance_loaded) = assignment_options[:10]
-        elif assignment_len >= 9:
-            (Assignation.ENABLE_DIFFERENT_POST_PER_DAY,
-             Assignation.ENABLE_MAX_ASSIGNMENTS,
-             Assignation.MAX_ASSIGNMENTS_PER_POST,
-             Assignation.ENABLE_REPOS_SECURITE,
-             loaded_pairs,
-             Assignation.ENABLE_MAX_WE_DAYS,
-             Assignation.MAX_WE_DAYS_PER_MONTH,
-             Assignation.ENABLE_WEEKEND_BLOCKS,
-             weekend_block_posts_loaded) = assignment_options[:9]
-        elif assignment_len >= 8:
-            (Assignation.ENABLE_DIFFERENT_POST_PER_DAY,
-             Assignation.ENABLE_MAX_ASSIGNMENTS,
-             Assignation.MAX_ASSIGNMENTS_PER_POST,
-             Assignation.ENABLE_REPOS_SECURITE,
-             loaded_pairs,
-             Assignation.ENABLE_MAX_WE_DAYS,
-             Assignation.MAX_WE_DAYS_PER_MONTH,
-             Assignation.ENABLE_WEEKEND_BLOCKS) = assignment_options[:8]
-            weekend_block_posts_loaded = work_posts if Assignation.ENABLE_WEEKEND_BLOCKS else []
-        elif assignment_len >= 7:
-            (Assignation.ENABLE_DIFFERENT_POST_PER_DAY,
-             Assignation.ENABLE_MAX_ASSIGNMENTS,
-             Assignation.MAX_ASSIGNMENTS_PER_POST,
-             Assignation.ENABLE_REPOS_SECURITE,
-             loaded_pairs,
-             Assignation.ENABLE_MAX_WE_DAYS,
-             Assignation.MAX_WE_DAYS_PER_MONTH) = assignment_options[:7]
-        elif assignment_len >= 5:
-            (Assignation.ENABLE_DIFFERENT_POST_PER_DAY,
-             Assignation.ENABLE_MAX_ASSIGNMENTS,
-             Assignation.MAX_ASSIGNMENTS_PER_POST,
-             Assignation.ENABLE_REPOS_SECURITE,
-             loaded_pairs) = assignment_options[:5]
-        else:
-            (Assignation.ENABLE_DIFFERENT_POST_PER_DAY,
-             Assignation.ENABLE_MAX_ASSIGNMENTS,
-             Assignation.MAX_ASSIGNMENTS_PER_POST,
-             Assignation.ENABLE_REPOS_SECURITE) = assignment_options
-            loaded_pairs = []
-            Assignation.ENABLE_WEEKEND_BLOCKS = False
-        if assignment_len < 8:
-            Assignation.ENABLE_WEEKEND_BLOCKS = False
-        Assignation.OPTIMIZE_BALANCE = bool(optimize_balance_loaded) if assignment_len >= 10 else False
-        Assignation.ENABLE_WEEKDAY_COMPENSATION = bool(weekday_comp_loaded) if assignment_len >= 11 else False
+        # Options déjà migrées depuis n'importe quelle forme historique (status_schema)
+        opts = status.options
+        Assignation.ENABLE_DIFFERENT_POST_PER_DAY = opts.different_post_per_day
+        Assignation.ENABLE_MAX_ASSIGNMENTS = opts.max_assignments
+        Assignation.MAX_ASSIGNMENTS_PER_POST = opts.max_assignments_per_post
+        Assignation.ENABLE_REPOS_SECURITE = opts.repos_securite
+        Assignation.ENABLE_MAX_WE_DAYS = opts.max_we_days
+        Assignation.MAX_WE_DAYS_PER_MONTH = opts.max_we_days_per_month
+        Assignation.ENABLE_WEEKEND_BLOCKS = opts.weekend_blocks
+        loaded_pairs = opts.forbidden_pairs
+        weekend_block_posts_loaded = opts.weekend_block_posts
+        Assignation.OPTIMIZE_BALANCE = opts.optimize_balance
+        Assignation.ENABLE_WEEKDAY_COMPENSATION = opts.weekday_compensation
+        Assignation.ASSIGNMENT_RESTARTS = opts.restarts
+        Assignation.ASSIGNMENT_SEED = opts.seed
+        Assignation.USE_EXACT_SOLVER = opts.exact_solver
 
         Assignation.FORBIDDEN_POST_ASSOCIATIONS.clear()
         if loaded_pairs:
@@ -3781,6 +4448,12 @@ def load_status(file_path: str | None = None):
         Assignation.ENABLE_WEEKEND_BLOCKS = bool(getattr(Assignation, "WEEKEND_BLOCK_POSTS", []))
         weekday_comp_var.set(bool(getattr(Assignation, "ENABLE_WEEKDAY_COMPENSATION", False)))
         optimize_var.set(bool(getattr(Assignation, "OPTIMIZE_BALANCE", False)))
+        try:
+            setup_menu.entryconfig(restarts_entry_idx, label=_restarts_label())
+            setup_menu.entryconfig(seed_entry_idx, label=_seed_label())
+        except Exception:
+            pass
+        exact_solver_var.set(bool(getattr(Assignation, "USE_EXACT_SOLVER", False)))
 
         different_post_var.set(Assignation.ENABLE_DIFFERENT_POST_PER_DAY)
         limitation_enabled_var.set(Assignation.ENABLE_MAX_ASSIGNMENTS)
@@ -3796,12 +4469,7 @@ def load_status(file_path: str | None = None):
         # --- NOUVEAU : prÃ©parer un hÃ©ritage des exclusions de la Mois 1 ---
         # Si les semaines >1 n'ont pas d'exclusions enregistrÃ©es, on leur appliquera
         # celles de la Mois 1 pour rester cohÃ©rent avec l'affichage que tu avais.
-        first_week_excluded = None
-        try:
-            if all_week_status and len(all_week_status[0]) >= 6:
-                first_week_excluded = all_week_status[0][5] or []
-        except Exception:
-            first_week_excluded = None
+        first_week_excluded = all_week_status[0].excluded_cells if all_week_status else None
         # ---------------------------------------------------------------------
 
         # --- DÃ©truire proprement les anciens onglets -----------------------
@@ -3817,31 +4485,15 @@ def load_status(file_path: str | None = None):
         # -------------------------------------------------------------------
 
         #         # Recr?er les semaines et injecter les donn?es
-        for idx, week_status in enumerate(all_week_status):
-            # Compat descendante : 5 ?l?ments (ancienne sauvegarde) ou plus (nouvelle)
-            table_data = cell_availability_data = constraints_data = schedule_data = week_label_text = excluded_cells = meta = None
-            if len(week_status) >= 7:
-                (table_data,
-                 cell_availability_data,
-                 constraints_data,
-                 schedule_data,
-                 week_label_text,
-                 excluded_cells,
-                 meta) = week_status
-            elif len(week_status) == 6:
-                (table_data,
-                 cell_availability_data,
-                 constraints_data,
-                 schedule_data,
-                 week_label_text,
-                 excluded_cells) = week_status
-            else:
-                (table_data,
-                 cell_availability_data,
-                 constraints_data,
-                 schedule_data,
-                 week_label_text) = week_status
-                excluded_cells = []  # pas d'exclusions dans les anciens fichiers
+        for idx, month_status in enumerate(all_week_status):
+            # Anciennes formes (5/6/7 éléments) déjà migrées par status_schema.MonthStatus
+            table_data = month_status.table_data
+            cell_availability_data = month_status.cell_availability
+            constraints_data = month_status.constraints
+            schedule_data = month_status.schedule
+            week_label_text = month_status.week_label
+            excluded_cells = month_status.excluded_cells
+            meta = month_status.meta
 
             # --- NOUVEAU : h?ritage depuis Mois 1 si vide pour cette semaine
             if idx > 0 and (not excluded_cells) and first_week_excluded:
@@ -3850,7 +4502,8 @@ def load_status(file_path: str | None = None):
 
             frame_for_week = tk.Frame(notebook)
             frame_for_week.pack(fill="both", expand=True)
-            g, c, s = create_single_week(frame_for_week)
+            # Seul le 1er onglet (affiché) construit ses widgets de grille
+            g, c, s = create_single_week(frame_for_week, lazy_grid=(LAZY_TAB_WIDGETS and idx > 0))
             tabs_data.append((g, c, s))
             notebook.add(frame_for_week, text=f"Mois {idx+1}")
 
@@ -3888,6 +4541,8 @@ def load_status(file_path: str | None = None):
                     g.holiday_rows = set(meta.get("holiday_rows", []))
                     g.holiday_dates = set(meta.get("holiday_dates", []))
                     g.hidden_rows = set(meta.get("hidden_rows", []))
+                    g.last_assignment_seed = meta.get("assignment_seed")
+                    g.last_optimize_seed = meta.get("optimize_seed")
                     g.refresh_day_labels()
                 except Exception:
                     pass
@@ -4034,10 +4689,7 @@ def load_status(file_path: str | None = None):
         root.geometry(prev_geom)
 
         # Remettre les refs globales sur lâonglet actif
-        notebook.bind("<<NotebookTabChanged>>", lambda e: globals().update({
-            'gui': tabs_data[notebook.index(notebook.select())][0],
-            'constraints_app': tabs_data[notebook.index(notebook.select())][1]
-        }))
+        notebook.bind("<<NotebookTabChanged>>", _on_month_tab_changed)
         if tabs_data:
             gui, constraints_app, _ = tabs_data[0]
 
@@ -4214,7 +4866,6 @@ def import_layout():
     Sans toucher au contenu du tableau (noms) ni au tableau de contraintes.
     """
     from tkinter import filedialog, messagebox
-    import pickle
 
     # SÃ©lection du fichier
     file_path = filedialog.askopenfilename(
@@ -4226,16 +4877,11 @@ def import_layout():
         return
 
     try:
-        # Chargement du pickle
-        with open(file_path, "rb") as f:
-            loaded = pickle.load(f)
-
-        # Format attendu : (all_week_status, saved_posts, saved_post_info, options)
-        # all_week_status[i] : (table_data, cell_av, constraints, schedule, week_label[, excluded])
-        if not isinstance(loaded, tuple) or len(loaded) < 3:
-            raise ValueError("Fichier incompatible (structure inattendue).")
-
-        all_week_status, saved_posts, saved_post_info = loaded[0], loaded[1], loaded[2]
+        # Chargement du fichier de statut (tous formats, migrés vers PlanningStatus)
+        status = read_status(file_path)
+        if not status.months:
+            raise ValueError("Fichier incompatible (aucun mois enregistré).")
+        saved_posts, saved_post_info = status.work_posts, status.post_info
 
         # 1) Mettre Ã  jour les postes et info de postes AVANT de redessiner
         from Full_GUI import update_work_posts, POST_INFO
@@ -4244,12 +4890,8 @@ def import_layout():
         POST_INFO.update(saved_post_info)
 
         # 2) RÃ©cupÃ©rer 'schedule_data' et 'cell_availability' du premier onglet
-        week0 = all_week_status[0]
-        if len(week0) >= 6:
-            _, cell_availability_data, _, schedule_data, _week_label, _excluded = week0
-        else:
-            # CompatibilitÃ© descendante (anciens fichiers Ã  5 items)
-            _, cell_availability_data, _, schedule_data, _week_label = week0
+        week0 = status.months[0]
+        cell_availability_data, schedule_data = week0.cell_availability, week0.schedule
 
         # 3) Redessiner proprement la grille selon les nouveaux postes
         gui.redraw_widgets(preserve_content=False)
@@ -4347,6 +4989,8 @@ def import_conflicts():
 
 # Programme principal
 if __name__ == '__main__':
+    import multiprocessing
+    multiprocessing.freeze_support()  # relances parallèles de l'assignation (exe PyInstaller)
     import tkinter as tk
     from tkinter import ttk, messagebox, filedialog
     import Assignation
@@ -4392,6 +5036,7 @@ if __name__ == '__main__':
     file_menu.add_command(label="Enregistrer",         command=quick_save_status)
     file_menu.add_command(label="Enregistrer Sous",   command=save_status)
     file_menu.add_command(label="Localiser sauvegarde automatique", command=open_autosave_folder)
+    file_menu.add_command(label="Restaurer sauvegarde automatique", command=restore_latest_autosave)
     file_menu.add_separator()
     file_menu.add_command(label="Effacer layout", command=reset_layout_from_menu)
     menu_bar.add_cascade(label="File", menu=file_menu)
@@ -4426,12 +5071,15 @@ if __name__ == '__main__':
     max_we_days_enabled_var = tk.BooleanVar(value=getattr(Assignation, "ENABLE_MAX_WE_DAYS", False))
     optimize_var = tk.BooleanVar(value=getattr(Assignation, "OPTIMIZE_BALANCE", False))
     weekday_comp_var = tk.BooleanVar(value=getattr(Assignation, "ENABLE_WEEKDAY_COMPENSATION", False))
+    exact_solver_var = tk.BooleanVar(value=getattr(Assignation, "USE_EXACT_SOLVER", False))
     _initial_we_limit = getattr(Assignation, "MAX_WE_DAYS_PER_MONTH", None)
     max_we_days_value_var = tk.IntVar(
         value=_initial_we_limit if _initial_we_limit is not None else 4
     )
     set_max_we_entry_idx = None
     weekend_block_entry_idx = None
+    restarts_entry_idx = None
+    seed_entry_idx = None
 
     def _sync_max_we_menu_state():
         try:
@@ -4466,6 +5114,87 @@ if __name__ == '__main__':
         suffix = f" ({count} ligne{'s' if count > 1 else ''})" if count else ""
         return "Affecter les week-ends en bloc (ven-sam-dim)" + suffix
 
+    def _restarts_label():
+        try:
+            count = max(1, int(getattr(Assignation, "ASSIGNMENT_RESTARTS", 1)))
+        except Exception:
+            count = 1
+        suffix = f" ({count})" if count > 1 else ""
+        return "Relances multiples de l'assignation" + suffix
+
+    def open_restarts_dialog():
+        try:
+            current_val = max(1, int(getattr(Assignation, "ASSIGNMENT_RESTARTS", 1)))
+        except Exception:
+            current_val = 1
+        value = simpledialog.askinteger(
+            "Relances multiples",
+            "Nombre d'assignations indépendantes à calculer\n"
+            "(la plus équilibrée est conservée, 1 = un seul passage) :",
+            parent=root,
+            initialvalue=current_val,
+            minvalue=1,
+            maxvalue=64,
+        )
+        if value is None:
+            return
+        Assignation.ASSIGNMENT_RESTARTS = int(value)
+        if restarts_entry_idx is not None:
+            try:
+                setup_menu.entryconfig(restarts_entry_idx, label=_restarts_label())
+            except Exception:
+                pass
+
+    def _on_toggle_exact_solver():
+        enabled = bool(exact_solver_var.get())
+        solver_mod = getattr(Assignation, "exact_solver", None)
+        if enabled and (solver_mod is None or not solver_mod.solver_available()):
+            messagebox.showinfo(
+                "Solveur exact",
+                "OR-Tools n'est pas installé (pip install ortools).\n"
+                "L'assignation reste sur le moteur glouton.",
+            )
+            exact_solver_var.set(False)
+            enabled = False
+        skip_reason = Assignation.exact_solver_skip_reason() if enabled else None
+        if skip_reason:
+            messagebox.showinfo("Solveur exact", skip_reason)
+        Assignation.USE_EXACT_SOLVER = enabled
+
+    def _seed_label():
+        seed_val = getattr(Assignation, "ASSIGNMENT_SEED", None)
+        suffix = f" ({seed_val})" if seed_val is not None else ""
+        return "Graine aléatoire fixe" + suffix
+
+    def open_seed_dialog():
+        current_seed = getattr(Assignation, "ASSIGNMENT_SEED", None)
+        last_seed = getattr(gui, "last_assignment_seed", None) if gui is not None else None
+        initial = current_seed if current_seed is not None else last_seed
+        value = simpledialog.askstring(
+            "Graine aléatoire",
+            "Graine utilisée pour l'assignation et l'optimisation\n"
+            "(vide = nouvelle graine à chaque passage).\n"
+            f"Dernière graine de l'onglet courant : {last_seed if last_seed is not None else '-'}",
+            parent=root,
+            initialvalue="" if initial is None else str(initial),
+        )
+        if value is None:
+            return
+        value = value.strip()
+        if not value:
+            Assignation.ASSIGNMENT_SEED = None
+        else:
+            try:
+                Assignation.ASSIGNMENT_SEED = int(value)
+            except ValueError:
+                messagebox.showerror("Graine aléatoire", "La graine doit être un nombre entier.")
+                return
+        if seed_entry_idx is not None:
+            try:
+                setup_menu.entryconfig(seed_entry_idx, label=_seed_label())
+            except Exception:
+                pass
+
     def open_weekend_block_popup():
         preselected = sorted(getattr(Assignation, "WEEKEND_BLOCK_POSTS", set()) or [])
         popup = MultiSelectPopup(root, work_posts, preselected=preselected, anchor_widget=root)
@@ -4592,6 +5321,21 @@ if __name__ == '__main__':
         variable=weekday_comp_var,
         command=_on_toggle_weekday_comp,
     )
+    restarts_entry_idx = setup_menu.index("end") + 1 if setup_menu.index("end") is not None else 0
+    setup_menu.add_command(
+        label=_restarts_label(),
+        command=open_restarts_dialog,
+    )
+    setup_menu.add_checkbutton(
+        label="Solveur exact après l'assignation (OR-Tools, blocs week-end non stricts)",
+        variable=exact_solver_var,
+        command=_on_toggle_exact_solver,
+    )
+    seed_entry_idx = setup_menu.index("end") + 1 if setup_menu.index("end") is not None else 0
+    setup_menu.add_command(
+        label=_seed_label(),
+        command=open_seed_dialog,
+    )
     setup_menu.add_checkbutton(
         label="Optimisation (rééquilibrage multi-mois)",
         variable=optimize_var,
@@ -4619,7 +5363,8 @@ if __name__ == '__main__':
     # Liste pour stocker (gui, constraints_app, shift_count_table) de chaque onglet
     tabs_data = []
 
-    def create_single_week(parent_frame, include_constraints: bool = True, enable_shift_counts: bool = True):
+    def create_single_week(parent_frame, include_constraints: bool = True, enable_shift_counts: bool = True,
+                           lazy_grid: bool = False):
         paned = ttk.PanedWindow(parent_frame, orient=tk.VERTICAL)
         paned.pack(fill="both", expand=True)
 
@@ -4639,7 +5384,7 @@ if __name__ == '__main__':
         scroll_frame = ScrollableFrame(content_frame)
         scroll_frame.pack(side="left", fill="both", expand=True)
 
-        gui_local = GUI(scroll_frame.inner)
+        gui_local = GUI(scroll_frame.inner, lazy_grid=lazy_grid)
         gui_local.scroll_canvas = scroll_frame.canvas   # pour scroll_to_cell(...)
         gui_local.scroll_inner  = scroll_frame.inner
 
@@ -4735,134 +5480,35 @@ if __name__ == '__main__':
                             row_snapshot.append("")
                     before_state.append(row_snapshot)
                 gui_local.last_assignment_state = before_state
+                # Les écritures groupées empilent leurs propres actions : on les
+                # remplace à la fin par un seul diff pour tout le clic.
+                undo_len = len(gui_local.cell_edit_undo_stack)
                 current_y = getattr(gui_local, "current_year", None)
                 current_m = getattr(gui_local, "current_month", None)
-                assigner_initiales(constraints_app_local, gui_local)
-                gui_local.schedule_update_colors()
-                # Restaure l'affichage (week-ends/jours fériés) et recalcule les comptes
-                if current_y and current_m:
-                    try:
-                        gui_local.apply_month_selection(current_y, current_m)
-                    except Exception:
-                        pass
-                if hasattr(gui_local, "shift_count_table"):
+                # Suite après l'assignation : appelée tout de suite, ou à la fin du
+                # solveur exact (thread de travail) s'il est activé
+                def _finish_assignation():
                     try:
-                        gui_local.shift_count_table.update_counts()
+                        assign_btn.state(["!disabled"])
                     except Exception:
                         pass
-                # Optimisation post-assignation (mois courant uniquement)
-                try:
-                    if getattr(Assignation, "OPTIMIZE_BALANCE", False) and len(tabs_data) >= 2:
-                        # Snapshot avant optimisation pour rollback éventuel
-                        snapshot_opt_before = []
-                        for row in gui_local.table_entries:
-                            row_snapshot = []
-                            for cell in row:
-                                if cell is None:
-                                    row_snapshot.append(None)
-                                else:
-                                    try:
-                                        row_snapshot.append(cell.get())
-                                    except Exception:
-                                        row_snapshot.append("")
-                            snapshot_opt_before.append(row_snapshot)
-
-                        def _counts_from_snapshot(snapshot_rows):
-                            """Calcule les compteurs (week, we) par initiale depuis un snapshot brut."""
-                            valid_initials = set()
-                            try:
-                                for crow in constraints_app_local.rows:
-                                    try:
-                                        init = crow[0].get().strip()
-                                        if init:
-                                            valid_initials.add(init)
-                                    except Exception:
-                                        continue
-                            except Exception:
-                                pass
-                            excl = getattr(gui_local, "excluded_from_count", set()) or set()
-
-                            def _day_type_for_row(row_idx):
-                                try:
-                                    day_text = gui_local.day_labels[row_idx].cget("text").strip()
-                                    if not day_text.isdigit():
-                                        return None
-                                    day_num = int(day_text)
-                                    dt = date(gui_local.current_year, gui_local.current_month, day_num)
-                                except Exception:
-                                    return None
-                                weekend_rows = getattr(gui_local, "weekend_rows", set())
-                                holiday_rows = getattr(gui_local, "holiday_rows", set())
-                                holiday_dates = getattr(gui_local, "holiday_dates", set())
-                                is_holiday = (row_idx in holiday_rows) or (dt in holiday_dates)
-                                is_weekend = (row_idx in weekend_rows) or dt.weekday() >= 5
-                                is_friday = dt.weekday() == 4
-                                try:
-                                    next_day = dt + timedelta(days=1)
-                                    next_day_holiday = next_day in holiday_dates and next_day.month == dt.month
-                                except Exception:
-                                    next_day_holiday = False
-                                if is_holiday or is_weekend or is_friday or next_day_holiday:
-                                    return "we"
-                                return "week"
-
-                            counts = {}
-                            for r_idx, snap_row in enumerate(snapshot_rows):
-                                dtype = _day_type_for_row(r_idx)
-                                if dtype is None:
-                                    continue
-                                names_in_day = set()
-                                for c_idx, val in enumerate(snap_row):
-                                    if (r_idx, c_idx) in excl:
-                                        continue
-                                    if not val:
-                                        continue
-                                    names = extract_names_from_cell(val, valid_initials)
-                                    if not names:
-                                        continue
-                                    for nm in names:
-                                        if nm in valid_initials:
-                                            names_in_day.add(nm)
-                                if not names_in_day:
-                                    continue
-                                for nm in names_in_day:
-                                    bucket = counts.setdefault(nm, {"week": 0, "we": 0})
-                                    bucket[dtype] = bucket.get(dtype, 0) + 1
-                            return counts
-
-                        def _apply_snapshot(snapshot_rows):
-                            """Réécrit la table depuis un snapshot simple (liste de listes de strings/None)."""
-                            try:
-                                for r_idx, snap_row in enumerate(snapshot_rows):
-                                    if r_idx >= len(gui_local.table_entries):
-                                        break
-                                    for c_idx, val in enumerate(snap_row):
-                                        if c_idx >= len(gui_local.table_entries[r_idx]):
-                                            break
-                                        cell = gui_local.table_entries[r_idx][c_idx]
-                                        if cell is None:
-                                            continue
-                                        try:
-                                            cell.delete(0, "end")
-                                            if val:
-                                                cell.insert(0, val)
-                                        except Exception:
-                                            pass
-                            except Exception:
-                                pass
-
-                        current_idx = None
+                    gui_local.schedule_update_colors(full=False)
+                    # Restaure l'affichage (week-ends/jours fériés) et recalcule les comptes
+                    if current_y and current_m:
                         try:
-                            for idx, item in enumerate(tabs_data):
-                                if item and item[0] is gui_local:
-                                    current_idx = idx
-                                    break
+                            gui_local.apply_month_selection(current_y, current_m)
                         except Exception:
-                            current_idx = None
-                        if current_idx is not None and current_idx > 0:
-                            opt_changes = Assignation.optimize_month_balance(constraints_app_local, gui_local, tabs_data, current_index=current_idx) or []
-                            # Snapshot après optimisation (état modifié)
-                            snapshot_opt_after = []
+                            pass
+                    if hasattr(gui_local, "shift_count_table"):
+                        try:
+                            gui_local.shift_count_table.update_counts()
+                        except Exception:
+                            pass
+                    # Optimisation post-assignation (mois courant uniquement)
+                    try:
+                        if getattr(Assignation, "OPTIMIZE_BALANCE", False) and len(tabs_data) >= 2:
+                            # Snapshot avant optimisation pour rollback éventuel
+                            snapshot_opt_before = []
                             for row in gui_local.table_entries:
                                 row_snapshot = []
                                 for cell in row:
@@ -4873,119 +5519,225 @@ if __name__ == '__main__':
                                             row_snapshot.append(cell.get())
                                         except Exception:
                                             row_snapshot.append("")
-                                snapshot_opt_after.append(row_snapshot)
+                                snapshot_opt_before.append(row_snapshot)
 
-                            counts_before = _counts_from_snapshot(snapshot_opt_before)
-                            counts_after = _counts_from_snapshot(snapshot_opt_after)
+                            def _counts_from_snapshot(snapshot_rows):
+                                """Calcule les compteurs (week, we) par initiale depuis un snapshot brut."""
+                                valid_initials = set()
+                                try:
+                                    for crow in constraints_app_local.rows:
+                                        try:
+                                            init = crow[0].get().strip()
+                                            if init:
+                                                valid_initials.add(init)
+                                        except Exception:
+                                            continue
+                                except Exception:
+                                    pass
+                                excl = getattr(gui_local, "excluded_from_count", set()) or set()
 
-                            # Restaurer l'état pré-optimisation pour affichage/compteurs
-                            _apply_snapshot(snapshot_opt_before)
-                            gui_local.schedule_update_colors()
-                            if hasattr(gui_local, "shift_count_table"):
-                                gui_local.shift_count_table.update_counts()
+                                def _day_type_for_row(row_idx):
+                                    try:
+                                        day_text = gui_local.day_labels[row_idx].cget("text").strip()
+                                        if not day_text.isdigit():
+                                            return None
+                                        day_num = int(day_text)
+                                        dt = date(gui_local.current_year, gui_local.current_month, day_num)
+                                    except Exception:
+                                        return None
+                                    weekend_rows = getattr(gui_local, "weekend_rows", set())
+                                    holiday_rows = getattr(gui_local, "holiday_rows", set())
+                                    holiday_dates = getattr(gui_local, "holiday_dates", set())
+                                    is_holiday = (row_idx in holiday_rows) or (dt in holiday_dates)
+                                    is_weekend = (row_idx in weekend_rows) or dt.weekday() >= 5
+                                    is_friday = dt.weekday() == 4
+                                    try:
+                                        next_day = dt + timedelta(days=1)
+                                        next_day_holiday = next_day in holiday_dates and next_day.month == dt.month
+                                    except Exception:
+                                        next_day_holiday = False
+                                    if is_holiday or is_weekend or is_friday or next_day_holiday:
+                                        return "we"
+                                    return "week"
 
-                            if opt_changes:
-                                # Popup de confirmation avec liste des changements
-                                dialog = tk.Toplevel(root)
-                                dialog.title("Optimisation")
-                                dialog.transient(root)
-                                dialog.grab_set()
-                                ttk.Label(dialog, text="Optimisation : modifications proposées/appliquées").pack(padx=12, pady=(12, 6), anchor="w")
-                                text_frame = tk.Frame(dialog)
-                                text_frame.pack(padx=12, pady=(0, 8), fill="both", expand=True)
-                                txt = tk.Text(text_frame, width=60, height=12, state="normal")
-                                txt.pack(side="left", fill="both", expand=True)
-                                scroll = ttk.Scrollbar(text_frame, orient="vertical", command=txt.yview)
-                                scroll.pack(side="right", fill="y")
-                                txt.configure(yscrollcommand=scroll.set)
-                                for change in opt_changes:
-                                    line = f"Jour {change.get('day','?')} / {change.get('post','?')} : {change.get('from','?')} -> {change.get('to','?')}\n"
-                                    txt.insert("end", line)
-                                # Ajouter un résumé des deltas de compte pour comprendre l'effet
-                                if counts_before or counts_after:
-                                    txt.insert("end", "\nRésumé compteurs (semaine / WE) :\n")
-                                    initials = sorted(set(counts_before.keys()) | set(counts_after.keys()))
-                                    for init in initials:
-                                        b = counts_before.get(init, {"week": 0, "we": 0})
-                                        a = counts_after.get(init, {"week": 0, "we": 0})
-                                        if (b.get("week", 0), b.get("we", 0)) == (a.get("week", 0), a.get("we", 0)):
+                                counts = {}
+                                for r_idx, snap_row in enumerate(snapshot_rows):
+                                    dtype = _day_type_for_row(r_idx)
+                                    if dtype is None:
+                                        continue
+                                    names_in_day = set()
+                                    for c_idx, val in enumerate(snap_row):
+                                        if (r_idx, c_idx) in excl:
                                             continue
-                                        txt.insert("end", f"{init}: {b.get('week',0)}/{b.get('we',0)} -> {a.get('week',0)}/{a.get('we',0)}\n")
-                                txt.config(state="disabled")
-
-                                # Positionner la popup au centre de la fenêtre principale
+                                        if not val:
+                                            continue
+                                        names = extract_names_from_cell(val, valid_initials)
+                                        if not names:
+                                            continue
+                                        for nm in names:
+                                            if nm in valid_initials:
+                                                names_in_day.add(nm)
+                                    if not names_in_day:
+                                        continue
+                                    for nm in names_in_day:
+                                        bucket = counts.setdefault(nm, {"week": 0, "we": 0})
+                                        bucket[dtype] = bucket.get(dtype, 0) + 1
+                                return counts
+
+                            def _apply_snapshot(snapshot_rows):
+                                """Réécrit la table depuis un snapshot simple (liste de listes de strings/None)."""
+                                changes = []
+                                for r_idx, snap_row in enumerate(snapshot_rows):
+                                    for c_idx, val in enumerate(snap_row):
+                                        if val is not None:
+                                            changes.append((r_idx, c_idx, val))
                                 try:
-                                    dialog.update_idletasks()
-                                    root.update_idletasks()
-                                    win_w = dialog.winfo_reqwidth()
-                                    win_h = dialog.winfo_reqheight()
-                                    root_x = root.winfo_rootx()
-                                    root_y = root.winfo_rooty()
-                                    root_w = root.winfo_width()
-                                    root_h = root.winfo_height()
-                                    pos_x = root_x + max(0, (root_w - win_w) // 2)
-                                    pos_y = root_y + max(0, (root_h - win_h) // 2)
-                                    dialog.geometry(f"+{pos_x}+{pos_y}")
+                                    gui_local.apply_assignments(changes, push_undo=False)
                                 except Exception:
                                     pass
 
-                                result = {"keep": False}
-
-                                def _accept():
-                                    result["keep"] = True
-                                    dialog.destroy()
-
-                                def _reject():
-                                    result["keep"] = False
-                                    dialog.destroy()
-
-                                btns = ttk.Frame(dialog)
-                                btns.pack(pady=(6, 10))
-                                ttk.Button(btns, text="OK", width=12, command=_accept, style=RIBBON_ACCENT_BUTTON_STYLE).pack(side="left", padx=6)
-                                ttk.Button(btns, text="Ne pas accepter", width=16, command=_reject, style=RIBBON_BUTTON_STYLE).pack(side="left", padx=6)
-                                dialog.bind("<Return>", lambda e: _accept())
-                                dialog.bind("<Escape>", lambda e: _reject())
-                                dialog.wait_window()
-
-                                if not result["keep"]:
-                                    # Rester sur l'état pré-optimisation (déjà restauré)
-                                    if hasattr(gui_local, "shift_count_table"):
-                                        gui_local.shift_count_table.update_counts()
-                                else:
-                                    # Appliquer l'état optimisé et mettre à jour l'affichage/compteurs
-                                    _apply_snapshot(snapshot_opt_after)
-                                    gui_local.schedule_update_colors()
-                                    if hasattr(gui_local, "shift_count_table"):
-                                        gui_local.shift_count_table.update_counts()
-                            else:
-                                messagebox.showinfo("Optimisation", "Optimisation terminée : aucune modification apportée.")
-                except Exception:
-                    pass
-                # Push the diff to the undo stack so "Annuler assignation" works.
-                try:
-                    changes = []
-                    for r_idx, row in enumerate(gui_local.table_entries):
-                        if r_idx >= len(before_state):
-                            break
-                        before_row = before_state[r_idx]
-                        for c_idx, cell in enumerate(row):
-                            if c_idx >= len(before_row):
-                                break
-                            if cell is None:
-                                continue
+                            current_idx = None
                             try:
-                                new_val = cell.get()
+                                for idx, item in enumerate(tabs_data):
+                                    if item and item[0] is gui_local:
+                                        current_idx = idx
+                                        break
                             except Exception:
-                                continue
-                            old_val = before_row[c_idx]
-                            if old_val is None:
-                                old_val = ""
-                            if new_val != old_val:
-                                changes.append((r_idx, c_idx, old_val))
-                    if changes:
-                        gui_local.cell_edit_undo_stack.append(changes)
+                                current_idx = None
+                            if current_idx is not None and current_idx > 0:
+                                opt_changes = Assignation.optimize_month_balance(constraints_app_local, gui_local, tabs_data, current_index=current_idx) or []
+                                # Snapshot après optimisation (état modifié)
+                                snapshot_opt_after = []
+                                for row in gui_local.table_entries:
+                                    row_snapshot = []
+                                    for cell in row:
+                                        if cell is None:
+                                            row_snapshot.append(None)
+                                        else:
+                                            try:
+                                                row_snapshot.append(cell.get())
+                                            except Exception:
+                                                row_snapshot.append("")
+                                    snapshot_opt_after.append(row_snapshot)
+
+                                counts_before = _counts_from_snapshot(snapshot_opt_before)
+                                counts_after = _counts_from_snapshot(snapshot_opt_after)
+
+                                # Restaurer l'état pré-optimisation pour affichage/compteurs
+                                _apply_snapshot(snapshot_opt_before)
+                                gui_local.schedule_update_colors(full=False)
+                                if hasattr(gui_local, "shift_count_table"):
+                                    gui_local.shift_count_table.update_counts()
+
+                                if opt_changes:
+                                    # Popup de confirmation avec liste des changements
+                                    dialog = tk.Toplevel(root)
+                                    dialog.title("Optimisation")
+                                    dialog.transient(root)
+                                    dialog.grab_set()
+                                    ttk.Label(dialog, text="Optimisation : modifications proposées/appliquées").pack(padx=12, pady=(12, 6), anchor="w")
+                                    text_frame = tk.Frame(dialog)
+                                    text_frame.pack(padx=12, pady=(0, 8), fill="both", expand=True)
+                                    txt = tk.Text(text_frame, width=60, height=12, state="normal")
+                                    txt.pack(side="left", fill="both", expand=True)
+                                    scroll = ttk.Scrollbar(text_frame, orient="vertical", command=txt.yview)
+                                    scroll.pack(side="right", fill="y")
+                                    txt.configure(yscrollcommand=scroll.set)
+                                    for change in opt_changes:
+                                        line = f"Jour {change.get('day','?')} / {change.get('post','?')} : {change.get('from','?')} -> {change.get('to','?')}\n"
+                                        txt.insert("end", line)
+                                    # Ajouter un résumé des deltas de compte pour comprendre l'effet
+                                    if counts_before or counts_after:
+                                        txt.insert("end", "\nRésumé compteurs (semaine / WE) :\n")
+                                        initials = sorted(set(counts_before.keys()) | set(counts_after.keys()))
+                                        for init in initials:
+                                            b = counts_before.get(init, {"week": 0, "we": 0})
+                                            a = counts_after.get(init, {"week": 0, "we": 0})
+                                            if (b.get("week", 0), b.get("we", 0)) == (a.get("week", 0), a.get("we", 0)):
+                                                continue
+                                            txt.insert("end", f"{init}: {b.get('week',0)}/{b.get('we',0)} -> {a.get('week',0)}/{a.get('we',0)}\n")
+                                    txt.config(state="disabled")
+
+                                    # Positionner la popup au centre de la fenêtre principale
+                                    try:
+                                        dialog.update_idletasks()
+                                        root.update_idletasks()
+                                        win_w = dialog.winfo_reqwidth()
+                                        win_h = dialog.winfo_reqheight()
+                                        root_x = root.winfo_rootx()
+                                        root_y = root.winfo_rooty()
+                                        root_w = root.winfo_width()
+                                        root_h = root.winfo_height()
+                                        pos_x = root_x + max(0, (root_w - win_w) // 2)
+                                        pos_y = root_y + max(0, (root_h - win_h) // 2)
+                                        dialog.geometry(f"+{pos_x}+{pos_y}")
+                                    except Exception:
+                                        pass
+
+                                    result = {"keep": False}
+
+                                    def _accept():
+                                        result["keep"] = True
+                                        dialog.destroy()
+
+                                    def _reject():
+                                        result["keep"] = False
+                                        dialog.destroy()
+
+                                    btns = ttk.Frame(dialog)
+                                    btns.pack(pady=(6, 10))
+                                    ttk.Button(btns, text="OK", width=12, command=_accept, style=RIBBON_ACCENT_BUTTON_STYLE).pack(side="left", padx=6)
+                                    ttk.Button(btns, text="Ne pas accepter", width=16, command=_reject, style=RIBBON_BUTTON_STYLE).pack(side="left", padx=6)
+                                    dialog.bind("<Return>", lambda e: _accept())
+                                    dialog.bind("<Escape>", lambda e: _reject())
+                                    dialog.wait_window()
+
+                                    if not result["keep"]:
+                                        # Rester sur l'état pré-optimisation (déjà restauré)
+                                        if hasattr(gui_local, "shift_count_table"):
+                                            gui_local.shift_count_table.update_counts()
+                                    else:
+                                        # Appliquer l'état optimisé et mettre à jour l'affichage/compteurs
+                                        _apply_snapshot(snapshot_opt_after)
+                                        gui_local.schedule_update_colors(full=False)
+                                        if hasattr(gui_local, "shift_count_table"):
+                                            gui_local.shift_count_table.update_counts()
+                                else:
+                                    messagebox.showinfo("Optimisation", "Optimisation terminée : aucune modification apportée.")
+                    except Exception:
+                        pass
+                    # Push the diff to the undo stack so "Annuler assignation" works.
+                    try:
+                        del gui_local.cell_edit_undo_stack[undo_len:]
+                        changes = []
+                        for r_idx, row in enumerate(gui_local.table_entries):
+                            if r_idx >= len(before_state):
+                                break
+                            before_row = before_state[r_idx]
+                            for c_idx, cell in enumerate(row):
+                                if c_idx >= len(before_row):
+                                    break
+                                if cell is None:
+                                    continue
+                                try:
+                                    new_val = cell.get()
+                                except Exception:
+                                    continue
+                                old_val = before_row[c_idx]
+                                if old_val is None:
+                                    old_val = ""
+                                if new_val != old_val:
+                                    changes.append((r_idx, c_idx, old_val))
+                        if changes:
+                            gui_local.cell_edit_undo_stack.append(changes)
+                    except Exception:
+                        pass
+
+                try:
+                    assign_btn.state(["disabled"])
                 except Exception:
                     pass
+                assigner_initiales(constraints_app_local, gui_local, on_done=_finish_assignation)
 
             assign_btn = ttk.Button(
                 action_box,
@@ -5044,6 +5796,7 @@ if __name__ == '__main__':
             bottom_frame.grid_rowconfigure(0, weight=1)
             bottom_frame.grid_columnconfigure(0, weight=1)
             constraints_app_local.set_change_callback = lambda cb=None: None
+            constraints_app_local.on_change = bump_model_revision
             gui_local.constraints_app = constraints_app_local
         else:
             gui_local.constraints_app = None
@@ -5132,19 +5885,13 @@ if __name__ == '__main__':
                 )
                 if not file_path:
                     return
-            import pickle
             try:
-                with open(file_path, "rb") as f:
-                    loaded = pickle.load(f)
+                status = read_status(file_path)
             except Exception as e:
                 messagebox.showerror("Charger planning", f"Impossible de lire le fichier : {e}")
                 return
 
-            if not isinstance(loaded, tuple) or len(loaded) < 3:
-                messagebox.showerror("Charger planning", "Fichier incompatible (structure inattendue).")
-                return
-
-            all_week_status, saved_posts, saved_post_info = loaded[0], loaded[1], loaded[2]
+            saved_posts, saved_post_info = status.work_posts, status.post_info
             nonlocal secondary_current_path
             secondary_current_path = file_path
             try:
@@ -5166,21 +5913,12 @@ if __name__ == '__main__':
             new_win.update_idletasks()
 
             # Construire chaque semaine avec les postes du fichier (sans toucher aux postes globaux)
-            for idx, wk in enumerate(all_week_status):
-                if len(wk) >= 6:
-                    (table_data,
-                     cell_availability_data,
-                     _constraints_data,
-                     schedule_data,
-                     week_label_text,
-                     excluded_cells) = wk
-                else:
-                    (table_data,
-                     cell_availability_data,
-                     _constraints_data,
-                     schedule_data,
-                     week_label_text) = wk
-                    excluded_cells = []
+            for idx, wk in enumerate(status.months):
+                table_data = wk.table_data
+                cell_availability_data = wk.cell_availability
+                schedule_data = wk.schedule
+                week_label_text = wk.week_label
+                excluded_cells = wk.excluded_cells
 
                 # Crée une semaine dimensionnée selon les postes du fichier
                 frame = tk.Frame(notebook2)
@@ -5485,18 +6223,13 @@ if __name__ == '__main__':
 
     # Petit callback pour que les menus existants (File, Setup) pointent toujours
     # vers le gui/constraints_app de l'onglet actif.
-    def on_tab_changed(event):
-        global gui, constraints_app
-        current_index = notebook.index(notebook.select())
-        gui, constraints_app, _ = tabs_data[current_index]
-
-    notebook.bind("<<NotebookTabChanged>>", on_tab_changed)
+    notebook.bind("<<NotebookTabChanged>>", _on_month_tab_changed)
 
     # ------------------------------------------------------------------
     #  Raccourcis clavier globaux (instanciÃ©s UNE seule fois)
     #  ---------------------------------------------------------------
     #  Le lambda utilise la variable globale `gui`, mise Ã  jour par
-    #  on_tab_changed ; ainsi, les actions sâappliquent toujours
+    #  _on_month_tab_changed ; ainsi, les actions sâappliquent toujours
     #  Ã  lâonglet (semaine) actif, sans conserver dâanciennes instances.
     # ------------------------------------------------------------------
     root.bind_all("<Control-MouseWheel>", lambda e: gui.on_zoom(e))
@@ -5534,6 +6267,8 @@ if __name__ == '__main__':
         auto_save_status()
         root.after(3 * 60 * 1000, schedule_auto_save)
 
+    # Répare au besoin la sauvegarde auto laissée par une session interrompue
+    recover_latest_autosave()
     root.after(3 * 60 * 1000, schedule_auto_save)
     
     # Lancement de la boucle principale
@@ -2650,7 +2650,9 @@ def import_conflicts_from_pkl(root, notebook, tabs_data):
 
     from tkinter import filedialog, messagebox, ttk
 
-    import pickle, re, difflib
+    import re, difflib
+
+    from status_io import read_status_file
 
     from collections import defaultdict
 
@@ -2912,9 +2914,7 @@ def import_conflicts_from_pkl(root, notebook, tabs_data):
 
     try:
 
-        with open(src_path, "rb") as f:
-
-            packed = pickle.load(f)
+        packed = read_status_file(src_path)
 
         # Format de sauvegarde courant : packed[0] = all_week_status
 
@@ -3930,7 +3930,9 @@ def check_cross_planning_conflicts_from_pkl(root, notebook, tabs_data):
 
     from tkinter import ttk, filedialog, messagebox
 
-    import pickle, re, difflib
+    import re, difflib
+
+    from status_io import read_status_file
 
     from collections import defaultdict
 
@@ -4118,9 +4120,7 @@ def check_cross_planning_conflicts_from_pkl(root, notebook, tabs_data):
 
     try:
 
-        with open(src_path, "rb") as f:
-
-            packed = pickle.load(f)
+        packed = read_status_file(src_path)
 
         all_week_status = packed[0]       # [(table_data, cell_av, constraints, schedule, week_label, [excluded]), ...]
 
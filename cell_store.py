@@ -0,0 +1,218 @@
+"""
+Cellules de planning en mémoire, sans widget (onglets paresseux de Full_GUI).
+
+Tant qu'un onglet de mois n'a pas été affiché, sa grille est un CellStore :
+les cellules (StoredCell) gardent l'interface des Entry utilisée par le reste
+de l'application : get / insert / delete / config / cget / bind / focus_set /
+grid / grid_remove / winfo_*. Elles servent à la fois de table_entries et de
+table_frames, le code existant n'a pas à savoir si la grille est construite.
+"""
+
+from __future__ import annotations
+
+import tkinter as tk
+
+_CELL_DEFAULTS = {
+    "bg": "#FFFFFF",
+    "fg": "black",
+    "state": "normal",
+    "disabledbackground": "#DDE2EC",
+    "disabledforeground": "#6B778D",
+    "highlightbackground": "#D6E4DA",
+    "highlightthickness": 1,
+}
+_OPTION_ALIASES = {"background": "bg", "foreground": "fg"}
+
+
+class _CellBadge:
+    """Badge de conflit porté par une cellule ; même contrat que le Label d'origine."""
+
+    def __init__(self, cell, text, bg, fg):
+        self.cell = cell
+        self.text = text
+        self.bg = bg
+        self.fg = fg
+
+    def winfo_exists(self):
+        return self.cell.badge is self and self.cell.winfo_exists()
+
+    def destroy(self):
+        if self.cell.badge is self:
+            self.cell.badge = None
+            self.cell.grid_owner.draw_cell(self.cell)
+
+
+class StoredCell:
+    """Cellule d'un CellStore, manipulable comme un tk.Entry."""
+
+    def __init__(self, grid_owner, row, col):
+        self.grid_owner = grid_owner
+        self.row = row
+        self.col = col
+        self.text = ""
+        self.options = dict(_CELL_DEFAULTS)
+        self.hidden = False
+        self.badge = None
+        self._handlers = {}
+
+    # --- texte (API Entry) -------------------------------------------------
+    def get(self):
+        return self.text
+
+    def _index(self, index):
+        if index in ("end", tk.END, "insert", tk.INSERT):
+            return len(self.text)
+        try:
+            return max(0, min(len(self.text), int(index)))
+        except Exception:
+            return len(self.text)
+
+    def insert(self, index, string):
+        # Comme un Entry, une cellule désactivée ignore les modifications
+        if self.options["state"] == "disabled" or not string:
+            return
+        pos = self._index(index)
+        self._set_text(self.text[:pos] + str(string) + self.text[pos:])
+
+    def delete(self, first, last=None):
+        if self.options["state"] == "disabled":
+            return
+        start = self._index(first)
+        end = start + 1 if last is None else self._index(last)
+        if end <= start:
+            return
+        self._set_text(self.text[:start] + self.text[end:])
+
+    def _set_text(self, value):
+        if value == self.text:
+            return
+        self.text = value
+        self.grid_owner.cell_written(self)
+
+    # --- options (API Entry / Frame) ---------------------------------------
+    def config(self, cnf=None, **kw):
+        if cnf:
+            kw = dict(cnf, **kw)
+        if not kw:
+            return {key: (key, value) for key, value in self.options.items()}
+        for key, value in kw.items():
+            key = _OPTION_ALIASES.get(key, key)
+            if key in self.options:
+                self.options[key] = value
+        self.grid_owner.draw_cell(self)
+
+    configure = config
+
+    def cget(self, key):
+        return self.options.get(_OPTION_ALIASES.get(key, key), "")
+
+    def __getitem__(self, key):
+        return self.cget(key)
+
+    # --- événements ---------------------------------------------------------
+    def bind(self, sequence, func=None, add=None):
+        if func is None:
+            return self._handlers.get(sequence, [])
+        if add:
+            self._handlers.setdefault(sequence, []).append(func)
+        else:
+            self._handlers[sequence] = [func]
+
+    def focus_set(self):
+        self.grid_owner.open_editor(self)
+
+    focus = focus_set
+
+    # --- placement ------------------------------------------------------------
+    def grid(self, *args, **kwargs):
+        if self.hidden:
+            self.hidden = False
+            self.grid_owner.draw_cell(self)
+
+    def grid_remove(self):
+        if not self.hidden:
+            self.hidden = True
+            self.grid_owner.draw_cell(self)
+
+    grid_forget = grid_remove
+
+    def add_badge(self, text, bg, fg):
+        self.badge = _CellBadge(self, text, bg, fg)
+        self.grid_owner.draw_cell(self)
+        return self.badge
+
+    # --- géométrie ------------------------------------------------------------
+    def winfo_exists(self):
+        try:
+            return bool(self.grid_owner.winfo_exists())
+        except Exception:
+            return False
+
+    def _box(self):
+        return self.grid_owner.cell_box(self.row, self.col) or (0, 0, 0, 0)
+
+    def winfo_rootx(self):
+        return self.grid_owner.winfo_rootx() + self._box()[0]
+
+    def winfo_rooty(self):
+        return self.grid_owner.winfo_rooty() + self._box()[1]
+
+    def winfo_width(self):
+        x0, _y0, x1, _y1 = self._box()
+        return max(1, x1 - x0)
+
+    def winfo_height(self):
+        _x0, y0, _x1, y1 = self._box()
+        return max(1, y1 - y0)
+
+    def winfo_toplevel(self):
+        return self.grid_owner.winfo_toplevel()
+
+
+class CellStore:
+    """
+    Cellules sans aucun widget : contenu d'un onglet pas encore affiché.
+
+    Lecture, écriture et options passent par les StoredCell ; rien n'est
+    dessiné. Une demande de focus sur une cellule déclenche la construction
+    de la vraie grille par `materialize`.
+    """
+
+    def __init__(self, owner, rows, cols, on_write=None, materialize=None):
+        self.owner = owner
+        self.on_write = on_write
+        self.materialize = materialize
+        self.cells = [[StoredCell(self, r, c) for c in range(cols)] for r in range(rows)]
+
+    def draw_cell(self, cell):
+        pass
+
+    def cell_box(self, row, col):
+        return None
+
+    def cell_written(self, cell):
+        if self.on_write is not None:
+            self.on_write(cell.row, cell.col)
+
+    def open_editor(self, cell, source=None):
+        if self.materialize is None:
+            return
+        self.materialize()
+        try:
+            target = self.owner.table_entries[cell.row][cell.col]
+        except Exception:
+            target = None
+        if target is not None and target is not cell:
+            target.focus_set()
+
+    def winfo_exists(self):
+        return self.owner.winfo_exists()
+
+    def winfo_rootx(self):
+        return self.owner.winfo_rootx()
+
+    def winfo_rooty(self):
+        return self.owner.winfo_rooty()
+
+    def winfo_toplevel(self):
+        return self.owner.winfo_toplevel()
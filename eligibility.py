@@ -129,19 +129,82 @@ class AssignmentSettings:
 
 @dataclass
 class PlanningContext:
+    """
+    Vue en lecture sur la grille du planning (widgets Entry ou chaînes).
+
+    Mode par défaut : les compteurs sont recalculés à la demande puis mis en
+    cache jusqu'au prochain clear_caches().
+    Mode incremental=True : un index unique est construit au premier accès
+    (rebuild_index), puis tenu à jour en O(1) par assign()/unassign(); les
+    appelants doivent signaler chaque écriture dans la grille.
+    """
+
     table_entries: Sequence[Sequence]
     name_resolver: Callable[[str], Sequence[str]]
     exclusion_checker: Optional[Callable[[int, int], bool]] = None
     excluded_cells: Optional[Set[Tuple[int, int]]] = None
+    incremental: bool = False
     _total_cache: dict = field(default_factory=dict, init=False, repr=False)
     _post_cache: dict = field(default_factory=dict, init=False, repr=False)
     _slot_cache: dict = field(default_factory=dict, init=False, repr=False)
+    _indexed: bool = field(default=False, init=False, repr=False)
+    _total_counts: Dict[str, int] = field(default_factory=dict, init=False, repr=False)
+    _post_counts: Dict[Tuple[str, int], int] = field(default_factory=dict, init=False, repr=False)
+    _row_counts: Dict[Tuple[str, int], int] = field(default_factory=dict, init=False, repr=False)
 
     def clear_caches(self) -> None:
         self._total_cache.clear()
         self._post_cache.clear()
         self._slot_cache.clear()
 
+    # --- Index incrémental -------------------------------------------------
+    def rebuild_index(self) -> None:
+        """Parcourt la grille une fois et reconstruit les compteurs incrémentaux."""
+        self._total_counts.clear()
+        self._post_counts.clear()
+        self._row_counts.clear()
+        for r_idx, row in enumerate(self.table_entries):
+            for c_idx, _cell in enumerate(row):
+                for initial in self.names_at(r_idx, c_idx):
+                    self._bump(initial, r_idx, c_idx, 1)
+        self._indexed = True
+
+    def _ensure_index(self) -> None:
+        if not self._indexed:
+            self.rebuild_index()
+
+    def _bump(self, initial: str, row: int, col: int, delta: int) -> None:
+        for counter, key in (
+            (self._total_counts, initial),
+            (self._post_counts, (initial, col)),
+            (self._row_counts, (initial, row)),
+        ):
+            value = counter.get(key, 0) + delta
+            if value > 0:
+                counter[key] = value
+            else:
+                counter.pop(key, None)
+
+    def assign(self, initial: str, row: int, col: int) -> None:
+        """Signale qu'`initial` vient d'être placé en (row, col)."""
+        if not initial or self._should_skip(row, col):
+            return
+        if self.incremental:
+            self._ensure_index()
+            self._bump(initial, row, col, 1)
+        else:
+            self.clear_caches()
+
+    def unassign(self, initial: str, row: int, col: int) -> None:
+        """Signale qu'`initial` vient d'être retiré de (row, col)."""
+        if not initial or self._should_skip(row, col):
+            return
+        if self.incremental:
+            self._ensure_index()
+            self._bump(initial, row, col, -1)
+        else:
+            self.clear_caches()
+
     def _should_skip(self, row: int, col: int) -> bool:
         if self.exclusion_checker is not None:
             try:
@@ -160,6 +223,8 @@ class PlanningContext:
             return []
         if not cell or self._should_skip(row, col):
             return []
+        if isinstance(cell, str):
+            return list(self.name_resolver(cell))
         try:
             raw = cell.get()
         except Exception:
@@ -169,6 +234,9 @@ class PlanningContext:
     def count_total_assignments(self, initial: str) -> int:
         if not initial:
             return 0
+        if self.incremental:
+            self._ensure_index()
+            return self._total_counts.get(initial, 0)
         cached = self._total_cache.get(initial)
         if cached is not None:
             return cached
@@ -185,6 +253,9 @@ class PlanningContext:
     def count_assignments_for_post(self, initial: str, post_index: int) -> int:
         if not initial:
             return 0
+        if self.incremental:
+            self._ensure_index()
+            return self._post_counts.get((initial, post_index), 0)
         key = (initial, post_index)
         cached = self._post_cache.get(key)
         if cached is not None:
@@ -203,6 +274,9 @@ class PlanningContext:
     def already_assigned_in_timeslot(self, initial: str, day_index: int, is_morning: bool) -> bool:
         if not initial:
             return False
+        if self.incremental:
+            self._ensure_index()
+            return self._row_counts.get((initial, day_index), 0) > 0
         key = (initial, day_index, is_morning)
         cached = self._slot_cache.get(key)
         if cached is not None:
@@ -229,13 +303,24 @@ def candidate_is_available(
     post_name: str,
     settings: AssignmentSettings,
 ) -> bool:
+    if not _statically_available(profile, day_index=day_index, post_name=post_name, settings=settings):
+        return False
+    return _available_in_context(profile, context, day_index=day_index, post_index=post_index, settings=settings)
+
+
+def _statically_available(
+    profile: ConstraintProfile,
+    *,
+    day_index: int,
+    post_name: str,
+    settings: AssignmentSettings,
+) -> bool:
+    """Critères qui ne dépendent que du profil et du créneau (pas de la grille)."""
     if not profile.initial:
         return False
 
     if profile.quota_total is None:
         return False
-    if context.count_total_assignments(profile.initial) >= profile.quota_total:
-        return False
 
     if profile.is_absent(day_index, True):
         return False
@@ -246,6 +331,21 @@ def candidate_is_available(
     if profile.non_assured_posts and post_name in profile.non_assured_posts:
         return False
 
+    return True
+
+
+def _available_in_context(
+    profile: ConstraintProfile,
+    context: PlanningContext,
+    *,
+    day_index: int,
+    post_index: int,
+    settings: AssignmentSettings,
+) -> bool:
+    """Critères qui dépendent du contenu courant de la grille."""
+    if context.count_total_assignments(profile.initial) >= profile.quota_total:
+        return False
+
     if context.already_assigned_in_timeslot(profile.initial, day_index, True):
         return False
 
@@ -259,3 +359,73 @@ def candidate_is_available(
             return False
 
     return True
+
+
+class EligibilityService:
+    """
+    "Qui peut prendre (jour, poste) ?" pour un onglet, sans tout recalculer à chaque focus.
+
+    - Les ConstraintProfile et les réglages ne sont reconstruits que lorsque `key`
+      change (version du tableau de contraintes, liste des postes, options du moteur).
+    - Les critères statiques (absence, repos, poste non assuré) sont rangés dans une
+      matrice (jour, poste) -> profils admissibles, remplie à la première demande.
+    - Seuls les critères liés à la grille (quotas, créneau déjà pris) sont évalués sur
+      le PlanningContext fourni.
+    """
+
+    def __init__(self) -> None:
+        self._key = None
+        self._profiles: List[ConstraintProfile] = []
+        self._posts: List[str] = []
+        self._settings: Optional[AssignmentSettings] = None
+        self._matrix: Dict[Tuple[int, int], Tuple[ConstraintProfile, ...]] = {}
+
+    def update(
+        self,
+        key,
+        rows: Sequence,
+        posts: Sequence[str],
+        settings_factory: Callable[[], AssignmentSettings],
+    ) -> None:
+        """Reparse les lignes de contraintes si `key` a changé depuis le dernier appel."""
+        if self._key is not None and key == self._key:
+            return
+        profiles = []
+        for row in rows:
+            profile = parse_constraint_row(row)
+            if profile:
+                profiles.append(profile)
+        self._profiles = profiles
+        self._posts = list(posts)
+        self._settings = settings_factory()
+        self._matrix = {}
+        self._key = key
+
+    def _static_candidates(self, day_index: int, post_index: int) -> Tuple[ConstraintProfile, ...]:
+        cell_key = (day_index, post_index)
+        candidates = self._matrix.get(cell_key)
+        if candidates is None:
+            post_name = self._posts[post_index]
+            candidates = tuple(
+                profile
+                for profile in self._profiles
+                if _statically_available(profile, day_index=day_index, post_name=post_name, settings=self._settings)
+            )
+            self._matrix[cell_key] = candidates
+        return candidates
+
+    def eligible_initials(self, context: PlanningContext, day_index: int, post_index: int) -> List[str]:
+        """Initiales éligibles pour (day_index, post_index), dans l'ordre du tableau de contraintes."""
+        if self._settings is None or not (0 <= post_index < len(self._posts)):
+            return []
+        return [
+            profile.initial
+            for profile in self._static_candidates(day_index, post_index)
+            if _available_in_context(
+                profile,
+                context,
+                day_index=day_index,
+                post_index=post_index,
+                settings=self._settings,
+            )
+        ]
@@ -0,0 +1,326 @@
+"""
+Solveur exact optionnel pour l'assignation (OR-Tools CP-SAT).
+
+Reprend les règles du moteur glouton (Assignation.assign_on_model) sur un
+PlanningModel :
+- une personne par case ouverte et vide,
+- absences, jours exclus, postes non assurés,
+- une seule case par jour et par personne, sauf entre postes associés,
+- plafond de jours WE / fériés par mois,
+- blocs week-end (ven-sam-dim) sur WEEKEND_BLOCK_POSTS, en contrainte souple,
+- écart aux cibles semaine / WE pondérées par la participation.
+
+La compensation en semaine autour des blocs (ENABLE_WEEKDAY_COMPENSATION)
+n'est pas modélisée : Assignation ne lance pas le solveur quand elle est
+activée (voir Assignation.exact_solver_skip_reason).
+
+Le résultat glouton sert de point de départ (hint) et de repli : la solution
+du solveur n'est retenue que si elle est meilleure selon le même objectif.
+Sans OR-Tools installé, solver_available() renvoie False et rien ne change.
+"""
+
+from __future__ import annotations
+
+import copy
+import os
+from datetime import date, timedelta
+from typing import Dict, List, Optional, Sequence, Set, Tuple
+
+try:
+    from ortools.sat.python import cp_model
+except Exception:
+    cp_model = None
+
+from planning_model import PlanningModel, get_name_resolver
+
+SCALE = 100  # les coefficients CP-SAT sont entiers : 1 jour d'écart = SCALE
+PREF_BONUS = 0.15
+BLOCK_SPLIT_WEIGHT = 1.0  # par personne supplémentaire sur un même bloc week-end
+
+
+def solver_available() -> bool:
+    return cp_model is not None
+
+
+def _weekend_block_rows(model: PlanningModel) -> List[List[int]]:
+    """Lignes des blocs ven-sam-dim (jours WE uniquement, dans le mois)."""
+    blocks = []
+    seen = set()
+    for r_idx in range(len(model.grid)):
+        if model.day_types[r_idx] != "we":
+            continue
+        day_num = model.day_numbers[r_idx]
+        dt = date(model.year, model.month, day_num)
+        start = dt - timedelta(days=max(0, dt.weekday() - 4))
+        if start in seen:
+            continue
+        seen.add(start)
+        rows = []
+        for i in range(3):
+            d = start + timedelta(days=i)
+            if d.month != model.month:
+                continue
+            row = model.day_to_row.get(d.day)
+            if row is not None and model.day_types[row] == "we":
+                rows.append(row)
+        if len(rows) >= 2:
+            blocks.append(rows)
+    return blocks
+
+
+class _Problem:
+    """Données statiques communes à la modélisation et à l'évaluation."""
+
+    def __init__(self, model: PlanningModel, profiles: Sequence[dict], targets_week: Dict[str, float],
+                 targets_we: Dict[str, float], options: dict):
+        self.model = model
+        unique = {}
+        for p in profiles:
+            unique.setdefault(p["initial"], p)
+        self.profiles = list(unique.values())
+        self.index = {p["initial"]: i for i, p in enumerate(self.profiles)}
+        self.valid = set(self.index)
+        self.resolve = get_name_resolver(self.valid)
+        self.targets = {
+            "week": [float(targets_week.get(p["initial"], 0.0)) for p in self.profiles],
+            "we": [float(targets_we.get(p["initial"], 0.0)) for p in self.profiles],
+        }
+        self.unfilled_weight = float(options.get("RESTART_UNFILLED_WEIGHT", 2.0))
+        we_limit = options.get("MAX_WE_DAYS_PER_MONTH")
+        self.we_limit = None
+        if options.get("ENABLE_MAX_WE_DAYS") and we_limit is not None:
+            try:
+                self.we_limit = max(0, int(we_limit))
+            except Exception:
+                self.we_limit = None
+        block_posts = set(options.get("WEEKEND_BLOCK_POSTS") or ())
+        if options.get("ENABLE_WEEKEND_BLOCKS") and not block_posts:
+            block_posts = set(model.posts)
+        self.block_cols = [c for c, name in enumerate(model.posts) if name in block_posts]
+        self.blocks = _weekend_block_rows(model) if self.block_cols else []
+
+        post_index = {name: c for c, name in enumerate(model.posts)}
+        self.assoc = []
+        for p in self.profiles:
+            pairs = set()
+            cols = [post_index[a] for a in p.get("associations", []) if a in post_index]
+            for a in cols:
+                for b in cols:
+                    if a != b:
+                        pairs.add((a, b))
+            self.assoc.append(pairs)
+
+        # Cases à remplir et occupation existante
+        self.open_cells: List[Tuple[int, int]] = []
+        self.busy: Set[Tuple[int, int]] = set()  # (profil, ligne) déjà occupé
+        self.existing_days = {"week": [set() for _ in self.profiles], "we": [set() for _ in self.profiles]}
+        for r_idx, row in enumerate(model.grid):
+            if not model.in_month(r_idx):
+                continue
+            dtype = model.day_types[r_idx]
+            code = model.weekday_codes[r_idx]
+            for c_idx, value in enumerate(row):
+                if not model.has_cell(r_idx, c_idx) or model.is_excluded(r_idx, c_idx):
+                    continue
+                if not value.strip():
+                    if model.is_open(r_idx, c_idx):
+                        self.open_cells.append((r_idx, c_idx))
+                    continue
+                for nm in self.resolve(value):
+                    i = self.index[nm]
+                    self.busy.add((i, r_idx))
+                    if model.is_open(r_idx, c_idx) and code not in self.profiles[i].get("excluded_weekdays", set()):
+                        self.existing_days[dtype][i].add(model.day_numbers[r_idx])
+
+    def allowed(self, i: int, r_idx: int, c_idx: int) -> bool:
+        p = self.profiles[i]
+        model = self.model
+        dtype = model.day_types[r_idx]
+        if self.targets[dtype][i] <= 0:
+            return False
+        if (i, r_idx) in self.busy:
+            return False
+        if model.weekday_codes[r_idx] in p.get("excluded_weekdays", set()):
+            return False
+        if model.day_numbers[r_idx] in p["absences"]:
+            return False
+        if model.posts[c_idx] in p["non_assured"]:
+            return False
+        if dtype == "we" and self.we_limit is not None and len(self.existing_days["we"][i]) >= self.we_limit:
+            return False
+        return True
+
+    def evaluate(self, grid: Sequence[Sequence[str]]) -> float:
+        """Objectif (plus bas = meilleur) pour les cases à remplir de `grid`."""
+        model = self.model
+        days = {"week": [set(s) for s in self.existing_days["week"]], "we": [set(s) for s in self.existing_days["we"]]}
+        unfilled = 0
+        preferred = 0
+        chosen = {}
+        for r_idx, c_idx in self.open_cells:
+            names = self.resolve(grid[r_idx][c_idx])
+            if not names:
+                unfilled += 1
+                continue
+            i = self.index[names[0]]
+            chosen[(r_idx, c_idx)] = i
+            dtype = model.day_types[r_idx]
+            if model.weekday_codes[r_idx] not in self.profiles[i].get("excluded_weekdays", set()):
+                days[dtype][i].add(model.day_numbers[r_idx])
+            if model.posts[c_idx] in self.profiles[i].get("preferred", []):
+                preferred += 1
+        deviation = 0.0
+        for dtype in ("week", "we"):
+            for i, tgt in enumerate(self.targets[dtype]):
+                if tgt > 0:
+                    deviation += abs(len(days[dtype][i]) - tgt)
+        splits = 0
+        for rows in self.blocks:
+            for c_idx in self.block_cols:
+                used = {chosen[(r, c_idx)] for r in rows if (r, c_idx) in chosen}
+                splits += max(0, len(used) - 1)
+        return (
+            deviation
+            + self.unfilled_weight * unfilled
+            + BLOCK_SPLIT_WEIGHT * splits
+            - PREF_BONUS * preferred
+        )
+
+
+def solve_assignment(model: PlanningModel, profiles: Sequence[dict], warm_start: PlanningModel,
+                     stats: dict, options: dict, time_limit: float = 10.0,
+                     seed: Optional[int] = None) -> Optional[PlanningModel]:
+    """
+    Optimise les cases vides de `model` (état avant assignation).
+    `warm_start` est le résultat glouton (hint), `stats` ses statistiques
+    (cibles), `options` un instantané des options du moteur.
+    Retourne une copie de `model` remplie si elle bat le glouton, sinon None.
+    """
+    if cp_model is None or not profiles or not stats:
+        return None
+    prob = _Problem(model, profiles, stats.get("targets_week", {}), stats.get("targets_we", {}), options)
+    if not prob.open_cells or not prob.profiles:
+        return None
+
+    cp = cp_model.CpModel()
+    x: Dict[Tuple[int, int, int], object] = {}
+    by_cell: Dict[Tuple[int, int], List[Tuple[int, object]]] = {}
+    by_row: Dict[Tuple[int, int], List[Tuple[int, object]]] = {}
+    for r_idx, c_idx in prob.open_cells:
+        for i in range(len(prob.profiles)):
+            if not prob.allowed(i, r_idx, c_idx):
+                continue
+            var = cp.NewBoolVar(f"x_{i}_{r_idx}_{c_idx}")
+            x[(i, r_idx, c_idx)] = var
+            by_cell.setdefault((r_idx, c_idx), []).append((i, var))
+            by_row.setdefault((i, r_idx), []).append((c_idx, var))
+    if not x:
+        return None
+
+    # Une personne par case
+    for entries in by_cell.values():
+        cp.Add(sum(var for _i, var in entries) <= 1)
+
+    # Une case par jour, sauf postes associés ; variable "jour travaillé"
+    day_vars = {"week": [[] for _ in prob.profiles], "we": [[] for _ in prob.profiles]}
+    for (i, r_idx), entries in by_row.items():
+        for a in range(len(entries)):
+            for b in range(a + 1, len(entries)):
+                ca, va = entries[a]
+                cb, vb = entries[b]
+                if (ca, cb) not in prob.assoc[i]:
+                    cp.Add(va + vb <= 1)
+        if model.weekday_codes[r_idx] in prob.profiles[i].get("excluded_weekdays", set()):
+            continue
+        day = cp.NewBoolVar(f"d_{i}_{r_idx}")
+        for _c, var in entries:
+            cp.Add(day >= var)
+        cp.Add(day <= sum(var for _c, var in entries))
+        day_vars[model.day_types[r_idx]][i].append(day)
+
+    # Plafond de jours WE
+    if prob.we_limit is not None:
+        for i, days in enumerate(day_vars["we"]):
+            if days:
+                cp.Add(sum(days) + len(prob.existing_days["we"][i]) <= prob.we_limit)
+
+    objective = []
+    # Écart aux cibles
+    for dtype in ("week", "we"):
+        for i, tgt in enumerate(prob.targets[dtype]):
+            if tgt <= 0:
+                continue
+            count = sum(day_vars[dtype][i]) + len(prob.existing_days[dtype][i])
+            bound = SCALE * (len(prob.open_cells) + 32)
+            dev = cp.NewIntVar(0, bound, f"dev_{dtype}_{i}")
+            target_scaled = int(round(SCALE * tgt))
+            cp.Add(dev >= SCALE * count - target_scaled)
+            cp.Add(dev >= target_scaled - SCALE * count)
+            objective.append(dev)
+
+    # Cases remplies et préférences
+    fill_weight = int(round(SCALE * prob.unfilled_weight))
+    pref_weight = int(round(SCALE * PREF_BONUS))
+    for (i, r_idx, c_idx), var in x.items():
+        weight = fill_weight
+        if model.posts[c_idx] in prob.profiles[i].get("preferred", []):
+            weight += pref_weight
+        objective.append(-weight * var)
+
+    # Blocs week-end : pénalité par personne supplémentaire sur un bloc
+    split_weight = int(round(SCALE * BLOCK_SPLIT_WEIGHT))
+    block_used = []
+    for b_idx, rows in enumerate(prob.blocks):
+        for c_idx in prob.block_cols:
+            per_profile = {}
+            for r_idx in rows:
+                for i, var in by_cell.get((r_idx, c_idx), []):
+                    per_profile.setdefault(i, []).append(var)
+            if not per_profile:
+                continue
+            used_vars = []
+            for i, vars_ in per_profile.items():
+                used = cp.NewBoolVar(f"y_{b_idx}_{c_idx}_{i}")
+                for var in vars_:
+                    cp.Add(used >= var)
+                cp.Add(used <= sum(vars_))
+                block_used.append((b_idx, c_idx, i, used))
+                used_vars.append(used)
+            # Comme _Problem.evaluate : max(0, nb personnes - 1)
+            n_used = cp.NewIntVar(0, len(used_vars), f"n_{b_idx}_{c_idx}")
+            cp.Add(n_used == sum(used_vars))
+            any_used = cp.NewBoolVar(f"a_{b_idx}_{c_idx}")
+            for used in used_vars:
+                cp.Add(any_used >= used)
+            cp.Add(any_used <= n_used)
+            objective.append(split_weight * (n_used - any_used))
+
+    cp.Minimize(sum(objective))
+
+    # Hint : solution gloutonne
+    hinted = {}
+    for (i, r_idx, c_idx), var in x.items():
+        names = prob.resolve(warm_start.grid[r_idx][c_idx])
+        value = 1 if names and prob.index.get(names[0]) == i else 0
+        hinted[(i, r_idx, c_idx)] = value
+        cp.AddHint(var, value)
+    for b_idx, c_idx, i, used in block_used:
+        cp.AddHint(used, int(any(hinted.get((i, r, c_idx)) for r in prob.blocks[b_idx])))
+
+    solver = cp_model.CpSolver()
+    solver.parameters.max_time_in_seconds = float(time_limit)
+    # Un coeur laissé libre pour la boucle Tk (le solveur tourne sur un thread de travail)
+    solver.parameters.num_workers = max(1, (os.cpu_count() or 1) - 1)
+    if seed is not None:
+        solver.parameters.random_seed = int(seed) % (1 << 31)
+    status = solver.Solve(cp)
+    if status not in (cp_model.OPTIMAL, cp_model.FEASIBLE):
+        return None
+
+    result = copy.deepcopy(model)
+    for (i, r_idx, c_idx), var in x.items():
+        if solver.BooleanValue(var):
+            result.set(r_idx, c_idx, prob.profiles[i]["initial"])
+    if prob.evaluate(result.grid) >= prob.evaluate(warm_start.grid):
+        return None
+    return result
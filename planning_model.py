@@ -0,0 +1,320 @@
+"""
+Modèle de planning en mémoire (sans Tk).
+
+Le moteur d'assignation travaille sur une copie texte de la grille
+(jours x postes) plutôt que sur les widgets Entry : lecture unique des
+cellules, calculs en pur Python, puis réécriture groupée dans l'interface.
+"""
+
+from __future__ import annotations
+
+import calendar
+import functools
+import re
+import sys
+from dataclasses import dataclass, field
+from datetime import date, timedelta
+from typing import Iterable, List, Optional, Sequence, Set, Tuple
+
+WEEKDAY_CODES = ["mon", "tue", "wed", "thu", "fri", "sat", "sun"]
+
+MULTI_NAME_SPLIT_RE = re.compile(r"[\n,;/&+]+")
+
+
+def normalize_initial_label(value: str) -> str:
+    return " ".join(str(value or "").strip().split()).upper()
+
+
+class NameResolver:
+    """
+    Résolution des initiales d'une cellule pour un effectif donné.
+
+    Construit une seule fois par liste de noms : table normalisée précalculée,
+    recherche de secours par n-grammes de mots (au lieu d'une regex par nom)
+    et cache LRU sur le texte brut, une valeur répétée comme "AB" ne coûte
+    donc qu'une recherche de dictionnaire.
+    Résultat identique à l'ancienne extraction, y compris l'ordre.
+    """
+
+    def __init__(self, valid_names: Iterable[str] = (), cache_size: int = 4096) -> None:
+        self.names = tuple(valid_names)
+        self.norm_map = {normalize_initial_label(name): name for name in self.names}
+        self._rank = {key: idx for idx, key in enumerate(self.norm_map)}
+        self._max_words = max((len(key.split()) for key in self.norm_map if key), default=0)
+        self._lookup = functools.lru_cache(maxsize=cache_size)(self._resolve)
+
+    def __call__(self, raw_text) -> List[str]:
+        text = str(raw_text or "").strip()
+        if not text or text.lower() == "x":
+            return []
+        return list(self._lookup(text))
+
+    def _resolve(self, text: str) -> Tuple[str, ...]:
+        normalized = re.sub(r"\s{2,}", "\n", text)
+        parts = [p.strip() for p in MULTI_NAME_SPLIT_RE.split(normalized) if p.strip()]
+        if not parts:
+            parts = [text]
+        if not self.names:
+            return tuple(dict.fromkeys(parts))
+        norm_map = self.norm_map
+        seen = set()
+        result = []
+        for part in parts:
+            key = normalize_initial_label(part)
+            if key in norm_map and key not in seen:
+                result.append(norm_map[key])
+                seen.add(key)
+        if result:
+            return tuple(result)
+        # Secours : un nom trouvé comme suite de mots entière dans le texte
+        # (équivaut à (?<!\S)nom(?!\S)), restitué dans l'ordre de la liste.
+        words = text.upper().split()
+        found = set()
+        for size in range(1, min(self._max_words, len(words)) + 1):
+            for start in range(len(words) - size + 1):
+                key = " ".join(words[start:start + size])
+                if key in norm_map:
+                    found.add(key)
+        return tuple(norm_map[key] for key in sorted(found, key=self._rank.__getitem__))
+
+
+_RESOLVERS = {}
+
+
+def get_name_resolver(valid_names) -> NameResolver:
+    """Resolver partagé pour cette liste de noms (recréé seulement si l'effectif change)."""
+    if isinstance(valid_names, NameResolver):
+        return valid_names
+    # Ensemble : ordre trié, pour qu'un même effectif donne toujours la même clé
+    if isinstance(valid_names, (set, frozenset)):
+        key = tuple(sorted(valid_names))
+    else:
+        key = tuple(valid_names or ())
+    resolver = _RESOLVERS.get(key)
+    if resolver is None:
+        if len(_RESOLVERS) >= 32:
+            _RESOLVERS.clear()
+        resolver = _RESOLVERS[key] = NameResolver(key)
+    return resolver
+
+
+def extract_names_from_text(raw_text, valid_names=None) -> List[str]:
+    "Return the list of initials detected in a planning cell."
+    return get_name_resolver(valid_names)(raw_text)
+
+
+def day_type_for(dt: date, holidays: Set[date]) -> str:
+    """week = lun-jeu non férié, we = ven/sa/di/férié/veille férié."""
+    is_hol = dt in holidays
+    next_hol = (dt + timedelta(days=1)) in holidays
+    wd = dt.weekday()
+    if wd >= 5 or wd == 4 or is_hol or next_hol:
+        return "we"
+    return "week"
+
+
+@dataclass
+class PlanningModel:
+    """
+    Copie pure Python d'un onglet mensuel.
+
+    - grid[r][c]         : texte de la cellule (chaînes internées)
+    - present[r][c]      : False si la cellule n'a pas de widget
+    - availability[r][c] : False si la cellule est fermée (grisée)
+    - excluded[r][c]     : True si la cellule est exclue du décompte
+    - day_numbers / day_types / weekday_codes : une entrée par ligne,
+      None pour les lignes hors du mois.
+    """
+
+    posts: List[str]
+    day_labels: List[str]
+    grid: List[List[str]]
+    present: List[List[bool]]
+    availability: List[List[bool]]
+    excluded: List[List[bool]]
+    year: int
+    month: int
+    holidays: Set[date] = field(default_factory=set)
+    day_numbers: List[Optional[int]] = field(init=False)
+    day_types: List[Optional[str]] = field(init=False)
+    weekday_codes: List[Optional[str]] = field(init=False)
+    day_to_row: dict = field(init=False)
+    _original: List[List[str]] = field(init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        self.grid = [[sys.intern(str(v or "")) for v in row] for row in self.grid]
+        self._original = [list(row) for row in self.grid]
+        self.days_in_month = calendar.monthrange(self.year, self.month)[1]
+        self.day_numbers = []
+        self.day_types = []
+        self.weekday_codes = []
+        self.day_to_row = {}
+        for r_idx in range(len(self.grid)):
+            try:
+                num = int(self.day_labels[r_idx])
+            except Exception:
+                num = r_idx + 1
+            self.day_to_row[num] = r_idx
+            dt = None
+            if 1 <= num <= self.days_in_month:
+                try:
+                    dt = date(self.year, self.month, num)
+                except Exception:
+                    dt = None
+            if dt is None:
+                self.day_numbers.append(None)
+                self.day_types.append(None)
+                self.weekday_codes.append(None)
+                continue
+            self.day_numbers.append(num)
+            self.day_types.append(day_type_for(dt, self.holidays))
+            self.weekday_codes.append(WEEKDAY_CODES[dt.weekday()])
+
+    # --- Construction --------------------------------------------------
+    @classmethod
+    def from_gui(cls, planning_gui, posts: Sequence[str], day_labels: Sequence[str],
+                 year: int, month: int, holidays: Optional[Iterable[date]] = None) -> "PlanningModel":
+        """Lit une seule fois chaque cellule de la GUI (aucune écriture)."""
+        entries = getattr(planning_gui, "table_entries", []) or []
+        cell_availability = getattr(planning_gui, "cell_availability", {}) or {}
+        exclusion_checker = getattr(planning_gui, "is_cell_excluded_from_count", None)
+        excluded_cells = getattr(planning_gui, "excluded_from_count", set()) or set()
+
+        grid, present, availability, excluded = [], [], [], []
+        for r_idx, row in enumerate(entries):
+            g_row, p_row, a_row, e_row = [], [], [], []
+            for c_idx, cell in enumerate(row):
+                value = ""
+                if cell:
+                    try:
+                        value = cell.get()
+                    except Exception:
+                        value = ""
+                is_excluded = (r_idx, c_idx) in excluded_cells
+                if not is_excluded and exclusion_checker is not None:
+                    try:
+                        is_excluded = bool(exclusion_checker(r_idx, c_idx))
+                    except Exception:
+                        is_excluded = False
+                g_row.append(value or "")
+                p_row.append(bool(cell))
+                a_row.append(bool(cell_availability.get((r_idx, c_idx), True)))
+                e_row.append(is_excluded)
+            grid.append(g_row)
+            present.append(p_row)
+            availability.append(a_row)
+            excluded.append(e_row)
+
+        return cls(
+            posts=list(posts),
+            day_labels=[str(d) for d in day_labels],
+            grid=grid,
+            present=present,
+            availability=availability,
+            excluded=excluded,
+            year=year,
+            month=month,
+            holidays=set(holidays or ()),
+        )
+
+    @classmethod
+    def from_status(cls, month_status, posts: Sequence[str]) -> "PlanningModel":
+        """
+        Construit le modèle depuis un mois d'un fichier de statut
+        (status_schema.MonthStatus, voir status_io.read_status), sans Tk.
+        """
+        meta = month_status.meta or {}
+        year, month = meta.get("year"), meta.get("month")
+        if not (year and month):
+            raise ValueError("Mois sans année/mois enregistrés : calendrier inconnu.")
+        availability_map = month_status.cell_availability or {}
+        excluded_cells = set(map(tuple, month_status.excluded_cells or ()))
+        table = month_status.table_data or []
+        return cls(
+            posts=list(posts),
+            day_labels=[str(r_idx + 1) for r_idx in range(len(table))],
+            grid=[[v or "" for v in row] for row in table],
+            present=[[v is not None for v in row] for row in table],
+            availability=[[bool(availability_map.get((r, c), True)) for c in range(len(row))]
+                          for r, row in enumerate(table)],
+            excluded=[[(r, c) in excluded_cells for c in range(len(row))]
+                      for r, row in enumerate(table)],
+            year=int(year),
+            month=int(month),
+            holidays=set(meta.get("holiday_dates") or ()),
+        )
+
+    # --- Accès ---------------------------------------------------------
+    def has_cell(self, row: int, col: int) -> bool:
+        try:
+            return self.present[row][col]
+        except IndexError:
+            return False
+
+    def get(self, row: int, col: int) -> str:
+        try:
+            return self.grid[row][col]
+        except IndexError:
+            return ""
+
+    def set(self, row: int, col: int, value: str) -> None:
+        self.grid[row][col] = sys.intern(str(value or ""))
+
+    def is_excluded(self, row: int, col: int) -> bool:
+        try:
+            return self.excluded[row][col]
+        except IndexError:
+            return False
+
+    def is_open(self, row: int, col: int) -> bool:
+        """Cellule existante, ouverte, non exclue et sur un poste connu."""
+        if col >= len(self.posts) or not self.has_cell(row, col):
+            return False
+        if not self.availability[row][col]:
+            return False
+        return not self.excluded[row][col]
+
+    def in_month(self, row: int) -> bool:
+        return 0 <= row < len(self.day_numbers) and self.day_numbers[row] is not None
+
+    # --- Réécriture ----------------------------------------------------
+    def changes(self) -> List[Tuple[int, int, str]]:
+        """Liste (row, col, nouvelle_valeur) des cellules modifiées depuis la lecture."""
+        result = []
+        for r_idx, row in enumerate(self.grid):
+            original = self._original[r_idx]
+            for c_idx, value in enumerate(row):
+                if value != original[c_idx]:
+                    result.append((r_idx, c_idx, value))
+        return result
+
+    def write_back(self, planning_gui, push_undo: bool = True) -> List[Tuple[int, int, str]]:
+        """
+        Applique en une passe les cellules modifiées sur les Entry de la GUI.
+        Passe par GUI.apply_assignments quand il existe (une action d'annulation,
+        un seul rafraîchissement).
+        """
+        bulk_apply = getattr(planning_gui, "apply_assignments", None)
+        if bulk_apply is not None:
+            applied = bulk_apply(list(self.changes()), push_undo=push_undo)
+            self._original = [list(row) for row in self.grid]
+            return applied
+
+        applied = []
+        entries = getattr(planning_gui, "table_entries", []) or []
+        for r_idx, c_idx, value in self.changes():
+            try:
+                cell = entries[r_idx][c_idx]
+            except Exception:
+                continue
+            if not cell:
+                continue
+            try:
+                cell.delete(0, "end")
+                if value:
+                    cell.insert(0, value)
+            except Exception:
+                continue
+            applied.append((r_idx, c_idx, value))
+        self._original = [list(row) for row in self.grid]
+        return applied
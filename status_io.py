@@ -0,0 +1,381 @@
+"""
+Lecture / écriture des fichiers de statut (.pkl) du planning (sans Tk).
+
+Format d'un fichier écrit par cette version :
+
+    MAGIC (8 octets) | longueur du corps (8 octets, big-endian) | sha256 du corps (32 octets) | corps
+
+Le corps (format 3) est découpé en blocs JSON compressés (zlib) :
+
+    longueur de l'index (4 octets) | index | blocs
+
+L'index contient tout sauf les mois (postes, POST_INFO, options, voir
+PlanningStatus.to_dict()) et, pour chaque mois, l'emplacement de deux blocs :
+"table" (table_data seul) et "rest" (le reste de MonthStatus.to_dict()).
+read_month_table() lit ainsi un seul mois sans décompresser les autres.
+L'en-tête permet de vérifier un fichier sans le désérialiser.
+
+Formats plus anciens, toujours lus puis migrés vers PlanningStatus :
+  - MAGIC_V2 : même en-tête, corps = un seul JSON compressé ;
+  - MAGIC_V1 : même en-tête, corps = tuple picklé ;
+  - sans en-tête : tuple picklé brut.
+Les pickles sont relus par un Unpickler restreint (_SafeUnpickler) qui ne
+reconstruit que les types présents dans un statut et refuse tout autre objet :
+ces fichiers circulent entre sites par e-mail.
+
+L'écriture passe par un fichier temporaire voisin, fsync puis os.replace :
+une coupure pendant la sauvegarde laisse l'ancien fichier intact.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import io
+import json
+import os
+import pickle
+import shutil
+import struct
+import tempfile
+import zlib
+from pathlib import Path
+from typing import List, Optional
+
+from status_schema import PlanningStatus
+
+MAGIC = b"PDSSTAT3"
+MAGIC_V2 = b"PDSSTAT2"
+MAGIC_V1 = b"PDSSTAT1"
+_MAGICS = (MAGIC, MAGIC_V2, MAGIC_V1)
+_HEADER = struct.Struct(">8sQ32s")
+_INDEX_LEN = struct.Struct(">I")
+
+# Seuls objets qu'un ancien statut picklé peut contenir en plus des types de base
+# (__builtin__ / _codecs : pickles de protocole 0-2)
+_SAFE_GLOBALS = {
+    ("builtins", "set"), ("builtins", "frozenset"),
+    ("__builtin__", "set"), ("__builtin__", "frozenset"),
+    ("datetime", "date"), ("datetime", "datetime"),
+    ("datetime", "time"), ("datetime", "timedelta"),
+    ("_codecs", "encode"),
+}
+
+# Statut d'un fichier renvoyé par verify_status_file
+STATUS_INVALID = 0   # absent, tronqué ou somme de contrôle fausse
+STATUS_LEGACY = 1    # ancien pickle sans en-tête, lisible (pas de somme de contrôle)
+STATUS_OK = 2        # en-tête et somme de contrôle valides
+
+
+class StatusFileError(ValueError):
+    """Fichier de statut illisible (en-tête tronqué, somme de contrôle fausse, contenu refusé)."""
+
+
+class _SafeUnpickler(pickle.Unpickler):
+    """Unpickler limité aux types d'un statut : aucun autre global n'est importé ni appelé."""
+
+    def find_class(self, module, name):
+        if (module, name) in _SAFE_GLOBALS:
+            return super().find_class(module, name)
+        raise pickle.UnpicklingError(f"Objet non autorisé dans un fichier de statut : {module}.{name}")
+
+
+def _safe_loads(data: bytes):
+    try:
+        return _SafeUnpickler(io.BytesIO(data)).load()
+    except pickle.UnpicklingError as e:
+        raise StatusFileError(str(e)) from e
+    except EOFError as e:
+        raise StatusFileError("Fichier tronqué (pickle incomplet).") from e
+
+
+def _pack_json(value) -> bytes:
+    return zlib.compress(json.dumps(value, ensure_ascii=False, separators=(",", ":")).encode("utf-8"), 6)
+
+
+def _unpack_json(data: bytes):
+    try:
+        return json.loads(zlib.decompress(data).decode("utf-8"))
+    except (zlib.error, UnicodeDecodeError, json.JSONDecodeError) as e:
+        raise StatusFileError(f"Contenu illisible : {e}") from e
+
+
+def encode_status(status) -> bytes:
+    """En-tête + index + blocs par mois ; `status` est un PlanningStatus ou l'ancien tuple."""
+    if not isinstance(status, PlanningStatus):
+        status = PlanningStatus.from_legacy(status)
+    index = status.to_dict()
+    blocks = bytearray()
+    months = []
+    for month in index.pop("months"):
+        table = _pack_json(month.pop("table_data"))
+        rest = _pack_json(month)
+        months.append({
+            "week_label": month.get("week_label", ""),
+            "table": [len(blocks), len(table)],
+            "rest": [len(blocks) + len(table), len(rest)],
+        })
+        blocks += table + rest
+    index["months"] = months
+    packed_index = _pack_json(index)
+    body = _INDEX_LEN.pack(len(packed_index)) + packed_index + bytes(blocks)
+    return _HEADER.pack(MAGIC, len(body), hashlib.sha256(body).digest()) + body
+
+
+def _split_body(body: bytes):
+    """(index, blocs) d'un corps au format 3."""
+    if len(body) < _INDEX_LEN.size:
+        raise StatusFileError("Index de fichier tronqué.")
+    (index_len,) = _INDEX_LEN.unpack_from(body)
+    start = _INDEX_LEN.size + index_len
+    return _unpack_json(body[_INDEX_LEN.size:start]), body[start:]
+
+
+def _block(blocks: bytes, span) -> bytes:
+    offset, length = span
+    data = blocks[offset:offset + length]
+    if len(data) != length:
+        raise StatusFileError("Bloc de mois tronqué.")
+    return data
+
+
+def decode_status(data: bytes) -> PlanningStatus:
+    """Inverse de encode_status ; migre aussi les formats précédents (JSON unique, pickles)."""
+    magic = data[:len(MAGIC)]
+    if magic not in _MAGICS:
+        return PlanningStatus.from_legacy(_safe_loads(data))
+    if len(data) < _HEADER.size:
+        raise StatusFileError("En-tête de fichier tronqué.")
+    _magic, length, digest = _HEADER.unpack_from(data)
+    body = data[_HEADER.size:]
+    if len(body) != length:
+        raise StatusFileError(f"Fichier tronqué ({len(body)} octets sur {length}).")
+    if hashlib.sha256(body).digest() != digest:
+        raise StatusFileError("Somme de contrôle invalide : fichier corrompu.")
+    if magic == MAGIC_V1:
+        return PlanningStatus.from_legacy(_safe_loads(body))
+    try:
+        if magic == MAGIC_V2:
+            return PlanningStatus.from_dict(_unpack_json(body))
+        index, blocks = _split_body(body)
+        months = []
+        for entry in index.get("months") or []:
+            month = _unpack_json(_block(blocks, entry["rest"]))
+            month["table_data"] = _unpack_json(_block(blocks, entry["table"]))
+            months.append(month)
+        index["months"] = months
+        return PlanningStatus.from_dict(index)
+    except (TypeError, KeyError, ValueError) as e:
+        if isinstance(e, StatusFileError):
+            raise
+        raise StatusFileError(f"Contenu illisible : {e}") from e
+
+
+def read_status(file_path) -> PlanningStatus:
+    """Charge un fichier de statut, quel que soit son format, sous forme de PlanningStatus."""
+    with open(file_path, "rb") as f:
+        return decode_status(f.read())
+
+
+def read_status_file(file_path) -> tuple:
+    """
+    Compatibilité : même contenu que read_status, sous la forme de l'ancien tuple
+    (all_week_status, work_posts, POST_INFO, assignment_options).
+    """
+    return read_status(file_path).to_legacy()
+
+
+def _read_index(f):
+    """
+    Index d'un fichier format 3 ouvert en binaire, et position du premier bloc ;
+    (None, None) pour un format plus ancien. Ne lit pas les blocs des mois.
+    """
+    head = f.read(_HEADER.size)
+    if head[:len(MAGIC)] != MAGIC:
+        return None, None
+    if len(head) < _HEADER.size:
+        raise StatusFileError("En-tête de fichier tronqué.")
+    raw_len = f.read(_INDEX_LEN.size)
+    if len(raw_len) != _INDEX_LEN.size:
+        raise StatusFileError("Index de fichier tronqué.")
+    (index_len,) = _INDEX_LEN.unpack(raw_len)
+    packed_index = f.read(index_len)
+    if len(packed_index) != index_len:
+        raise StatusFileError("Index de fichier tronqué.")
+    return _unpack_json(packed_index), _HEADER.size + _INDEX_LEN.size + index_len
+
+
+def read_month_labels(file_path) -> List[str]:
+    """Libellés des mois d'un fichier, sans décompresser leurs grilles (format 3)."""
+    with open(file_path, "rb") as f:
+        index, _base = _read_index(f)
+    if index is None:
+        return [m.week_label for m in read_status(file_path).months]
+    return [entry.get("week_label", "") for entry in index.get("months") or []]
+
+
+def read_month_table(file_path, month_index: int) -> List[List[Optional[str]]]:
+    """
+    table_data d'un seul mois. Au format 3, seuls l'index et le bloc de ce mois
+    sont lus (contrôle zlib du bloc, pas de sha256 du fichier entier) ;
+    les formats plus anciens sont chargés en entier.
+    """
+    with open(file_path, "rb") as f:
+        index, base = _read_index(f)
+        if index is not None:
+            months = index.get("months") or []
+            try:
+                offset, length = months[month_index]["table"]
+            except (IndexError, KeyError, TypeError, ValueError) as e:
+                raise StatusFileError(f"Mois {month_index} absent du fichier.") from e
+            f.seek(base + offset)
+            data = f.read(length)
+            if len(data) != length:
+                raise StatusFileError("Bloc de mois tronqué.")
+            return _unpack_json(data)
+    return read_status(file_path).months[month_index].table_data
+
+
+def verify_status_file(file_path) -> int:
+    """
+    Contrôle rapide : STATUS_OK, STATUS_LEGACY ou STATUS_INVALID.
+    Avec en-tête, seule la somme de contrôle est calculée (pas de désérialisation).
+    Un ancien pickle sans en-tête n'a pas de somme de contrôle : il est relu par
+    l'Unpickler restreint (tous protocoles) et LEGACY s'il se charge.
+    """
+    try:
+        with open(file_path, "rb") as f:
+            head = f.read(_HEADER.size)
+            if head[:len(MAGIC)] not in _MAGICS:
+                try:
+                    _safe_loads(head + f.read())
+                except Exception:
+                    return STATUS_INVALID
+                return STATUS_LEGACY
+            if len(head) < _HEADER.size:
+                return STATUS_INVALID
+            _magic, length, digest = _HEADER.unpack(head)
+            h = hashlib.sha256()
+            size = 0
+            for chunk in iter(lambda: f.read(1 << 20), b""):
+                h.update(chunk)
+                size += len(chunk)
+    except OSError:
+        return STATUS_INVALID
+    if size != length or h.digest() != digest:
+        return STATUS_INVALID
+    return STATUS_OK
+
+
+def generation_paths(file_path, generations: int) -> List[Path]:
+    """
+    Chemins des générations, de la plus récente à la plus ancienne :
+    sauvegarde_auto.pkl, sauvegarde_auto.1.pkl, ..., sauvegarde_auto.<n-1>.pkl
+    """
+    path = Path(file_path)
+    paths = [path]
+    for i in range(1, max(1, int(generations))):
+        paths.append(path.with_name(f"{path.stem}.{i}{path.suffix}"))
+    return paths
+
+
+def _rotate_generations(file_path, generations: int) -> None:
+    """
+    Décale chaque génération d'un cran (la plus ancienne est écrasée) ; le fichier
+    principal est conservé en place, sa copie .1 est un lien physique (ou une copie
+    là où les liens sont impossibles). Appelé juste avant le remplacement atomique :
+    si celui-ci échoue, le fichier principal reste intact.
+    """
+    paths = generation_paths(file_path, generations)
+    for i in range(len(paths) - 1, 1, -1):
+        if paths[i - 1].exists():
+            os.replace(paths[i - 1], paths[i])
+    if len(paths) > 1 and paths[0].exists():
+        try:
+            os.remove(paths[1])
+        except FileNotFoundError:
+            pass
+        try:
+            os.link(paths[0], paths[1])
+        except OSError:
+            copy_file_atomic(paths[0], paths[1])
+
+
+def _temp_file(file_path):
+    """Fichier temporaire au nom unique, voisin de file_path (même volume pour os.replace)."""
+    path = Path(file_path)
+    return tempfile.mkstemp(dir=str(path.parent), prefix=f"{path.name}.", suffix=".tmp")
+
+
+def copy_file_atomic(src, dst) -> None:
+    """Copie src sur dst de façon atomique (fichier temporaire unique + os.replace)."""
+    fd, tmp_path = _temp_file(dst)
+    try:
+        with os.fdopen(fd, "wb") as f, open(src, "rb") as source:
+            shutil.copyfileobj(source, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, dst)
+    except Exception:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
+
+
+def _fsync_dir(dir_path) -> None:
+    """Rend durable le renommage (POSIX) ; sans effet là où c'est impossible (Windows)."""
+    try:
+        fd = os.open(str(dir_path), os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+def write_status_file(file_path, status, *, generations: int = 1) -> None:
+    """
+    Sérialise `status` (voir encode_status) dans file_path de façon atomique :
+    fichier temporaire voisin au nom unique + fsync, puis os.replace.
+    Avec generations > 1, les versions précédentes sont conservées
+    (voir generation_paths) avant le remplacement.
+    Sans accès à Tk, appelable depuis un thread de travail.
+    """
+    data = encode_status(status)
+    fd, tmp_path = _temp_file(file_path)
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        if generations > 1:
+            _rotate_generations(file_path, generations)
+        os.replace(tmp_path, file_path)
+    except Exception:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
+    _fsync_dir(Path(file_path).parent)
+
+
+def find_latest_valid(file_path, generations: int) -> Optional[Path]:
+    """
+    Génération la plus récente dont l'en-tête et la somme de contrôle sont valides ;
+    à défaut la plus récente au format ancien ; None si aucune n'est exploitable.
+    """
+    legacy = None
+    for path in generation_paths(file_path, generations):
+        if not path.exists():
+            continue
+        status = verify_status_file(path)
+        if status == STATUS_OK:
+            return path
+        if status == STATUS_LEGACY and legacy is None:
+            legacy = path
+    return legacy
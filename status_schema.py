@@ -0,0 +1,296 @@
+"""
+Schéma versionné du fichier de statut (sans Tk).
+
+Historiquement le statut était un tuple picklé
+    (all_week_status, work_posts, POST_INFO, assignment_options)
+où chaque mois est un tuple positionnel de 5, 6 ou 7 éléments et les options
+un tuple de 4 à 14 éléments. Les dataclasses ci-dessous nomment ces champs ;
+from_legacy() migre chacune des formes historiques, to_legacy() reproduit la
+forme actuelle (7 éléments par mois, 14 options) pour le code qui l'attend encore.
+
+to_dict() / from_dict() donnent une représentation JSON (voir status_io).
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from datetime import date
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+SCHEMA_VERSION = 1
+
+
+# --- Valeurs JSON ---------------------------------------------------------
+def to_json_value(value: Any) -> Any:
+    """
+    Convertit une valeur du statut en JSON : tuples/ensembles -> listes,
+    dates -> {"__date__": iso}, dicts à clés non-textes -> {"__items__": [[k, v], ...]}.
+    """
+    if isinstance(value, dict):
+        if all(isinstance(k, str) for k in value):
+            return {k: to_json_value(v) for k, v in value.items()}
+        return {"__items__": [[to_json_value(k), to_json_value(v)] for k, v in value.items()]}
+    if isinstance(value, (list, tuple)):
+        return [to_json_value(v) for v in value]
+    if isinstance(value, (set, frozenset)):
+        return [to_json_value(v) for v in sorted(value, key=repr)]
+    if isinstance(value, date):
+        return {"__date__": value.isoformat()}
+    return value
+
+
+def _json_key(key: Any) -> Any:
+    return tuple(_json_key(k) for k in key) if isinstance(key, list) else key
+
+
+def from_json_value(value: Any) -> Any:
+    """Inverse de to_json_value (les listes restent des listes, sauf en clé de dict)."""
+    if isinstance(value, dict):
+        if "__date__" in value and len(value) == 1:
+            return date.fromisoformat(value["__date__"])
+        if "__items__" in value and len(value) == 1:
+            return {_json_key(from_json_value(k)): from_json_value(v) for k, v in value["__items__"]}
+        return {k: from_json_value(v) for k, v in value.items()}
+    if isinstance(value, list):
+        return [from_json_value(v) for v in value]
+    return value
+
+
+# --- Options d'assignation ------------------------------------------------
+@dataclass
+class AssignmentOptions:
+    """Réglages globaux du moteur (module Assignation)."""
+
+    different_post_per_day: bool = False
+    max_assignments: bool = False
+    max_assignments_per_post: Optional[int] = None
+    repos_securite: bool = False
+    forbidden_pairs: List[Tuple[str, str]] = field(default_factory=list)
+    max_we_days: bool = False
+    max_we_days_per_month: Optional[int] = None
+    weekend_blocks: bool = False
+    weekend_block_posts: List[str] = field(default_factory=list)
+    weekday_compensation: bool = False
+    optimize_balance: bool = False
+    restarts: int = 1
+    seed: Optional[int] = None
+    exact_solver: bool = False
+
+    @classmethod
+    def from_legacy(cls, options: Sequence[Any], work_posts: Sequence[str] = ()) -> "AssignmentOptions":
+        """
+        Migre le tuple positionnel, quelle que soit sa longueur :
+          4  : différent/jour, max affectations, max par poste, repos sécurité
+          5  : + paires interdites
+          7  : + max jours WE, valeur
+          8  : + blocs week-end (tous les postes si activé)
+          9  : + postes des blocs week-end
+          10 : + équilibrage
+          11 : compensation semaine insérée avant l'équilibrage
+          12 / 13 / 14 : + relances, graine, solveur exact
+        """
+        opts = list(options) if isinstance(options, (list, tuple)) else []
+        n = len(opts)
+        result = cls()
+        base = opts[:4] + [None] * (4 - min(n, 4))
+        result.different_post_per_day = bool(base[0])
+        result.max_assignments = bool(base[1])
+        result.max_assignments_per_post = base[2]
+        result.repos_securite = bool(base[3])
+        if n >= 5:
+            result.forbidden_pairs = [tuple(p) for p in (opts[4] or [])
+                                      if isinstance(p, (list, tuple)) and len(p) == 2]
+        if n >= 7:
+            result.max_we_days = bool(opts[5])
+            result.max_we_days_per_month = opts[6]
+        if n >= 8:
+            result.weekend_blocks = bool(opts[7])
+            if n >= 9:
+                result.weekend_block_posts = list(opts[8] or [])
+            elif result.weekend_blocks:
+                result.weekend_block_posts = list(work_posts)
+        if n >= 11:
+            result.weekday_compensation = bool(opts[9])
+            result.optimize_balance = bool(opts[10])
+        elif n >= 10:
+            result.optimize_balance = bool(opts[9])
+        if n >= 12:
+            try:
+                result.restarts = max(1, int(opts[11]))
+            except Exception:
+                result.restarts = 1
+        if n >= 13:
+            try:
+                result.seed = int(opts[12]) if opts[12] is not None else None
+            except Exception:
+                result.seed = None
+        if n >= 14:
+            result.exact_solver = bool(opts[13])
+        return result
+
+    def to_legacy(self) -> tuple:
+        """Tuple de 14 éléments (forme écrite par les versions précédentes)."""
+        return (
+            self.different_post_per_day,
+            self.max_assignments,
+            self.max_assignments_per_post,
+            self.repos_securite,
+            [tuple(p) for p in self.forbidden_pairs],
+            self.max_we_days,
+            self.max_we_days_per_month,
+            self.weekend_blocks,
+            list(self.weekend_block_posts),
+            self.weekday_compensation,
+            self.optimize_balance,
+            self.restarts,
+            self.seed,
+            self.exact_solver,
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "different_post_per_day": self.different_post_per_day,
+            "max_assignments": self.max_assignments,
+            "max_assignments_per_post": self.max_assignments_per_post,
+            "repos_securite": self.repos_securite,
+            "forbidden_pairs": [list(p) for p in self.forbidden_pairs],
+            "max_we_days": self.max_we_days,
+            "max_we_days_per_month": self.max_we_days_per_month,
+            "weekend_blocks": self.weekend_blocks,
+            "weekend_block_posts": list(self.weekend_block_posts),
+            "weekday_compensation": self.weekday_compensation,
+            "optimize_balance": self.optimize_balance,
+            "restarts": self.restarts,
+            "seed": self.seed,
+            "exact_solver": self.exact_solver,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "AssignmentOptions":
+        result = cls()
+        for name in result.to_dict():
+            if name in data:
+                setattr(result, name, data[name])
+        result.forbidden_pairs = [tuple(p) for p in result.forbidden_pairs]
+        return result
+
+
+# --- Un onglet mensuel ----------------------------------------------------
+@dataclass
+class MonthStatus:
+    """
+    - table_data        : texte des cellules (None sans widget)
+    - cell_availability : {(ligne, colonne): ouverte}
+    - constraints       : valeurs du tableau de contraintes, ligne par ligne
+    - schedule          : (texte, fond, police) des libellés horaires, ou None
+    - excluded_cells    : cellules exclues du décompte
+    - meta              : année/mois, marquages, lignes masquées, graines (None si absent)
+    """
+
+    table_data: List[List[Optional[str]]] = field(default_factory=list)
+    cell_availability: Dict[Tuple[int, int], bool] = field(default_factory=dict)
+    constraints: List[List[Any]] = field(default_factory=list)
+    schedule: List[List[Any]] = field(default_factory=list)
+    week_label: str = ""
+    excluded_cells: List[Tuple[int, int]] = field(default_factory=list)
+    meta: Optional[Dict[str, Any]] = None
+
+    @classmethod
+    def from_legacy(cls, week_status: Sequence[Any]) -> "MonthStatus":
+        """Tuple de 5 (sans exclusions), 6 (sans métadonnées) ou 7 éléments."""
+        values = list(week_status)
+        if len(values) < 5:
+            raise ValueError(f"Mois incomplet ({len(values)} éléments).")
+        return cls(
+            table_data=values[0] or [],
+            cell_availability=dict(values[1] or {}),
+            constraints=values[2] or [],
+            schedule=values[3] or [],
+            week_label=values[4] or "",
+            excluded_cells=[tuple(rc) for rc in (values[5] or [])] if len(values) >= 6 else [],
+            meta=values[6] if len(values) >= 7 and isinstance(values[6], dict) else None,
+        )
+
+    def to_legacy(self) -> tuple:
+        return (self.table_data, self.cell_availability, self.constraints, self.schedule,
+                self.week_label, list(self.excluded_cells), self.meta)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "table_data": self.table_data,
+            "cell_availability": [[r, c, bool(v)] for (r, c), v in self.cell_availability.items()],
+            "constraints": to_json_value(self.constraints),
+            "schedule": to_json_value(self.schedule),
+            "week_label": self.week_label,
+            "excluded_cells": [list(rc) for rc in self.excluded_cells],
+            "meta": to_json_value(self.meta),
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "MonthStatus":
+        # Cellules composées : (absence, PDS, origine, note) / (texte, fond, police)
+        def _rows(rows):
+            return [[tuple(cell) if isinstance(cell, list) else cell for cell in row]
+                    for row in from_json_value(rows or [])]
+
+        return cls(
+            table_data=data.get("table_data") or [],
+            cell_availability={(int(r), int(c)): bool(v) for r, c, v in data.get("cell_availability") or []},
+            constraints=_rows(data.get("constraints")),
+            schedule=_rows(data.get("schedule")),
+            week_label=data.get("week_label") or "",
+            excluded_cells=[(int(r), int(c)) for r, c in data.get("excluded_cells") or []],
+            meta=from_json_value(data.get("meta")),
+        )
+
+
+# --- Fichier complet ------------------------------------------------------
+@dataclass
+class PlanningStatus:
+    """Contenu d'un fichier de statut : mois, postes, description des postes, options."""
+
+    months: List[MonthStatus] = field(default_factory=list)
+    work_posts: List[str] = field(default_factory=list)
+    post_info: Dict[str, Any] = field(default_factory=dict)
+    options: AssignmentOptions = field(default_factory=AssignmentOptions)
+    version: int = SCHEMA_VERSION
+
+    @classmethod
+    def from_legacy(cls, loaded: Sequence[Any]) -> "PlanningStatus":
+        """Tuple picklé (all_week_status, work_posts, POST_INFO[, assignment_options])."""
+        if not isinstance(loaded, (list, tuple)) or len(loaded) < 3:
+            raise ValueError("Fichier incompatible (structure inattendue).")
+        work_posts = list(loaded[1] or [])
+        options = loaded[3] if len(loaded) >= 4 else ()
+        return cls(
+            months=[MonthStatus.from_legacy(w) for w in (loaded[0] or [])],
+            work_posts=work_posts,
+            post_info=dict(loaded[2] or {}),
+            options=AssignmentOptions.from_legacy(options, work_posts),
+        )
+
+    def to_legacy(self) -> tuple:
+        return ([m.to_legacy() for m in self.months], list(self.work_posts),
+                self.post_info, self.options.to_legacy())
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "version": self.version,
+            "work_posts": list(self.work_posts),
+            "post_info": to_json_value(self.post_info),
+            "options": self.options.to_dict(),
+            "months": [m.to_dict() for m in self.months],
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "PlanningStatus":
+        version = data.get("version")
+        if not isinstance(version, int) or version > SCHEMA_VERSION:
+            raise ValueError(f"Version de fichier non prise en charge : {version!r}.")
+        return cls(
+            months=[MonthStatus.from_dict(m) for m in data.get("months") or []],
+            work_posts=list(data.get("work_posts") or []),
+            post_info=from_json_value(data.get("post_info") or {}),
+            options=AssignmentOptions.from_dict(data.get("options") or {}),
+            version=SCHEMA_VERSION,
+        )
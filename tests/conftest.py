@@ -0,0 +1,42 @@
+"""Les modules du planning sont à la racine du dépôt (sans paquet)."""
+
+import sys
+from datetime import date
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parent.parent
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+
+@pytest.fixture
+def sample_status():
+    """Statut de deux mois couvrant les valeurs composées (tuples, dates, clés non textes)."""
+    from status_schema import AssignmentOptions, MonthStatus, PlanningStatus
+
+    months = [
+        MonthStatus(
+            table_data=[["AB", None, ""], ["CD / EF", "x", "AB"]],
+            cell_availability={(0, 1): False, (1, 2): True},
+            constraints=[["AB", "1.0", "Bloc", "", "", "3, 4", "", "note"]],
+            schedule=[[("08:00", "#ffffff", "Arial 10"), None]],
+            week_label="Mars 2026",
+            excluded_cells=[(1, 0)],
+            meta={"year": 2026, "month": 3, "holiday_dates": [date(2026, 4, 6)],
+                  "marks": {(0, 0): "red"}},
+        ),
+        MonthStatus(
+            table_data=[["GH", "AB", None]],
+            week_label="Avril 2026",
+        ),
+    ]
+    return PlanningStatus(
+        months=months,
+        work_posts=["Bloc", "Consult", "Garde"],
+        post_info={"Bloc": {"color": "#ff0000", "hours": 8}},
+        options=AssignmentOptions(repos_securite=True, forbidden_pairs=[("AB", "CD")],
+                                  weekend_blocks=True, weekend_block_posts=["Garde"],
+                                  restarts=4, seed=7),
+    )
@@ -0,0 +1,186 @@
+"""Modèle headless : résolution des noms et équilibrage (sans Tk)."""
+
+import random
+import re
+
+import pytest
+
+from Assignation import balance_on_model
+from planning_model import NameResolver, PlanningModel, extract_names_from_text, get_name_resolver
+
+
+# --- Référence : extraction d'origine (Full_GUI, avant NameResolver) -------
+_MULTI_NAME_SPLIT_RE = re.compile(r"[\n,;/&+]+")
+
+
+def _normalize_initial_label(value):
+    return " ".join(str(value or "").strip().split()).upper()
+
+
+def _extract_names_from_cell_impl(raw_text, valid_names=None):
+    text = str(raw_text or "").strip()
+    if not text or text.lower() == "x":
+        return []
+    normalized = re.sub(r"\s{2,}", "\n", text)
+    parts = [p.strip() for p in _MULTI_NAME_SPLIT_RE.split(normalized) if p.strip()]
+    if not parts:
+        parts = [text]
+    if not valid_names:
+        return list(dict.fromkeys(parts))
+    norm_map = {_normalize_initial_label(name): name for name in valid_names}
+    seen = set()
+    result = []
+    for part in parts:
+        key = _normalize_initial_label(part)
+        if key in norm_map and key not in seen:
+            result.append(norm_map[key])
+            seen.add(key)
+    if result:
+        return result
+    upper_text = " ".join(text.upper().split())
+    for key, original in norm_map.items():
+        pattern = r"(?<!\S)" + re.escape(key) + r"(?!\S)"
+        if re.search(pattern, upper_text) and key not in seen:
+            result.append(original)
+            seen.add(key)
+    return result
+
+
+VALID_NAME_LISTS = [
+    None,
+    [],
+    ["AB", "CD", "EF"],
+    ["EF", "ab", "Cd", "J P"],
+    ["J P", "J", "P", "MDL"],
+]
+
+CELL_TEXTS = [
+    None, "", "   ", "x", "X", " x ",
+    "AB", "ab", " AB ", "AB,CD", "CD / AB", "AB;CD;AB", "AB & EF + CD",
+    "AB\nCD", "AB  CD", "AB CD", "cd ab", "AB+", ",;/", "Garde AB",
+    "J P", "j  p", "J P / MDL", "MDL (matin) J", "avec J P et MDL", "JP",
+    "ZZ", "ZZ, AB", "AB-CD", "EF?", "\tEF\t",
+]
+
+
+@pytest.mark.parametrize("valid_names", VALID_NAME_LISTS)
+def test_name_resolver_matches_original_extraction(valid_names):
+    resolver = NameResolver(valid_names or ())
+    for text in CELL_TEXTS:
+        expected = _extract_names_from_cell_impl(text, valid_names)
+        assert resolver(text) == expected, text
+        # Deuxième appel : servi par le cache, même résultat
+        assert resolver(text) == expected, text
+        assert extract_names_from_text(text, valid_names) == expected, text
+
+
+def test_name_resolver_result_is_not_shared_with_cache():
+    resolver = NameResolver(["AB", "CD"])
+    first = resolver("AB, CD")
+    first.append("ZZ")
+    assert resolver("AB, CD") == ["AB", "CD"]
+
+
+def test_shared_resolver_key_ignores_set_order():
+    names = ["AB", "CD", "EF", "GH"]
+    first = get_name_resolver(set(names))
+    second = get_name_resolver(frozenset(reversed(names)))
+    assert first is second
+    assert get_name_resolver(first) is first
+
+
+# --- Équilibrage headless ----------------------------------------------------
+def _model(values):
+    """Un poste, une ligne par valeur."""
+    rows = len(values)
+    return PlanningModel(
+        posts=["P1"],
+        day_labels=[str(i + 1) for i in range(rows)],
+        grid=[[v] for v in values],
+        present=[[True] for _ in range(rows)],
+        availability=[[True] for _ in range(rows)],
+        excluded=[[False] for _ in range(rows)],
+        year=2026,
+        month=3,
+    )
+
+
+def _profile(initial, participation=1.0, absences=()):
+    return {
+        "initial": initial,
+        "participation": participation,
+        "absences": set(absences),
+        "excluded_weekdays": set(),
+        "non_assured": set(),
+        "associations": set(),
+    }
+
+
+def _row_info(types):
+    return [(dtype, r_idx + 1, None) for r_idx, dtype in enumerate(types)]
+
+
+def _column(model):
+    return [row[0] for row in model.grid]
+
+
+def test_balance_replaces_cells_of_overloaded_person():
+    model = _model(["A", "A", "A", "A"])
+    profiles = [_profile("A"), _profile("B")]
+    moves = balance_on_model(model, profiles, _row_info(["week"] * 4), {}, rng=random.Random(0))
+
+    assert len(moves) == 2
+    assert all(old == "A" and new == "B" and dtype == "week" for _r, _c, old, new, dtype in moves)
+    assert sorted(_column(model)) == ["A", "A", "B", "B"]
+    for r_idx, c_idx, _old, new, _dtype in moves:
+        assert model.get(r_idx, c_idx) == new
+    assert {(r, c, v) for r, c, v in model.changes()} == {(r, c, new) for r, c, _o, new, _t in moves}
+
+
+def test_balance_respects_absences():
+    model = _model(["A", "A", "A", "A"])
+    profiles = [_profile("A"), _profile("B", absences={1, 2, 3, 4})]
+    assert balance_on_model(model, profiles, _row_info(["week"] * 4), {}, rng=random.Random(0)) == []
+    assert _column(model) == ["A", "A", "A", "A"]
+
+
+def test_balance_counts_previous_months():
+    # Mois courant équilibré, mais B a deux cases de plus sur les mois précédents
+    model = _model(["A", "B", "A", "B"])
+    profiles = [_profile("A"), _profile("B")]
+    counts = {"week": {"A": 0, "B": 2}, "we": {}}
+    moves = balance_on_model(model, profiles, _row_info(["week"] * 4), counts, rng=random.Random(0))
+
+    assert [(old, new) for _r, _c, old, new, _t in moves] == [("B", "A")]
+    assert sorted(_column(model)) == ["A", "A", "A", "B"]
+    # Le cumul fourni n'est pas modifié
+    assert counts == {"week": {"A": 0, "B": 2}, "we": {}}
+
+
+def test_balance_swaps_week_and_weekend_cells():
+    # Semaine : A 2, B 1, C 1 (cible 4/3) ; un simple remplacement A -> B ne gagne rien.
+    # Week-end : B 2, A 0, C 1 (cible 1) ; l'échange d'une case de chaque type,
+    # A -> B en semaine et B -> A le week-end, réduit l'écart total.
+    types = ["week", "week", "week", "week", "we", "we", "we"]
+    model = _model(["A", "A", "B", "C", "B", "B", "C"])
+    profiles = [_profile("A"), _profile("B"), _profile("C")]
+    moves = balance_on_model(model, profiles, _row_info(types), {}, rng=random.Random(0))
+
+    assert len(moves) == 2
+    (r_week, _c1, old_week, new_week, type_week), (r_we, _c2, old_we, new_we, type_we) = moves
+    assert (old_week, new_week, type_week) == ("A", "B", "week")
+    assert (old_we, new_we, type_we) == ("B", "A", "we")
+    assert r_week in (0, 1)
+    assert r_we in (4, 5)
+
+    column = _column(model)
+    assert sorted(column[:4]) == ["A", "B", "B", "C"]
+    assert sorted(column[4:]) == ["A", "B", "C"]
+
+
+def test_balance_keeps_weekend_block_posts():
+    model = _model(["A", "A", "A", "A"])
+    profiles = [_profile("A"), _profile("B")]
+    moves = balance_on_model(model, profiles, _row_info(["we"] * 4), {}, block_posts={"P1"},
+                             rng=random.Random(0))
+    assert moves == []
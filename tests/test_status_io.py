@@ -0,0 +1,96 @@
+"""Écriture atomique des fichiers de statut et générations d'autosauvegarde."""
+
+import pytest
+
+from status_io import (
+    STATUS_INVALID,
+    STATUS_OK,
+    copy_file_atomic,
+    find_latest_valid,
+    generation_paths,
+    read_status,
+    verify_status_file,
+    write_status_file,
+)
+
+
+def _seed(path):
+    return read_status(path).options.seed
+
+
+def _leftovers(tmp_path):
+    return sorted(p.name for p in tmp_path.iterdir() if p.name.endswith(".tmp"))
+
+
+def test_write_then_read(tmp_path, sample_status):
+    path = tmp_path / "statut.pkl"
+    write_status_file(path, sample_status)
+    assert verify_status_file(path) == STATUS_OK
+    assert read_status(path) == sample_status
+    assert _leftovers(tmp_path) == []
+
+
+def test_write_accepts_legacy_tuple(tmp_path, sample_status):
+    path = tmp_path / "statut.pkl"
+    write_status_file(path, sample_status.to_legacy())
+    assert read_status(path) == sample_status
+
+
+def test_generation_paths(tmp_path):
+    names = [p.name for p in generation_paths(tmp_path / "sauvegarde_auto.pkl", 3)]
+    assert names == ["sauvegarde_auto.pkl", "sauvegarde_auto.1.pkl", "sauvegarde_auto.2.pkl"]
+    assert generation_paths(tmp_path / "a.pkl", 0) == [tmp_path / "a.pkl"]
+
+
+def test_generations_rotate(tmp_path, sample_status):
+    path = tmp_path / "sauvegarde_auto.pkl"
+    for seed in range(1, 5):
+        sample_status.options.seed = seed
+        write_status_file(path, sample_status, generations=3)
+
+    main, first, second = generation_paths(path, 3)
+    assert [_seed(main), _seed(first), _seed(second)] == [4, 3, 2]
+    assert not (tmp_path / "sauvegarde_auto.3.pkl").exists()
+    assert _leftovers(tmp_path) == []
+
+
+def test_failed_write_keeps_previous_files(tmp_path, sample_status):
+    path = tmp_path / "sauvegarde_auto.pkl"
+    for seed in (1, 2):
+        sample_status.options.seed = seed
+        write_status_file(path, sample_status, generations=3)
+
+    with pytest.raises(ValueError):
+        write_status_file(path, ("pas", "un statut"), generations=3)
+
+    main, first, second = generation_paths(path, 3)
+    assert [_seed(main), _seed(first)] == [2, 1]
+    assert not second.exists()
+    assert _leftovers(tmp_path) == []
+
+
+def test_find_latest_valid_skips_corrupted(tmp_path, sample_status):
+    path = tmp_path / "sauvegarde_auto.pkl"
+    assert find_latest_valid(path, 3) is None
+    for seed in (1, 2):
+        sample_status.options.seed = seed
+        write_status_file(path, sample_status, generations=3)
+    assert find_latest_valid(path, 3) == path
+
+    # Coupure en pleine écriture (hors écriture atomique) : fichier tronqué
+    data = path.read_bytes()
+    path.write_bytes(data[:len(data) // 2])
+    assert verify_status_file(path) == STATUS_INVALID
+    latest = find_latest_valid(path, 3)
+    assert latest == generation_paths(path, 3)[1]
+    assert _seed(latest) == 1
+
+
+def test_copy_file_atomic(tmp_path, sample_status):
+    src = tmp_path / "sauvegarde_auto.1.pkl"
+    dst = tmp_path / "statut.pkl"
+    write_status_file(src, sample_status)
+    dst.write_bytes(b"ancien contenu")
+    copy_file_atomic(src, dst)
+    assert dst.read_bytes() == src.read_bytes()
+    assert _leftovers(tmp_path) == []
@@ -0,0 +1,209 @@
+"""Format de statut versionné : aller-retour, migrations et fichiers refusés."""
+
+import hashlib
+import os
+import pickle
+
+import pytest
+
+from status_io import (
+    MAGIC,
+    MAGIC_V1,
+    MAGIC_V2,
+    STATUS_INVALID,
+    STATUS_LEGACY,
+    StatusFileError,
+    _HEADER,
+    _pack_json,
+    decode_status,
+    encode_status,
+    read_month_labels,
+    read_month_table,
+    read_status,
+    read_status_file,
+    verify_status_file,
+)
+from status_schema import SCHEMA_VERSION, AssignmentOptions, MonthStatus, PlanningStatus
+
+
+def _with_header(magic, body):
+    return _HEADER.pack(magic, len(body), hashlib.sha256(body).digest()) + body
+
+
+# --- Aller-retour format 3 ---------------------------------------------------
+def test_v3_round_trip(sample_status):
+    data = encode_status(sample_status)
+    assert data.startswith(MAGIC)
+    status = decode_status(data)
+    assert status == sample_status
+    assert status.months[0].schedule[0][0] == ("08:00", "#ffffff", "Arial 10")
+    assert status.months[0].meta["marks"] == {(0, 0): "red"}
+    assert encode_status(status) == data
+
+
+def test_dict_round_trip(sample_status):
+    assert PlanningStatus.from_dict(sample_status.to_dict()) == sample_status
+
+
+def test_month_labels_and_single_table(tmp_path, sample_status):
+    path = tmp_path / "statut.pkl"
+    path.write_bytes(encode_status(sample_status))
+    assert read_month_labels(path) == ["Mars 2026", "Avril 2026"]
+    assert read_month_table(path, 1) == [["GH", "AB", None]]
+    with pytest.raises(StatusFileError):
+        read_month_table(path, 2)
+
+
+def test_legacy_tuple_compatibility(tmp_path, sample_status):
+    path = tmp_path / "statut.pkl"
+    path.write_bytes(encode_status(sample_status))
+    packed = read_status_file(path)
+    assert len(packed) == 4
+    assert len(packed[0][0]) == 7
+    assert len(packed[3]) == 14
+    assert PlanningStatus.from_legacy(packed) == sample_status
+
+
+def test_newer_version_is_refused(sample_status):
+    data = sample_status.to_dict()
+    data["version"] = SCHEMA_VERSION + 1
+    with pytest.raises(ValueError):
+        PlanningStatus.from_dict(data)
+
+
+# --- Formats précédents ------------------------------------------------------
+def test_v2_and_v1_are_migrated(sample_status):
+    v2 = _with_header(MAGIC_V2, _pack_json(sample_status.to_dict()))
+    v1 = _with_header(MAGIC_V1, pickle.dumps(sample_status.to_legacy(), protocol=2))
+    assert decode_status(v2) == sample_status
+    assert decode_status(v1) == sample_status
+
+
+@pytest.mark.parametrize("protocol", range(pickle.HIGHEST_PROTOCOL + 1))
+def test_raw_legacy_pickle(tmp_path, sample_status, protocol):
+    path = tmp_path / "ancien.pkl"
+    path.write_bytes(pickle.dumps(sample_status.to_legacy(), protocol=protocol))
+    assert verify_status_file(path) == STATUS_LEGACY
+    assert read_status(path) == sample_status
+
+
+def test_legacy_months_of_five_and_six_elements():
+    table = [["AB", None]]
+    loaded = (
+        [
+            (table, {(0, 1): False}, [], [], "Janvier"),
+            (table, {}, [], [], "Février", [[0, 0]]),
+        ],
+        ["Bloc"],
+        {},
+    )
+    status = PlanningStatus.from_legacy(loaded)
+    assert [m.week_label for m in status.months] == ["Janvier", "Février"]
+    assert status.months[0].excluded_cells == []
+    assert status.months[1].excluded_cells == [(0, 0)]
+    assert status.months[1].meta is None
+    assert status.options == AssignmentOptions()
+    with pytest.raises(ValueError):
+        MonthStatus.from_legacy((table, {}, [], []))
+
+
+# Options picklées : (longueur du tuple, champs attendus hors valeurs par défaut).
+# À 10 éléments l'index 9 est l'équilibrage ; à partir de 11 la compensation
+# semaine y est insérée et l'équilibrage passe à l'index 10.
+_FULL_OPTIONS = (True, True, 3, True, [("AB", "CD"), ["EF", "GH"], ("bad",)], True, 2,
+                 True, ["Garde"], True, False, 5, 42, True)
+_BASE = {"different_post_per_day": True, "max_assignments": True,
+         "max_assignments_per_post": 3, "repos_securite": True}
+_PAIRS = {"forbidden_pairs": [("AB", "CD"), ("EF", "GH")]}
+_WE = {"max_we_days": True, "max_we_days_per_month": 2}
+_EXPECTED_OPTIONS = {
+    4: _BASE,
+    5: {**_BASE, **_PAIRS},
+    6: {**_BASE, **_PAIRS},
+    7: {**_BASE, **_PAIRS, **_WE},
+    8: {**_BASE, **_PAIRS, **_WE, "weekend_blocks": True, "weekend_block_posts": ["Bloc", "Garde"]},
+    9: {**_BASE, **_PAIRS, **_WE, "weekend_blocks": True, "weekend_block_posts": ["Garde"]},
+    10: {**_BASE, **_PAIRS, **_WE, "weekend_blocks": True, "weekend_block_posts": ["Garde"],
+         "optimize_balance": True},
+    11: {**_BASE, **_PAIRS, **_WE, "weekend_blocks": True, "weekend_block_posts": ["Garde"],
+         "weekday_compensation": True},
+}
+_EXPECTED_OPTIONS[12] = {**_EXPECTED_OPTIONS[11], "restarts": 5}
+_EXPECTED_OPTIONS[13] = {**_EXPECTED_OPTIONS[12], "seed": 42}
+_EXPECTED_OPTIONS[14] = {**_EXPECTED_OPTIONS[13], "exact_solver": True}
+
+
+@pytest.mark.parametrize("length", sorted(_EXPECTED_OPTIONS))
+def test_legacy_options_migration(length):
+    options = AssignmentOptions.from_legacy(_FULL_OPTIONS[:length], work_posts=["Bloc", "Garde"])
+    expected = AssignmentOptions(**_EXPECTED_OPTIONS[length])
+    assert options == expected
+    # La forme écrite (14 éléments) se relit à l'identique
+    assert len(options.to_legacy()) == 14
+    assert AssignmentOptions.from_legacy(options.to_legacy()) == expected
+
+
+def test_legacy_options_tolerate_bad_values():
+    options = AssignmentOptions.from_legacy(_FULL_OPTIONS[:11] + ("beaucoup", "graine"))
+    assert options.restarts == 1
+    assert options.seed is None
+    assert AssignmentOptions.from_legacy(None) == AssignmentOptions()
+    assert AssignmentOptions.from_legacy((True,)).different_post_per_day is True
+
+
+# --- Fichiers corrompus, tronqués ou refusés ---------------------------------
+def test_corrupted_body_is_rejected(tmp_path, sample_status):
+    data = bytearray(encode_status(sample_status))
+    data[-1] ^= 0xFF
+    path = tmp_path / "statut.pkl"
+    path.write_bytes(bytes(data))
+    assert verify_status_file(path) == STATUS_INVALID
+    with pytest.raises(StatusFileError, match="Somme de contrôle"):
+        read_status(path)
+
+
+@pytest.mark.parametrize("keep", [len(MAGIC), _HEADER.size - 1, _HEADER.size + 3, -1])
+def test_truncated_file_is_rejected(tmp_path, sample_status, keep):
+    data = encode_status(sample_status)
+    path = tmp_path / "statut.pkl"
+    path.write_bytes(data[:keep])
+    assert verify_status_file(path) == STATUS_INVALID
+    with pytest.raises(StatusFileError):
+        read_status(path)
+
+
+def test_truncated_legacy_pickle_is_rejected(tmp_path, sample_status):
+    data = pickle.dumps(sample_status.to_legacy(), protocol=pickle.HIGHEST_PROTOCOL)
+    path = tmp_path / "ancien.pkl"
+    for keep in range(0, len(data), 7):
+        path.write_bytes(data[:keep])
+        assert verify_status_file(path) == STATUS_INVALID
+        with pytest.raises(StatusFileError):
+            read_status(path)
+
+
+def test_missing_file_is_invalid(tmp_path):
+    assert verify_status_file(tmp_path / "absent.pkl") == STATUS_INVALID
+
+
+class _Payload:
+    def __init__(self, marker):
+        self.marker = marker
+
+    def __reduce__(self):
+        return (os.system, (f"echo piege > {self.marker}",))
+
+
+@pytest.mark.parametrize("protocol", [0, 2, pickle.HIGHEST_PROTOCOL])
+def test_unsafe_pickle_is_refused(tmp_path, protocol):
+    marker = tmp_path / "execute.txt"
+    payload = pickle.dumps(([], ["Bloc"], {"Bloc": _Payload(marker)}), protocol=protocol)
+    for data in (payload, _with_header(MAGIC_V1, payload)):
+        path = tmp_path / "piege.pkl"
+        path.write_bytes(data)
+        with pytest.raises(StatusFileError, match="non autorisé"):
+            read_status(path)
+    path.write_bytes(payload)
+    assert verify_status_file(path) == STATUS_INVALID
+    assert not marker.exists()
+